@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻构建进程
+由 PyInstaller GUI 构建器在启用“使用常驻构建进程”时按需启动：预先导入 PyInstaller，
+缓存钩子目录和基础模块依赖图，通过 multiprocessing.connection 接收构建请求。
+每个请求 fork 一个子进程执行构建，子进程继承已导入的模块和缓存，构建之间互不影响。
+
+状态文件记录监听地址、认证密钥和进程号；客户端发现 Python 环境指纹变化
+（安装、升级或删除了发行包，解释器、PYTHONPATH 或本模块变化）时会重启常驻进程。
+常驻进程以 PYTHONHASHSEED=0 运行，可复现构建不受影响；空闲一小时后自动退出。
+只支持提供 os.fork 的平台（Linux、macOS），其他平台直接运行 PyInstaller。
+
+用法:
+    python build_daemon.py [--state 状态文件] [--pid-file 文件] -- <PyInstaller 参数>
+    python build_daemon.py --status
+    python build_daemon.py --stop
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import select
+import signal
+import site
+import subprocess
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+
+DEFAULT_STATE_PATH = os.path.join(os.path.expanduser("~"), ".pyinstaller_gui", "build-daemon.json")
+PROTOCOL = 1
+IDLE_TIMEOUT = 3600
+START_TIMEOUT = 120
+# 按排除模块缓存的基础依赖图数量
+GRAPH_CACHE_SIZE = 4
+CHUNK_SIZE = 65536
+
+
+class DaemonError(Exception):
+    """常驻构建进程无法启动或通信失败"""
+
+
+def daemon_supported():
+    """当前平台是否支持常驻构建进程（需要 os.fork）"""
+    return hasattr(os, "fork")
+
+
+def environment_fingerprint():
+    """
+    Python 环境的指纹：解释器、PYTHONPATH、site-packages 中的发行包以及本模块变化时改变
+
+    发行包以 .dist-info/.egg-info 目录名（含版本号）和 .pth 文件为准。
+    """
+    digest = hashlib.sha256()
+    for text in (sys.executable, sys.version, os.environ.get("PYTHONPATH", ""), str(PROTOCOL)):
+        digest.update(text.encode("utf-8") + b"\0")
+    digest.update(str(os.stat(os.path.abspath(__file__)).st_mtime_ns).encode("ascii"))
+    paths = {sysconfig.get_paths()["purelib"], sysconfig.get_paths()["platlib"]}
+    if site.ENABLE_USER_SITE:
+        paths.add(site.getusersitepackages())
+    for path in sorted(paths):
+        if not os.path.isdir(path):
+            continue
+        digest.update(path.encode("utf-8") + b"\0")
+        for name in sorted(os.listdir(path)):
+            if name.endswith((".dist-info", ".egg-info", ".egg-link", ".pth")):
+                digest.update(name.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def read_state(path):
+    """读取状态文件，不存在或内容无效时返回 None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def connect(state):
+    return Client(state["address"], family="AF_UNIX", authkey=bytes.fromhex(state["authkey"]))
+
+
+def daemon_status(state_path=DEFAULT_STATE_PATH):
+    """
+    查询常驻构建进程
+
+    Returns:
+        {"pid", "fingerprint", "protocol", "started", "builds", "building"}，未运行时返回 None
+    """
+    state = read_state(state_path)
+    if state is None:
+        return None
+    try:
+        with connect(state) as conn:
+            conn.send({"op": "ping"})
+            return conn.recv()
+    except (OSError, EOFError, multiprocessing.ProcessError):
+        return None
+
+
+def stop_daemon(state_path=DEFAULT_STATE_PATH):
+    """
+    结束常驻构建进程
+
+    Returns:
+        是否有正在运行的常驻进程
+    """
+    state = read_state(state_path)
+    if state is None:
+        return False
+    try:
+        with connect(state) as conn:
+            conn.send({"op": "shutdown"})
+            conn.recv()
+    except (OSError, EOFError, multiprocessing.ProcessError):
+        return False
+    return True
+
+
+def ensure_daemon(state_path=DEFAULT_STATE_PATH, log=print):
+    """
+    返回可用的常驻构建进程的状态：未运行或环境指纹变化时（重新）启动
+
+    Args:
+        state_path: 状态文件路径
+        log: 输出提示信息的函数
+    """
+    fingerprint = environment_fingerprint()
+    status = daemon_status(state_path)
+    if status and status.get("protocol") == PROTOCOL and status.get("fingerprint") == fingerprint:
+        return read_state(state_path)
+    if status:
+        log("Python 环境已变化，重启常驻构建进程")
+        stop_daemon(state_path)
+    else:
+        log("启动常驻构建进程（首次需要导入 PyInstaller 并建立基础依赖图）")
+
+    directory = os.path.dirname(os.path.abspath(state_path))
+    os.makedirs(directory, exist_ok=True)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    log_path = os.path.splitext(state_path)[0] + ".log"
+    with open(log_path, "ab") as log_file:
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", "--state", state_path],
+            cwd=directory,
+            env=dict(os.environ, PYTHONHASHSEED="0", PYTHONUTF8="1", PYTHONIOENCODING="utf-8"),
+            stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise DaemonError(f"常驻构建进程启动失败，详见 {log_path}")
+        state = read_state(state_path)
+        if state and state["pid"] == process.pid:
+            return state
+        time.sleep(0.05)
+    process.kill()
+    raise DaemonError(f"常驻构建进程在 {START_TIMEOUT} 秒内未就绪，详见 {log_path}")
+
+
+def run_build(args, state_path=DEFAULT_STATE_PATH, pid_file="", output=None):
+    """
+    通过常驻构建进程执行一次构建，构建输出写到 output（默认为标准输出）
+
+    使用当前工作目录和环境变量；常驻进程不可用时直接运行 PyInstaller。
+
+    Args:
+        args: PyInstaller 命令行参数
+        pid_file: 写入执行构建的子进程号，供调用方采样资源占用
+
+    Returns:
+        构建的退出码
+    """
+    output = output or sys.stdout.buffer
+
+    def log(text):
+        output.write(f"{text}\n".encode("utf-8"))
+        output.flush()
+
+    if not daemon_supported():
+        log("当前平台不支持常驻构建进程，直接运行 PyInstaller")
+        return subprocess.call([sys.executable, "-m", "PyInstaller", *args])
+    try:
+        state = ensure_daemon(state_path, log)
+        conn = connect(state)
+    except (DaemonError, OSError, EOFError, multiprocessing.ProcessError) as e:
+        log(f"常驻构建进程不可用（{e}），直接运行 PyInstaller")
+        return subprocess.call([sys.executable, "-m", "PyInstaller", *args])
+
+    with conn:
+        conn.send({"op": "build", "args": list(args), "cwd": os.getcwd(), "env": dict(os.environ)})
+        try:
+            while True:
+                message = conn.recv()
+                if "output" in message:
+                    output.write(message["output"])
+                    output.flush()
+                elif "pid" in message:
+                    if pid_file:
+                        with open(pid_file, "w", encoding="ascii") as f:
+                            f.write(str(message["pid"]))
+                elif "exit" in message:
+                    return message["exit"]
+        except EOFError:
+            log("与常驻构建进程的连接已断开")
+            return 1
+
+
+def _set_default_paths(cwd):
+    """PyInstaller 在导入时按当前目录确定默认的 spec、输出和工作目录，fork 后改为请求的目录"""
+    import PyInstaller
+    from PyInstaller.building import build_main, makespec
+    PyInstaller.DEFAULT_SPECPATH = makespec.DEFAULT_SPECPATH = cwd
+    PyInstaller.DEFAULT_DISTPATH = build_main.DEFAULT_DISTPATH = os.path.join(cwd, "dist")
+    PyInstaller.DEFAULT_WORKPATH = build_main.DEFAULT_WORKPATH = os.path.join(cwd, "build")
+
+
+def _run_pyinstaller(args):
+    """在 fork 出的子进程中执行 PyInstaller，返回退出码"""
+    import PyInstaller.__main__
+    try:
+        PyInstaller.__main__.run(args)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+class BuildDaemon:
+    """常驻进程：预热 PyInstaller，每个连接一个线程，构建请求依次执行"""
+
+    def __init__(self, state_path):
+        self.state_path = state_path
+        self.started = time.time()
+        self.last_activity = time.monotonic()
+        self.build_lock = threading.Lock()
+        self.builds = 0
+        self.graphs = {}
+        self.listener = None
+
+        # 预热：导入 PyInstaller，缓存入口点提供的钩子目录（原本每次构建都在子进程中扫描 site-packages）
+        import PyInstaller.__main__
+        from PyInstaller.building import build_main
+        from PyInstaller.depend import analysis
+        self.parser = PyInstaller.__main__.generate_parser()
+        self.analysis = analysis
+        hook_dirs = build_main.discover_hook_directories()
+        build_main.discover_hook_directories = lambda: list(hook_dirs)
+        self.use_graph(())
+        self.fingerprint = environment_fingerprint()
+
+    def use_graph(self, excludes):
+        """
+        准备与本次构建的排除模块一致的基础依赖图
+
+        Analysis 在排除模块相同时复用 _cached_module_graph_，fork 出的子进程直接继承。
+        """
+        key = tuple(excludes)
+        if key not in self.graphs:
+            self.analysis._cached_module_graph_ = None
+            self.analysis.initialize_modgraph(excludes=list(key))
+            self.graphs[key] = self.analysis._cached_module_graph_
+            while len(self.graphs) > GRAPH_CACHE_SIZE:
+                self.graphs.pop(next(iter(self.graphs)))
+        self.analysis._cached_module_graph_ = self.graphs[key]
+
+    def request_excludes(self, args):
+        """从 PyInstaller 参数中取出排除模块，使用 .spec 文件时无法得知"""
+        try:
+            options, _ = self.parser.parse_known_args(args)
+        except SystemExit:
+            return ()
+        if not options.filenames or options.filenames[0].endswith(".spec"):
+            return ()
+        return tuple(options.excludes or ())
+
+    def serve(self):
+        authkey = os.urandom(32)
+        self.listener = Listener(family="AF_UNIX", authkey=authkey)
+        state = {"pid": os.getpid(), "address": self.listener.address, "authkey": authkey.hex()}
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        # 状态文件中有认证密钥，只允许当前用户读取
+        with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+        print(f"常驻构建进程已就绪: pid {os.getpid()}", flush=True)
+        threading.Thread(target=self.watch_idle, daemon=True).start()
+
+        while True:
+            try:
+                conn = self.listener.accept()
+            except (OSError, multiprocessing.ProcessError):
+                continue
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    def handle(self, conn):
+        """处理一个连接：状态查询立即应答，构建和结束请求等待正在进行的构建完成"""
+        try:
+            with conn:
+                message = conn.recv()
+                if message["op"] == "ping":
+                    conn.send({
+                        "pid": os.getpid(), "fingerprint": self.fingerprint, "protocol": PROTOCOL,
+                        "started": self.started, "builds": self.builds, "building": self.build_lock.locked(),
+                    })
+                elif message["op"] == "shutdown":
+                    with self.build_lock:
+                        conn.send({"ok": True})
+                        self.exit()
+                elif message["op"] == "build":
+                    with self.build_lock:
+                        self.builds += 1
+                        self.build(conn, message)
+                        self.last_activity = time.monotonic()
+        except (OSError, EOFError):
+            pass
+
+    def build(self, conn, message):
+        """fork 子进程执行构建，将其输出转发给客户端；客户端断开时结束构建"""
+        self.use_graph(self.request_excludes(message["args"]))
+        sys.stdout.flush()
+        sys.stderr.flush()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                os.setpgid(0, 0)
+                os.close(read_fd)
+                os.dup2(write_fd, 1)
+                os.dup2(write_fd, 2)
+                os.close(write_fd)
+                sys.stdout.reconfigure(line_buffering=True)
+                sys.stderr.reconfigure(line_buffering=True)
+                os.chdir(message["cwd"])
+                os.environ.clear()
+                os.environ.update(message["env"])
+                # 与 python -m PyInstaller 一致，当前目录优先于其他搜索路径
+                sys.path[0] = message["cwd"]
+                _set_default_paths(message["cwd"])
+                code = _run_pyinstaller(message["args"])
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+
+        os.close(write_fd)
+        try:
+            os.setpgid(pid, pid)
+        except OSError:
+            pass
+        try:
+            conn.send({"pid": pid})
+            while True:
+                readable, _, _ = select.select([read_fd, conn], [], [])
+                if conn in readable:
+                    # 客户端不会在构建中途发送数据，可读即表示已断开
+                    self.kill(pid)
+                    break
+                data = os.read(read_fd, CHUNK_SIZE)
+                if not data:
+                    break
+                conn.send({"output": data})
+        except OSError:
+            self.kill(pid)
+        finally:
+            os.close(read_fd)
+            _, status = os.waitpid(pid, 0)
+        conn.send({"exit": os.waitstatus_to_exitcode(status)})
+
+    @staticmethod
+    def kill(pid):
+        """结束构建子进程及其启动的进程"""
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+    def watch_idle(self):
+        while True:
+            time.sleep(60)
+            if time.monotonic() - self.last_activity > IDLE_TIMEOUT and self.build_lock.acquire(blocking=False):
+                print("空闲超时，常驻构建进程退出", flush=True)
+                self.exit()
+
+    def exit(self):
+        """删除状态文件和监听地址后退出"""
+        # 只删除属于本进程的状态文件
+        state = read_state(self.state_path)
+        if state and state["pid"] == os.getpid():
+            os.remove(self.state_path)
+        self.listener.close()
+        sys.stdout.flush()
+        os._exit(0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PyInstaller 常驻构建进程")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="状态文件路径")
+    parser.add_argument("--pid-file", default="", help="写入执行构建的子进程号")
+    parser.add_argument("--serve", action="store_true", help="作为常驻进程运行（通常自动启动）")
+    parser.add_argument("--status", action="store_true", help="显示常驻进程状态")
+    parser.add_argument("--stop", action="store_true", help="结束常驻进程")
+    parser.add_argument("pyinstaller_args", nargs=argparse.REMAINDER, help="-- 之后为 PyInstaller 参数")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        BuildDaemon(args.state).serve()
+        return 0
+    if args.status:
+        status = daemon_status(args.state)
+        if status is None:
+            print("常驻构建进程未运行")
+            return 1
+        uptime = time.time() - status["started"]
+        print(f"常驻构建进程 pid {status['pid']}，已运行 {uptime / 60:.0f} 分钟，完成 {status['builds']} 次构建")
+        return 0
+    if args.stop:
+        print("已结束常驻构建进程" if stop_daemon(args.state) else "常驻构建进程未运行")
+        return 0
+
+    pyinstaller_args = args.pyinstaller_args
+    if pyinstaller_args[:1] == ["--"]:
+        pyinstaller_args = pyinstaller_args[1:]
+    if not pyinstaller_args:
+        parser.print_usage(sys.stderr)
+        return 2
+    return run_build(pyinstaller_args, args.state, args.pid_file)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
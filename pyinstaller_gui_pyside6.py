@@ -7,16 +7,4886 @@ PySide6版本的PyInstaller命令构建器
 
 import sys
 import os
+import re
+import io
+import ast
+import bisect
+import json
+import mmap
+import time
+import shlex
+import shutil
+import tempfile
+import html
+import struct
+import hashlib
+import sqlite3
+import statistics
+import subprocess
+import sysconfig
+import threading
+import zipfile
+import zlib
+import tarfile
+import collections
+import importlib.machinery
+import importlib.metadata
+import importlib.util
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from PIL import Image
+
+import build_daemon
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QFormLayout, QTabWidget, QGroupBox, QLabel, QLineEdit, QPushButton, 
-    QRadioButton, QCheckBox, QComboBox, QListWidget, QTextEdit, 
-    QFileDialog, QMessageBox, QInputDialog, QScrollArea
+    QRadioButton, QCheckBox, QComboBox, QListWidget, QListWidgetItem, QTextEdit, 
+    QFileDialog, QMessageBox, QInputDialog, QScrollArea, QListView,
+    QDialog, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+    QSpinBox, QDoubleSpinBox, QTreeWidget, QTreeWidgetItem, QCompleter
+)
+from PySide6.QtCore import (
+    Qt, QProcess, QProcessEnvironment, QPointF, QObject, QRunnable, QThreadPool, QTimer, Signal,
+    QAbstractListModel, QModelIndex, QUrl
+)
+from PySide6.QtGui import (
+    QFont, QDragEnterEvent, QDropEvent, QIcon, QPixmap, QPainter, QBrush, QColor, QPen, QDesktopServices
+)
+
+
+# 随程序分发的运行时辅助模块所在目录
+RUNTIME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runtime")
+
+# 本地数据目录（构建历史等）
+APP_DATA_DIR = os.path.join(str(Path.home()), ".pyinstaller_gui")
+
+# 常驻构建进程的状态文件（监听地址、认证密钥和进程号）
+DAEMON_STATE_PATH = os.path.join(APP_DATA_DIR, "build-daemon.json")
+
+# 界面配置的默认值，get_config()/apply_config() 使用的快照格式
+DEFAULT_CONFIG = {
+    "script": "",
+    # 其他入口脚本：与主脚本共享同一次分析和同一个输出目录
+    "extra_scripts": [],
+    "onefile": False,
+    "windowed": False,
+    "icon": "",
+    "name": "",
+    "output": "",
+    "work": "",
+    "search_paths": [],
+    "clean": False,
+    "noconfirm": True,
+    "uac": False,
+    "hidden_imports": [],
+    "collect": "",
+    "exclude_modules": [],
+    "data_files": [],
+    "binary_files": [],
+    "sidecar_data_files": [],
+    "sidecar_name": "",
+    "debug": False,
+    "noupx": False,
+    "strip": False,
+    "upx_exclude": "",
+    "log_level": "INFO",
+    "optimize": -1,
+    "key": "",
+    "splash": "",
+    # 启动画面优化（缩放到目标尺寸、减少调色板、重新压缩）
+    "splash_optimize": False,
+    "splash_width": 600,
+    "splash_height": 400,
+    "splash_colors": 256,
+    # 启动基准测试
+    "bench_after_build": False,
+    "bench_runs": 5,
+    "bench_args": "",
+    "bench_marker": "",
+    "bench_timeout": 60,
+    # 启动内存基准测试
+    "memory_bench_after_build": False,
+    "memory_trace": False,
+    # 冻结程序导入计时
+    "import_trace": False,
+    # 单文件模式运行时解压
+    "runtime_tmpdir": "",
+    "bootloader_ignore_signals": False,
+    "extract_bench_after_build": False,
+    # 通过常驻构建进程执行构建，省去每次导入 PyInstaller 和建立基础依赖图的时间
+    "build_daemon": False,
+    # 内存盘构建：工作目录（以及可选的输出暂存目录）放在 tmpfs 等内存盘上，为空时 Linux 使用 /dev/shm
+    "ramdisk_work": False,
+    "ramdisk_dist": False,
+    "ramdisk_dir": "",
+    # 目录模式产物去重：""=仅报告，"hardlink"/"symlink"=用链接替换重复文件
+    "dedupe_after_build": False,
+    "dedupe_link": "",
+    "dedupe_verify": True,
+    # 本地钩子目录（为空时使用项目中的 pyinstaller_hooks 目录），其中的钩子优先于 PyInstaller 自带的同名钩子
+    "hooks_enabled": True,
+    "hooks_dir": "",
+    # 可复现构建：固定 SOURCE_DATE_EPOCH 和 PYTHONHASHSEED，统一产物的文件时间（0=使用最近一次 Git 提交时间）
+    "reproducible": False,
+    "source_date_epoch": 0,
+    # 构建后打包归档："zip" / "tar.gz" / "tar.zst"
+    "archive_after_build": False,
+    "archive_format": "zip",
+    "archive_level": 6,
+    # 性能预算（0 表示不限制）
+    "gate_enabled": False,
+    "budget_size_mb": 0.0,
+    "budget_files": 0,
+    "budget_duration": 0.0,
+    "budget_startup_ms": 0.0,
+    "budget_baseline": True,
+    "budget_tolerance": 5.0,
+    # 构建资源监视
+    "monitor_enabled": True,
+    "monitor_interval_ms": 500,
+    "memory_limit_mb": 0,
+    # 构建方案（为空表示直接使用基础配置）
+    "profile": "",
+}
+
+# 多入口构建时注入到生成的 spec 文件中：每个入口脚本生成一个可执行文件，
+# 全部可执行文件共享同一次分析（Analysis）和同一个依赖目录（COLLECT）
+MULTI_ENTRY_SPEC_PATCH = """
+# 由 PyInstaller GUI 构建器注入：多个入口脚本共享同一次分析和同一个依赖目录
+_ENTRIES = {entries!r}
+_EXE, _COLLECT = EXE, COLLECT
+
+
+def EXE(*args, name=None, **kwargs):
+    entry_names = {{stem for stem, _ in _ENTRIES}}
+    common = [s for s in a.scripts if s[0] not in entry_names]
+    exes = []
+    for stem, exe_name in _ENTRIES:
+        scripts = common + [s for s in a.scripts if s[0] == stem]
+        exe_args = [scripts if arg is a.scripts else arg for arg in args]
+        exes.append(_EXE(*exe_args, name=exe_name, **kwargs))
+    return exes
+
+
+def COLLECT(exes, *args, **kwargs):
+    return _COLLECT(*exes, *args, **kwargs)
+
+"""
+
+# 构建方案可以覆盖的选项
+PROFILE_KEYS = {
+    "onefile": "单文件",
+    "windowed": "窗口模式",
+    "clean": "清理缓存",
+    "noupx": "禁用UPX",
+    "strip": "移除符号表",
+    "upx_exclude": "UPX排除模块",
+    "debug": "调试模式",
+    "log_level": "日志级别",
+    "optimize": "字节码优化",
+    "splash_optimize": "启动画面优化",
+    "memory_trace": "内存归因钩子",
+    "import_trace": "导入计时钩子",
+    "reproducible": "可复现构建",
+}
+
+# 内置构建方案：叠加在基础配置之上
+BUILTIN_PROFILES = {
+    # 构建最快：目录模式、不压缩、保留缓存、控制台模式
+    "dev-fast": {
+        "onefile": False, "windowed": False, "clean": False, "noupx": True, "strip": False,
+        "debug": False, "log_level": "WARN", "optimize": -1, "splash_optimize": False,
+    },
+    # 体积最小：单文件、UPX、移除符号表、移除文档字符串；发布版本可复现
+    "release-small": {
+        "onefile": True, "clean": True, "noupx": False, "strip": sys.platform != "win32",
+        "debug": False, "optimize": 2, "splash_optimize": True, "memory_trace": False,
+        "import_trace": False, "reproducible": True,
+    },
+}
+
+# 外部数据包格式：头部(魔数 + 索引偏移 + 索引长度) + 对齐的未压缩数据 + JSON索引
+SIDECAR_PACK_MAGIC = b"PYGPAK01"
+SIDECAR_PACK_HEADER = struct.Struct("<8sQQ")
+SIDECAR_PACK_ALIGN = 64
+SIDECAR_ITEM_SUFFIX = "  [外部数据包]"
+
+# 资源条目中的 glob 模式："模式|排除模式;目标路径"，如 "assets/**/*.png|**/*_draft.png;images"
+GLOB_CHARS = set("*?[")
+GLOB_EXCLUDE_SEPARATOR = "|"
+
+# 本地钩子目录的默认名称（位于项目目录中，可随项目一起提交）
+DEFAULT_HOOKS_DIR_NAME = "pyinstaller_hooks"
+
+# 精简钩子模板: {名称: (说明, 参数说明, 默认参数)}
+HOOK_TEMPLATES = {
+    "matplotlib-backend": ("Matplotlib：只收集指定的后端", "后端名称（逗号分隔）", "QtAgg"),
+    "qt-plugins": (
+        "Qt：只收集用到的插件", "保留的插件（类型/文件名模式，逗号分隔）",
+        "platforms/*, platformthemes/*, imageformats/*png*, imageformats/*jpeg*, imageformats/*ico*, iconengines/*svg*",
+    ),
+    "blank": ("空白钩子：代替任意模块的自带钩子", "模块名", ""),
+}
+
+HOOK_HEADER = "# 由 PyInstaller GUI 构建器生成（精简钩子模板: {template}）\n"
+
+MATPLOTLIB_BACKEND_HOOK = HOOK_HEADER + """\
+# 代替 PyInstaller 自带的 hook-matplotlib.backends.py：只收集下列后端，不再扫描代码和探测全部可用后端
+hiddenimports = {modules!r}
+"""
+
+# 追加在 PyInstaller 自带的 Qt 模块钩子之后：依赖收集方式不变，只过滤插件
+QT_PLUGINS_FILTER = """
+# ---- 由 PyInstaller GUI 构建器追加（精简钩子模板: qt-plugins）：Qt 插件只保留匹配的文件 ----
+import fnmatch as _fnmatch
+import os as _os
+
+_KEEP_PLUGINS = {patterns!r}
+
+
+def _keep_binary(source, dest):
+    parts = dest.replace(_os.sep, "/").split("/")
+    if "plugins" not in parts:
+        return True
+    plugin = "/".join(parts[parts.index("plugins") + 1:] + [_os.path.basename(source)])
+    return any(_fnmatch.fnmatch(plugin, pattern) for pattern in _KEEP_PLUGINS)
+
+
+binaries = [(source, dest) for source, dest in binaries if _keep_binary(source, dest)]
+"""
+
+BLANK_HOOK = HOOK_HEADER + """\
+# 代替 PyInstaller 自带的 hook-{module}.py，参考 https://pyinstaller.org/en/stable/hooks.html
+hiddenimports = []
+excludedimports = []
+datas = []
+binaries = []
+"""
+
+QT_BINDINGS = ("PySide6", "PyQt6", "PySide2", "PyQt5")
+
+# 构建前估算：没有构建历史时，只使用标准库的最小程序的典型体积（Python 运行库、基础库和引导程序）
+ESTIMATE_RUNTIME_SIZE = 12 * 1024 * 1024
+# 单文件模式相对目录模式的典型体积比例（归档中的内容经过 zlib 压缩）
+ESTIMATE_ONEFILE_RATIO = 0.5
+
+# 内存盘构建：构建后至少保留的剩余空间；没有记录时工作目录按产物体积的倍数估算，没有任何构建时的预计空间
+RAMDISK_RESERVE = 256 * 1024 * 1024
+RAMDISK_WORK_RATIO = 2
+RAMDISK_DEFAULT_REQUIRED = 1024 * 1024 * 1024
+
+# 增量更新包格式（与 runtime/apply_patch.py 保持一致）：ZIP 包内 manifest.json + full/ 完整文件 + delta/ 差异
+PATCH_FORMAT = 1
+PATCH_BLOCK_SIZE = 4096
+PATCH_PROBE_SIZE = 32
+# 大于此体积的文件先在均匀分布的若干窗口内抽样探测可复用的块
+PATCH_SAMPLE_MIN_SIZE = 4 * 1024 * 1024
+PATCH_SAMPLE_WINDOWS = 128
+DELTA_COPY = b"C"
+DELTA_DATA = b"D"
+DELTA_COPY_STRUCT = struct.Struct("<QQ")
+DELTA_DATA_STRUCT = struct.Struct("<Q")
+
+# 可复现构建的默认时间戳：1980-01-01，ZIP 格式能表示的最早时间
+REPRODUCIBLE_EPOCH = 315532800
+
+# 构建后打包归档
+ARCHIVE_FORMATS = {"zip": "ZIP (.zip)", "tar.gz": "tar.gz (.tar.gz)", "tar.zst": "tar.zst (.tar.zst)"}
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+# 本身已经压缩的文件格式：原样存储，不再重复压缩
+ARCHIVE_STORED_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".icns", ".mp3", ".ogg", ".m4a", ".mp4", ".webm",
+    ".woff", ".woff2", ".zip", ".pyz", ".whl", ".egg", ".jar", ".gz", ".tgz", ".bz2", ".xz", ".lzma", ".zst", ".7z",
+}
+ZIP_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+ZIP_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+ZIP_END_RECORD = struct.Struct("<IHHHHIIH")
+ZIP64_END_RECORD = struct.Struct("<IQHHIIQQQQ")
+ZIP64_LOCATOR = struct.Struct("<IIQI")
+
+# 批量拖放资源时的目标路径规则
+BATCH_TARGET_RULES = {
+    "relative": "保持相对目录结构（相对于根目录）",
+    "flat": "全部放到同一目标路径下",
+}
+
+# 构建日志视图在内存中保留的最大行数（完整日志写入磁盘）
+LOG_BUFFER_LINES = 200000
+# 搜索索引按固定行数分块，旧行被覆盖时整块丢弃
+LOG_INDEX_CHUNK_LINES = 10000
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+LOG_LEVEL_PATTERN = re.compile(r"^\d+ (DEBUG|INFO|WARNING|WARN|ERROR|CRITICAL|DEPRECATION):")
+LOG_LEVEL_COLORS = {"DEBUG": "#6c757d", "INFO": "#212529", "WARNING": "#b35900", "ERROR": "#dc3545"}
+
+# 构建警告（warn-<名称>.txt）中缺失模块的分类
+MISSING_CATEGORIES = {
+    "real": "真实缺失",
+    "optional": "可选依赖",
+    "platform": "平台相关",
+    "excluded": "已排除",
+}
+WARN_LINE_PATTERN = re.compile(r"^(missing|excluded) module named (\S+) - imported by (.*)$")
+
+# PyInstaller 6 中 Analysis-00.toc 的字段顺序（Analysis._GUTS）
+ANALYSIS_TOC_FIELDS = (
+    "inputs", "pathex", "hiddenimports", "hookspath", "hooksconfig", "excludes", "custom_runtime_hooks",
+    "noarchive", "module_collection_mode", "optimize", "_input_binaries", "_input_datas",
+    "_python_version", "scripts", "pure", "binaries", "zipfiles", "zipped_data", "datas",
+    "_modules_outside_pyz",
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QDragEnterEvent, QDropEvent, QIcon, QPixmap, QPainter, QBrush, QColor
+# 计入产物体积的 TOC 字段
+ANALYSIS_COLLECTED_FIELDS = ("scripts", "pure", "binaries", "datas", "_modules_outside_pyz")
+
+# 只存在于特定平台的模块，在其他平台上缺失属于正常现象
+PLATFORM_MODULES = {
+    "win32": {
+        "winreg", "_winreg", "nt", "_winapi", "msvcrt", "_msi", "_overlapped", "winsound", "_wmi",
+        "win32api", "win32con", "win32com", "win32file", "win32pipe", "win32process", "win32event",
+        "win32security", "win32pdh", "pywintypes", "pythoncom", "_win32typing", "wmi", "comtypes",
+        "ntsecuritycon",
+    },
+    "darwin": {"_scproxy", "AppKit", "Foundation", "objc", "CoreFoundation", "Quartz", "PyObjCTools"},
+    "posix": {"posix", "pwd", "grp", "termios", "fcntl", "resource", "_posixsubprocess", "_posixshmem", "readline"},
+    # Jython、RISC OS、VMS 等其他解释器/系统
+    "other": {"java", "org", "riscos", "riscosenviron", "riscospath", "vms_lib", "ce", "os2", "_emx_link"},
+}
+
+
+def format_size(size):
+    """将字节数格式化为易读的字符串"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def get_project_root(config):
+    """项目根目录（脚本所在目录），构建时也作为工作目录"""
+    return os.path.dirname(os.path.abspath(config["script"]))
+
+
+def get_app_name(config):
+    """可执行文件名称（未指定时使用脚本文件名）"""
+    return config["name"].strip() or Path(config["script"].strip()).stem
+
+
+def get_dist_dir(config):
+    """最终可执行文件所在目录"""
+    dist_path = os.path.join(get_project_root(config), config["output"].strip() or "dist")
+    if config["onefile"]:
+        return dist_path
+    return os.path.join(dist_path, get_app_name(config))
+
+
+def get_work_dir(config):
+    """PyInstaller 为本程序使用的工作目录（warn/xref 等文件所在位置）"""
+    work_path = os.path.join(get_project_root(config), config["work"].strip() or "build")
+    return os.path.join(work_path, get_app_name(config))
+
+
+def get_artifact_path(config):
+    """构建产物路径：单文件模式为可执行文件，目录模式为输出目录"""
+    if not config["onefile"]:
+        return get_dist_dir(config)
+    suffix = ".exe" if sys.platform == "win32" else ""
+    return os.path.join(get_dist_dir(config), get_app_name(config) + suffix)
+
+
+def get_entry_points(config):
+    """
+    全部入口脚本及其可执行文件名，主脚本在前
+    
+    Returns:
+        [(脚本路径, 可执行文件名), ...]
+    """
+    entries = [(config["script"], get_app_name(config))]
+    entries += [(script, Path(script).stem) for script in config.get("extra_scripts", [])]
+    return entries
+
+
+def get_multi_entry_spec_path(config):
+    """多入口构建使用的 spec 文件路径（位于工作目录中）"""
+    work_path = os.path.join(get_project_root(config), config["work"].strip() or "build")
+    return os.path.join(work_path, f"{get_app_name(config)}.spec")
+
+
+def get_sidecar_pack_path(config):
+    """外部数据包的输出路径（位于可执行文件旁）"""
+    pack_name = config["sidecar_name"].strip() or f"{get_app_name(config)}.pak"
+    return os.path.join(get_dist_dir(config), pack_name)
+
+
+def get_executable_path(config):
+    """构建出的可执行文件路径"""
+    suffix = ".exe" if sys.platform == "win32" else ""
+    return os.path.join(get_dist_dir(config), get_app_name(config) + suffix)
+
+
+def measure_artifact(path):
+    """
+    统计构建产物的总字节数和文件数
+    
+    Returns:
+        (总字节数, 文件数)，产物不存在时返回 (0, 0)
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path), 1
+    
+    total_size = 0
+    file_count = 0
+    seen_inodes = set()
+    for root, dirs, files in os.walk(path):
+        for file_name in files:
+            file_path = os.path.join(root, file_name)
+            if not os.path.islink(file_path):
+                # 硬链接的多个路径只占用一份磁盘空间
+                stat = os.stat(file_path)
+                if stat.st_nlink > 1:
+                    if (stat.st_dev, stat.st_ino) in seen_inodes:
+                        file_count += 1
+                        continue
+                    seen_inodes.add((stat.st_dev, stat.st_ino))
+                total_size += stat.st_size
+            file_count += 1
+    return total_size, file_count
+
+
+DEDUPE_MODES = {"": "仅报告", "hardlink": "硬链接", "symlink": "符号链接"}
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """文件内容的 SHA-256（hashlib 处理大块数据时释放 GIL，可在线程池中并行）"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_duplicate_files(root, workers=None):
+    """
+    查找目录中内容完全相同的文件
+    
+    先按大小分组，只对大小相同的文件并行计算哈希；符号链接和已经互为硬链接的文件不重复计算。
+    
+    Returns:
+        重复文件组列表 [{"size", "paths", "wasted"}]，按浪费的字节数降序；paths 中层级最浅的在前
+    """
+    by_size = {}
+    seen_inodes = set()
+    for directory, dirs, files in os.walk(root):
+        for file_name in files:
+            path = os.path.join(directory, file_name)
+            if os.path.islink(path):
+                continue
+            stat = os.stat(path)
+            if (stat.st_dev, stat.st_ino) in seen_inodes or stat.st_size == 0:
+                continue
+            seen_inodes.add((stat.st_dev, stat.st_ino))
+            by_size.setdefault(stat.st_size, []).append(path)
+    
+    candidates = [path for paths in by_size.values() if len(paths) > 1 for path in paths]
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as executor:
+        digests = dict(zip(candidates, executor.map(hash_file, candidates)))
+    
+    groups = {}
+    for path in candidates:
+        groups.setdefault((os.path.getsize(path), digests[path]), []).append(path)
+    duplicates = [
+        {
+            "size": size,
+            "paths": sorted(paths, key=lambda path: (path.count(os.sep), path)),
+            "wasted": size * (len(paths) - 1),
+        }
+        for (size, _), paths in groups.items() if len(paths) > 1
+    ]
+    duplicates.sort(key=lambda group: group["wasted"], reverse=True)
+    return duplicates
+
+
+def link_duplicates(groups, mode, protected=()):
+    """
+    用硬链接或符号链接替换重复文件，每组保留第一个文件
+    
+    替换先写临时链接再原子重命名；中途失败时删除临时链接，将已替换的文件还原为独立副本后重新抛出异常。
+    
+    Args:
+        groups: find_duplicate_files() 的结果
+        mode: "hardlink" 或 "symlink"
+        protected: 不能被替换的路径（如程序入口的可执行文件），优先作为保留的文件
+        
+    Returns:
+        已替换的 [(路径, 保留的文件)]，可传给 restore_duplicates() 还原
+    """
+    protected = {os.path.abspath(path) for path in protected}
+    replaced = []
+    try:
+        for group in groups:
+            paths = sorted(group["paths"], key=lambda path: os.path.abspath(path) not in protected)
+            original = paths[0]
+            for path in paths[1:]:
+                if os.path.abspath(path) in protected:
+                    continue
+                temp_path = path + ".dedupe-tmp"
+                try:
+                    if mode == "symlink":
+                        os.symlink(os.path.relpath(original, os.path.dirname(path)), temp_path)
+                    else:
+                        os.link(original, temp_path)
+                    os.replace(temp_path, path)
+                finally:
+                    if os.path.lexists(temp_path):
+                        os.remove(temp_path)
+                replaced.append((path, original))
+    except Exception:
+        restore_duplicates(replaced)
+        raise
+    return replaced
+
+
+def verify_launch(executable, args=(), marker="", timeout=60, env=None):
+    """
+    启动一次程序，确认其仍能正常运行
+    
+    设置了 marker 时要求输出中出现该文本，否则要求进程以退出码 0 结束；失败时抛出异常。
+    env 为追加到当前环境的环境变量。
+    """
+    process = subprocess.Popen(
+        [executable, *args],
+        cwd=os.path.dirname(executable),
+        env=dict(os.environ, **env) if env else None,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+    )
+    timer = threading.Timer(timeout, process.kill)
+    timer.start()
+    output = []
+    try:
+        for line in process.stdout:
+            output.append(line.decode("utf-8", errors="replace"))
+            if marker and marker in output[-1]:
+                break
+        else:
+            process.wait()
+    finally:
+        timed_out = not timer.is_alive()
+        timer.cancel()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        process.stdout.close()
+    
+    if timed_out:
+        raise TimeoutError(f"程序在 {timeout} 秒内未{'输出退出探针' if marker else '退出'}")
+    tail = "".join(output[-10:]).rstrip()
+    if marker and marker not in tail:
+        raise RuntimeError(f"输出中未出现退出探针，退出码 {process.returncode}:\n{tail}")
+    if not marker and process.returncode != 0:
+        raise RuntimeError(f"程序退出码 {process.returncode}:\n{tail}")
+
+
+def restore_duplicates(replaced):
+    """将链接还原为独立的文件副本"""
+    for path, original in replaced:
+        os.remove(path)
+        shutil.copy2(original, path)
+
+
+def dedupe_output(config, mode="", verify=True):
+    """
+    对目录模式的构建产物去重
+    
+    Args:
+        config: 构建配置
+        mode: ""=仅报告，"hardlink"/"symlink"=替换重复文件
+        verify: 替换后启动一次程序（使用启动基准测试的参数和退出探针），失败时还原
+        
+    Returns:
+        {"root", "groups", "wasted", "replaced", "saved", "verified", "error"}
+    """
+    root = get_dist_dir(config)
+    groups = find_duplicate_files(root)
+    result = {
+        "root": root, "groups": groups, "wasted": sum(group["wasted"] for group in groups),
+        "replaced": 0, "saved": 0, "verified": None, "error": "",
+    }
+    if not mode or not groups:
+        return result
+    
+    suffix = ".exe" if sys.platform == "win32" else ""
+    executables = [os.path.join(get_dist_dir(config), name + suffix) for _, name in get_entry_points(config)]
+    replaced = []
+    try:
+        replaced = link_duplicates(groups, mode, executables)
+        if verify:
+            bench_args = shlex.split(config["bench_args"], posix=os.name != "nt")
+            verify_launch(get_executable_path(config), bench_args, config["bench_marker"], config["bench_timeout"])
+            result["verified"] = True
+    except Exception as e:
+        restore_duplicates(replaced)
+        result.update(verified=False if verify else None, error=str(e))
+        return result
+    
+    sizes = {path: os.path.getsize(original) for path, original in replaced}
+    result.update(replaced=len(replaced), saved=sum(sizes.values()))
+    return result
+
+
+def format_dedupe_report(result, limit=10):
+    """去重结果的文本报告"""
+    groups = result["groups"]
+    if not groups:
+        return "未发现重复文件"
+    lines = [f"发现 {len(groups)} 组重复文件，浪费 {format_size(result['wasted'])}"]
+    for group in groups[:limit]:
+        lines.append(f"  {format_size(group['size']):>10} × {len(group['paths'])}  " + ", ".join(
+            os.path.relpath(path, result["root"]) for path in group["paths"]
+        ))
+    if len(groups) > limit:
+        lines.append(f"  ……另有 {len(groups) - limit} 组")
+    if result["error"]:
+        lines.append(f"替换失败，已还原为独立文件: {result['error']}")
+    elif result["replaced"]:
+        text = f"已用链接替换 {result['replaced']} 个文件，节省 {format_size(result['saved'])}"
+        if result["verified"]:
+            text += "，启动验证通过"
+        lines.append(text)
+    return "\n".join(lines)
+
+
+def _common_prefix_length(old, old_offset, new, new_offset, limit):
+    """两段数据从给定位置开始相同的字节数（按块比较，不同时缩小块直到定位到第一个不同字节）"""
+    length = 0
+    step = 64 * 1024
+    while length < limit and step:
+        size = min(step, limit - length)
+        if old[old_offset + length:old_offset + length + size] == new[new_offset + length:new_offset + length + size]:
+            length += size
+            step = min(step * 2, 64 * 1024)
+        else:
+            step //= 2
+    return length
+
+
+def compute_delta(old_path, new_path, out, block_size=PATCH_BLOCK_SIZE, min_copied=0):
+    """
+    计算新文件相对旧文件的二进制差异
+    
+    旧文件按块建立索引（以块开头 PATCH_PROBE_SIZE 字节的哈希作为快速探测），逐字节扫描新文件：
+    命中的块向后延伸为复制指令，其余字节作为数据指令。内容整体平移时，每处改动
+    最多扫描一个块的长度即可重新对齐。
+    
+    逐字节扫描没有命中的内容较慢，设置 min_copied 时会提前放弃：大文件先在
+    PATCH_SAMPLE_WINDOWS 个均匀分布的窗口内探测，一个块也没有命中时不再扫描；
+    扫描中剩余内容即使全部命中也达不到 min_copied 时立即停止。
+    
+    Args:
+        old_path: 旧文件路径
+        new_path: 新文件路径
+        out: 写入差异数据的文件对象
+        block_size: 索引块大小
+        min_copied: 可复用字节数的下限
+        
+    Returns:
+        从旧文件复制的字节数，提前放弃时为 None（out 中的内容不完整）
+    """
+    with open(old_path, "rb") as old_file, open(new_path, "rb") as new_file:
+        old_size = os.fstat(old_file.fileno()).st_size
+        new_size = os.fstat(new_file.fileno()).st_size
+        old = mmap.mmap(old_file.fileno(), 0, access=mmap.ACCESS_READ) if old_size else b""
+        new = mmap.mmap(new_file.fileno(), 0, access=mmap.ACCESS_READ) if new_size else b""
+        try:
+            index = {}
+            for offset in range(0, old_size - block_size + 1, block_size):
+                index.setdefault(hash(old[offset:offset + PATCH_PROBE_SIZE]), offset)
+            
+            def find_block(position):
+                offset = index.get(hash(new[position:position + PATCH_PROBE_SIZE]))
+                if offset is None or old[offset:offset + block_size] != new[position:position + block_size]:
+                    return None
+                return offset
+            
+            # 长度不小于两个块的可复用内容必然有一个块从窗口内的某个位置开始
+            if min_copied and new_size >= PATCH_SAMPLE_MIN_SIZE:
+                stride = new_size // PATCH_SAMPLE_WINDOWS
+                if not any(
+                    find_block(position) is not None
+                    for start in range(0, new_size - 2 * block_size, stride)
+                    for position in range(start, start + block_size)
+                ):
+                    return None
+            
+            copied = 0
+            literal_start = position = 0
+            # 扫描位置超过 give_up 时，剩余内容全部命中也达不到 min_copied
+            give_up = new_size - min_copied
+            while position + block_size <= new_size:
+                offset = find_block(position)
+                if offset is None:
+                    position += 1
+                    if position > give_up:
+                        return None
+                    continue
+                length = block_size + _common_prefix_length(
+                    old, offset + block_size, new, position + block_size,
+                    min(old_size - offset, new_size - position) - block_size,
+                )
+                if position > literal_start:
+                    out.write(DELTA_DATA + DELTA_DATA_STRUCT.pack(position - literal_start))
+                    out.write(new[literal_start:position])
+                out.write(DELTA_COPY + DELTA_COPY_STRUCT.pack(offset, length))
+                copied += length
+                give_up += length
+                position = literal_start = position + length
+            if new_size > literal_start:
+                out.write(DELTA_DATA + DELTA_DATA_STRUCT.pack(new_size - literal_start))
+                out.write(new[literal_start:new_size])
+            return copied
+        finally:
+            for data in (old, new):
+                if isinstance(data, mmap.mmap):
+                    data.close()
+
+
+def index_build_output(path):
+    """
+    产物中每个文件的 {相对路径: (绝对路径, sha256, 字节数, 权限位)}，单个文件时相对路径为文件名
+    
+    哈希在线程池中并行计算；符号链接按其指向的内容处理
+    """
+    if os.path.isfile(path):
+        paths = {os.path.basename(path): path}
+    else:
+        paths = {
+            os.path.relpath(os.path.join(root, name), path).replace(os.sep, "/"): os.path.join(root, name)
+            for root, dirs, files in os.walk(path) for name in files
+        }
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as executor:
+        digests = dict(zip(paths, executor.map(hash_file, paths.values())))
+    index = {}
+    for name, file_path in paths.items():
+        stat = os.stat(file_path)
+        index[name] = (file_path, digests[name], stat.st_size, stat.st_mode & 0o777)
+    return index
+
+
+def write_patch_package(base_path, new_path, patch_path):
+    """
+    比较新旧两个版本的产物，生成增量更新包
+    
+    内容未变的文件不写入；内容与旧版本某个文件相同的记为复制；同名文件变化时写入二进制差异
+    （可复用的内容不足一成时改为完整文件）；新增文件写入完整内容。包内附带 runtime/apply_patch.py
+    作为 __main__.py，可直接用 python 运行更新包。
+    
+    Args:
+        base_path: 旧版本的产物（目录或单个可执行文件）
+        new_path: 新版本的产物
+        patch_path: 更新包输出路径
+        
+    Returns:
+        {"patch_size", "full_size", "unchanged", "copied", "delta", "full", "removed"}
+    """
+    base = index_build_output(base_path)
+    new = index_build_output(new_path)
+    # 单文件程序改名后仍按同一个文件比较
+    if os.path.isfile(base_path) and os.path.isfile(new_path):
+        base = {name: value for name, value in zip(new, base.values())}
+    base_by_hash = {}
+    for name, (_, digest, _, _) in sorted(base.items()):
+        base_by_hash.setdefault(digest, name)
+    
+    manifest = {
+        "format": PATCH_FORMAT,
+        "base": {name: digest for name, (_, digest, _, _) in base.items()},
+        "target": {name: {"sha256": digest, "size": size, "mode": mode} for name, (_, digest, size, mode) in new.items()},
+        "files": {},
+        "removed": sorted(set(base) - set(new)),
+    }
+    counts = {"unchanged": 0, "copied": 0, "delta": 0, "full": 0}
+    temp_path = patch_path + ".tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(patch_path)), exist_ok=True)
+    try:
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_LZMA) as archive:
+            for number, name in enumerate(sorted(new)):
+                path, digest, size, _ = new[name]
+                if name in base and base[name][1] == digest:
+                    counts["unchanged"] += 1
+                    continue
+                if digest in base_by_hash:
+                    manifest["files"][name] = {"action": "copy", "source": base_by_hash[digest]}
+                    counts["copied"] += 1
+                    continue
+                if name in base and size >= PATCH_BLOCK_SIZE:
+                    # 差异数据先写入临时文件，不在内存中缓存整个文件的差异
+                    with tempfile.TemporaryFile() as delta:
+                        reused = compute_delta(base[name][0], path, delta, min_copied=size // 10)
+                        if reused is not None and reused >= size // 10:
+                            entry = f"delta/{number}"
+                            delta.seek(0)
+                            with archive.open(entry, "w") as f:
+                                shutil.copyfileobj(delta, f, 1024 * 1024)
+                            manifest["files"][name] = {"action": "delta", "source": name, "entry": entry}
+                            counts["delta"] += 1
+                            continue
+                entry = f"full/{number}"
+                archive.write(path, entry)
+                manifest["files"][name] = {"action": "full", "entry": entry}
+                counts["full"] += 1
+            archive.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=1))
+            # zipimport 不支持 LZMA，直接运行时读取的 __main__.py 使用 deflate 压缩
+            archive.write(os.path.join(RUNTIME_DIR, "apply_patch.py"), "__main__.py", compress_type=zipfile.ZIP_DEFLATED)
+        os.replace(temp_path, patch_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    return dict(
+        counts,
+        patch_size=os.path.getsize(patch_path),
+        full_size=sum(size for _, _, size, _ in new.values()),
+        removed=len(manifest["removed"]),
+    )
+
+
+def format_patch_report(result):
+    """增量更新包的文本报告"""
+    ratio = result["patch_size"] / result["full_size"] if result["full_size"] else 0
+    return (
+        f"增量包 {format_size(result['patch_size'])}，完整产物 {format_size(result['full_size'])}（{ratio:.1%}）\n"
+        f"未变化 {result['unchanged']} 个文件，二进制差异 {result['delta']} 个，完整写入 {result['full']} 个，"
+        f"复用旧文件 {result['copied']} 个，删除 {result['removed']} 个"
+    )
+
+
+def get_release_dir(config):
+    """保存发布版本快照的目录"""
+    return os.path.join(APP_DATA_DIR, "releases", get_app_name(config))
+
+
+def save_release_snapshot(artifact_path, snapshot_path):
+    """
+    保存产物快照（作为之后生成增量包的旧版本）
+    
+    优先使用硬链接：PyInstaller 每次构建都会删除并重新写入输出目录，不会修改快照中的文件
+    """
+    def link_or_copy(source, destination):
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+    
+    if os.path.isfile(artifact_path):
+        os.makedirs(snapshot_path, exist_ok=True)
+        link_or_copy(artifact_path, os.path.join(snapshot_path, os.path.basename(artifact_path)))
+    else:
+        shutil.copytree(artifact_path, snapshot_path, symlinks=True, copy_function=link_or_copy)
+    return snapshot_path
+
+
+def list_release_snapshots(config):
+    """已保存的发布版本快照 [(名称, 路径)]，最新的在前"""
+    release_dir = get_release_dir(config)
+    if not os.path.isdir(release_dir):
+        return []
+    return [(name, os.path.join(release_dir, name)) for name in sorted(os.listdir(release_dir), reverse=True)]
+
+
+def _deflate_chunk(data, level, last):
+    """将一块数据压缩为原始 deflate 数据；非最后一块以同步刷新结束，各块可以直接拼接为一个 deflate 流"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class _OrderedWriter:
+    """
+    按提交顺序写出在线程池中并行压缩的数据块（与 pigz 相同的分块方式）
+    
+    zlib 压缩时释放 GIL，多个块可以同时压缩；在途的块数有上限，内存占用与产物大小无关
+    """
+    
+    def __init__(self, fileobj, executor, window):
+        self.fileobj = fileobj
+        self.executor = executor
+        self.window = window
+        self.queue = collections.deque()
+        self.blocks = 0
+    
+    def compress(self, data, level, last=False):
+        self._put(self.executor.submit(_deflate_chunk, data, level, last))
+    
+    def write(self, data):
+        self._put(data)
+    
+    def call(self, function):
+        """之前提交的数据全部写出后在当前线程调用 function（写入和回填文件头）"""
+        self.queue.append(function)
+    
+    def flush(self):
+        while self.queue:
+            self._pop()
+    
+    def _put(self, block):
+        self.queue.append(block)
+        self.blocks += 1
+        while self.blocks > self.window:
+            self._pop()
+    
+    def _pop(self):
+        item = self.queue.popleft()
+        if isinstance(item, Future):
+            item = item.result()
+        elif callable(item):
+            item()
+            return
+        self.blocks -= 1
+        self.fileobj.write(item)
+
+
+class _ZipArchiveWriter:
+    """流式写入 ZIP：条目数据写出后回填本地文件头中的 CRC 和大小，超过 2GB 的文件和偏移使用 ZIP64"""
+    
+    def __init__(self, fileobj, output, level, utc=False):
+        self.fileobj = fileobj
+        self.output = output
+        self.level = level
+        self.utc = utc
+        self.entries = []
+    
+    def add(self, path, name, stored):
+        info = os.lstat(path)
+        is_dir = os.path.isdir(path) and not os.path.islink(path)
+        entry = {
+            "name": (name + "/" if is_dir else name).encode("utf-8"),
+            "method": 0 if stored or is_dir or os.path.islink(path) else zipfile.ZIP_DEFLATED,
+            "mode": info.st_mode,
+            "dir": is_dir,
+            "date_time": self._date_time(info.st_mtime),
+            "zip64": not is_dir and info.st_size >= zipfile.ZIP64_LIMIT,
+            "crc": 0,
+            "size": 0,
+        }
+        self.entries.append(entry)
+        self.output.call(lambda: self._write_header(entry))
+        if os.path.islink(path):
+            # 与 Info-ZIP 相同：符号链接存储为指向的路径
+            target = os.readlink(path).encode("utf-8")
+            entry["crc"], entry["size"] = zlib.crc32(target), len(target)
+            self.output.write(target)
+        elif not is_dir:
+            with open(path, "rb") as f:
+                data = f.read(ARCHIVE_CHUNK_SIZE)
+                while True:
+                    following = f.read(ARCHIVE_CHUNK_SIZE) if data else b""
+                    entry["crc"] = zlib.crc32(data, entry["crc"])
+                    entry["size"] += len(data)
+                    if entry["method"] == zipfile.ZIP_DEFLATED:
+                        self.output.compress(data, self.level, last=not following)
+                    elif data:
+                        self.output.write(data)
+                    if not following:
+                        break
+                    data = following
+        self.output.call(lambda: self._finish_entry(entry))
+    
+    def close(self):
+        self.output.flush()
+        start = self.fileobj.tell()
+        for entry in self.entries:
+            size, compressed_size, offset = entry["size"], entry["compressed_size"], entry["offset"]
+            zip64_values = []
+            if entry["zip64"]:
+                zip64_values += [size, compressed_size]
+                size = compressed_size = 0xFFFFFFFF
+            if offset >= zipfile.ZIP64_LIMIT:
+                zip64_values.append(offset)
+                offset = 0xFFFFFFFF
+            extra = struct.pack(f"<HH{len(zip64_values)}Q", 1, 8 * len(zip64_values), *zip64_values) if zip64_values else b""
+            self.fileobj.write(ZIP_CENTRAL_HEADER.pack(
+                0x02014B50, 0x0300 | 45, 45 if zip64_values else 20, 0x800, entry["method"],
+                entry["date_time"][1], entry["date_time"][0], entry["crc"], compressed_size, size,
+                len(entry["name"]), len(extra), 0, 0, 0, (entry["mode"] & 0xFFFF) << 16 | (0x10 if entry["dir"] else 0),
+                offset,
+            ) + entry["name"] + extra)
+        end = self.fileobj.tell()
+        count = len(self.entries)
+        if count >= 0xFFFF or start >= zipfile.ZIP64_LIMIT or end - start >= zipfile.ZIP64_LIMIT:
+            self.fileobj.write(ZIP64_END_RECORD.pack(0x06064B50, 44, 45, 45, 0, 0, count, count, end - start, start))
+            self.fileobj.write(ZIP64_LOCATOR.pack(0x07064B50, 0, end, 1))
+        self.fileobj.write(ZIP_END_RECORD.pack(
+            0x06054B50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+            min(end - start, 0xFFFFFFFF), min(start, 0xFFFFFFFF), 0
+        ))
+    
+    def _date_time(self, timestamp):
+        """MS-DOS 格式的 (日期, 时间)"""
+        t = (time.gmtime if self.utc else time.localtime)(timestamp)
+        if t.tm_year < 1980:
+            return (1 << 5) | 1, 0
+        return (t.tm_year - 1980) << 9 | t.tm_mon << 5 | t.tm_mday, t.tm_hour << 11 | t.tm_min << 5 | t.tm_sec // 2
+    
+    def _write_header(self, entry):
+        entry["offset"] = self.fileobj.tell()
+        extra = struct.pack("<HHQQ", 1, 16, 0, 0) if entry["zip64"] else b""
+        self.fileobj.write(ZIP_LOCAL_HEADER.pack(
+            0x04034B50, 45 if entry["zip64"] else 20, 0x800, entry["method"],
+            entry["date_time"][1], entry["date_time"][0], 0, 0, 0, len(entry["name"]), len(extra),
+        ) + entry["name"] + extra)
+        entry["data_offset"] = self.fileobj.tell()
+    
+    def _finish_entry(self, entry):
+        end = self.fileobj.tell()
+        entry["compressed_size"] = end - entry["data_offset"]
+        self.fileobj.seek(entry["offset"] + 14)
+        if entry["zip64"]:
+            self.fileobj.write(struct.pack("<III", entry["crc"], 0xFFFFFFFF, 0xFFFFFFFF))
+            self.fileobj.seek(entry["offset"] + ZIP_LOCAL_HEADER.size + len(entry["name"]) + 4)
+            self.fileobj.write(struct.pack("<QQ", entry["size"], entry["compressed_size"]))
+        else:
+            self.fileobj.write(struct.pack("<III", entry["crc"], entry["compressed_size"], entry["size"]))
+        self.fileobj.seek(end)
+
+
+class _GzipStream:
+    """供 tarfile 写入的文件对象：数据按块并行压缩为一个 gzip 成员，已压缩文件的内容写为存储块"""
+    
+    def __init__(self, output, level):
+        self.output = output
+        self.level = level
+        self.stored = False
+        self.buffer = bytearray()
+        self.crc = 0
+        self.size = 0
+        # 不记录时间戳，相同内容生成相同的归档
+        output.write(b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff")
+    
+    def tell(self):
+        return self.size + len(self.buffer)
+    
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= ARCHIVE_CHUNK_SIZE:
+            self._submit()
+        return len(data)
+    
+    def set_stored(self, stored):
+        if stored != self.stored:
+            self._submit()
+            self.stored = stored
+    
+    def close(self):
+        self._submit(last=True)
+        self.output.write(struct.pack("<II", self.crc, self.size & 0xFFFFFFFF))
+    
+    def _submit(self, last=False):
+        if self.buffer or last:
+            data = bytes(self.buffer)
+            self.buffer.clear()
+            self.crc = zlib.crc32(data, self.crc)
+            self.size += len(data)
+            self.output.compress(data, 0 if self.stored else self.level, last)
+
+
+def list_archive_members(source):
+    """
+    归档内容 [(路径, 归档内名称)]，按名称排序
+    
+    目录模式以程序目录作为归档的顶层目录；符号链接不跟随
+    """
+    source = os.path.abspath(source)
+    base = os.path.dirname(source)
+    members = [(source, os.path.basename(source))]
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            for name in dirs + files:
+                path = os.path.join(root, name)
+                members.append((path, os.path.relpath(path, base).replace(os.sep, "/")))
+    return sorted(members, key=lambda member: member[1])
+
+
+def is_stored_archive_member(name):
+    """文件本身已经压缩，归档时原样存储"""
+    return os.path.splitext(name)[1].lower() in ARCHIVE_STORED_SUFFIXES
+
+
+def _add_tar_members(tar, members, before_file=None):
+    for path, name in members:
+        info = tar.gettarinfo(path, name)
+        # 不记录构建机器的用户信息；整数时间戳避免 PAX 扩展头
+        info.uid = info.gid = 0
+        info.uname = info.gname = ""
+        info.mtime = int(info.mtime)
+        if info.isreg():
+            if before_file:
+                before_file(name)
+            with open(path, "rb") as f:
+                tar.addfile(info, f)
+        else:
+            tar.addfile(info)
+
+
+def write_archive(source, archive_path, fmt="zip", level=6, utc=False):
+    """
+    将构建产物打包为 .zip、.tar.gz 或 .tar.zst 归档
+    
+    zip 和 tar.gz 按 1MB 分块在线程池中并行 deflate，按顺序流式写入文件；已压缩的文件（图片、
+    .zip、.pyz 等）原样存储。tar.zst 使用 zstandard 自带的多线程压缩（不可压缩的数据块由
+    zstd 自动存储）。ZIP 不支持硬链接，去重后的硬链接会存储多份。
+    
+    Args:
+        source: 构建产物（目录或单个可执行文件）
+        archive_path: 归档输出路径
+        fmt: "zip" / "tar.gz" / "tar.zst"
+        level: 压缩级别（1-9）
+        utc: ZIP 中的文件时间使用 UTC（可复现构建）
+        
+    Returns:
+        {"archive_path", "format", "archive_size", "source_size", "files", "stored", "seconds", "ratio", "threads"}
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"不支持的归档格式: {fmt}")
+    if fmt == "tar.zst" and zstandard is None:
+        raise RuntimeError("需要安装 zstandard: pip install zstandard")
+    
+    start = time.perf_counter()
+    members = list_archive_members(source)
+    files = [(path, name) for path, name in members if os.path.isfile(path) and not os.path.islink(path)]
+    source_size = sum(os.path.getsize(path) for path, _ in files)
+    threads = os.cpu_count() or 1
+    
+    temp_path = archive_path + ".tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(archive_path)), exist_ok=True)
+    try:
+        with open(temp_path, "wb") as f, ThreadPoolExecutor(max_workers=threads) as executor:
+            output = _OrderedWriter(f, executor, threads * 4)
+            if fmt == "zip":
+                writer = _ZipArchiveWriter(f, output, level, utc)
+                for path, name in members:
+                    writer.add(path, name, is_stored_archive_member(name))
+                writer.close()
+            elif fmt == "tar.gz":
+                stream = _GzipStream(output, level)
+                with tarfile.open(fileobj=stream, mode="w", format=tarfile.PAX_FORMAT) as tar:
+                    _add_tar_members(tar, members, lambda name: stream.set_stored(is_stored_archive_member(name)))
+                stream.close()
+                output.flush()
+            else:
+                compressor = zstandard.ZstdCompressor(level=level, threads=-1)
+                with compressor.stream_writer(f, closefd=False) as stream:
+                    with tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+                        _add_tar_members(tar, members)
+        os.replace(temp_path, archive_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    archive_size = os.path.getsize(archive_path)
+    return {
+        "archive_path": archive_path,
+        "format": fmt,
+        "archive_size": archive_size,
+        "source_size": source_size,
+        "files": len(files),
+        "stored": sum(1 for _, name in files if is_stored_archive_member(name)),
+        "seconds": time.perf_counter() - start,
+        "ratio": archive_size / source_size if source_size else 0,
+        "threads": threads,
+    }
+
+
+def get_archive_path(config):
+    """产物归档的输出路径：与产物（单个文件或程序目录）并列"""
+    artifact_dir = os.path.dirname(get_artifact_path(config))
+    return os.path.join(artifact_dir, f"{get_app_name(config)}.{config['archive_format']}")
+
+
+def format_archive_report(result):
+    """打包归档的文本报告"""
+    return (
+        f"🗜️ 已打包: {result['archive_path']}\n"
+        f"归档 {format_size(result['archive_size'])}，原始 {format_size(result['source_size'])}"
+        f"（压缩率 {result['ratio']:.1%}），{result['files']} 个文件（{result['stored']} 个已压缩文件原样存储），"
+        f"耗时 {result['seconds']:.2f} s（{result['threads']} 线程）"
+    )
+
+
+def measure_startup(executable, runs=5, args=(), marker="", timeout=60):
+    """
+    启动基准测试：多次启动可执行文件，测量到退出探针触发的耗时
+    
+    退出探针：设置了 marker 时，以输出中首次出现该文本为准（随后结束进程）；
+    否则以进程退出为准。
+    
+    Args:
+        executable: 可执行文件路径
+        runs: 启动次数
+        args: 传给程序的命令行参数
+        marker: 输出标记文本
+        timeout: 单次启动的超时秒数
+        
+    Returns:
+        每次启动的耗时列表（毫秒）
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [executable, *args],
+            cwd=os.path.dirname(executable),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE if marker else subprocess.DEVNULL,
+            stderr=subprocess.STDOUT if marker else subprocess.DEVNULL,
+        )
+        timer = threading.Timer(timeout, process.kill)
+        timer.start()
+        output = collections.deque(maxlen=10)
+        seen = False
+        try:
+            if marker:
+                for line in process.stdout:
+                    output.append(line.decode("utf-8", errors="replace"))
+                    if marker in output[-1]:
+                        seen = True
+                        break
+            else:
+                process.wait()
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            timed_out = not timer.is_alive()
+            timer.cancel()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            if process.stdout:
+                process.stdout.close()
+        if timed_out:
+            raise TimeoutError(f"程序在 {timeout} 秒内未触发退出探针")
+        if marker and not seen:
+            tail = "".join(output).rstrip()
+            raise RuntimeError(f"输出中未出现退出探针，退出码 {process.returncode}:\n{tail}")
+        durations.append(elapsed)
+    return durations
+
+
+def measure_memory(executable, runs=1, args=(), marker="", timeout=60, interval=0.02):
+    """
+    启动内存基准测试：启动程序并采样进程树的 RSS 和 PSS，直到退出探针触发
+    
+    程序带有内存归因钩子时，同时收集各模块导入造成的内存增长。
+    不支持 PSS 的平台使用 USS 代替。
+    
+    Returns:
+        {"peak_rss": 中位数, "peak_pss": 中位数或 None, "runs": [(rss, pss), ...], "modules": [...]}
+    """
+    if psutil is None:
+        raise RuntimeError("需要安装 psutil: pip install psutil")
+    peaks = []
+    modules = []
+    for _ in range(runs):
+        fd, trace_path = tempfile.mkstemp(prefix="pyinstaller-gui-memtrace-", suffix=".jsonl")
+        os.close(fd)
+        process = subprocess.Popen(
+            [executable, *args],
+            cwd=os.path.dirname(executable),
+            env=dict(os.environ, PYI_MEMTRACE_FILE=trace_path),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE if marker else subprocess.DEVNULL,
+            stderr=subprocess.STDOUT if marker else subprocess.DEVNULL,
+        )
+        probe_fired = threading.Event()
+        output = collections.deque(maxlen=10)
+        
+        def watch_output():
+            for line in process.stdout:
+                output.append(line.decode("utf-8", errors="replace"))
+                if marker in output[-1]:
+                    probe_fired.set()
+                    break
+        
+        watcher = threading.Thread(target=watch_output, daemon=True)
+        if marker:
+            watcher.start()
+        
+        peak_rss = peak_pss = 0
+        has_pss = False
+        start = time.perf_counter()
+        try:
+            root = psutil.Process(process.pid)
+            while not probe_fired.is_set() and process.poll() is None:
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"程序在 {timeout} 秒内未触发退出探针")
+                rss = pss = 0
+                try:
+                    for member in [root] + root.children(recursive=True):
+                        info = member.memory_full_info()
+                        rss += info.rss
+                        value = getattr(info, "pss", None) or getattr(info, "uss", None)
+                        if value is not None:
+                            pss += value
+                            has_pss = True
+                except psutil.Error:
+                    pass
+                peak_rss = max(peak_rss, rss)
+                peak_pss = max(peak_pss, pss)
+                time.sleep(interval)
+        finally:
+            if process.poll() is None:
+                try:
+                    ResourceSampler(process.pid).kill_tree()
+                except psutil.Error:
+                    pass
+                process.kill()
+            process.wait()
+            if process.stdout:
+                # 先等待读取线程结束，再关闭它正在读取的管道
+                watcher.join(timeout)
+                process.stdout.close()
+            modules = read_memory_trace(trace_path) or modules
+            os.remove(trace_path)
+        if marker and not probe_fired.is_set():
+            tail = "".join(output).rstrip()
+            raise RuntimeError(f"输出中未出现退出探针，退出码 {process.returncode}:\n{tail}")
+        peaks.append((peak_rss, peak_pss if has_pss else None))
+    
+    pss_values = [pss for _, pss in peaks if pss is not None]
+    return {
+        "peak_rss": statistics.median(rss for rss, _ in peaks),
+        "peak_pss": statistics.median(pss_values) if pss_values else None,
+        "runs": peaks,
+        "modules": modules,
+    }
+
+
+def read_memory_trace(path, limit=50):
+    """
+    读取内存归因钩子的输出，按模块自身的内存增长排序
+    
+    Returns:
+        [{"module", "self", "total"}, ...]，最多 limit 项
+    """
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # 进程被结束时最后一行可能不完整
+                continue
+    records.sort(key=lambda record: record["self"], reverse=True)
+    return records[:limit]
+
+
+def measure_import_times(executable, args=(), marker="", timeout=60):
+    """
+    启动一次带有导入计时钩子的程序，收集各模块的导入耗时和体积
+    
+    程序异常退出时仍返回已收集的记录，错误信息放在 "error" 中。
+    
+    Returns:
+        {"records": [{"module", "parent", "self_us", "total_us", "size", "source"}, ...], "error": 错误信息}
+    """
+    fd, trace_path = tempfile.mkstemp(prefix="pyinstaller-gui-importtime-", suffix=".jsonl")
+    os.close(fd)
+    error = ""
+    try:
+        try:
+            verify_launch(executable, args, marker, timeout, env={"PYI_IMPORTTIME_FILE": trace_path})
+        except (RuntimeError, TimeoutError) as e:
+            error = str(e)
+        records = read_import_trace(trace_path)
+    finally:
+        os.remove(trace_path)
+    if not records:
+        raise RuntimeError(error or "未收集到导入计时数据，请确认构建时已勾选“注入导入计时钩子”")
+    return {"records": records, "error": error}
+
+
+def read_import_trace(path):
+    """读取导入计时钩子的输出，按导入完成的顺序返回记录"""
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # 进程被结束时最后一行可能不完整
+                continue
+    return records
+
+
+def build_import_tree(records):
+    """
+    将导入计时记录整理为树，同级按累计耗时降序排列
+    
+    Returns:
+        顶层节点列表，每个节点为记录加上 "children"
+    """
+    nodes = {}
+    for record in records:
+        # 导入失败的模块可能被重复尝试，只保留第一次
+        nodes.setdefault(record["module"], dict(record, children=[]))
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent"])
+        if parent is None or parent is node:
+            roots.append(node)
+        else:
+            parent["children"].append(node)
+    for node in nodes.values():
+        node["children"].sort(key=lambda child: child["total_us"], reverse=True)
+    roots.sort(key=lambda node: node["total_us"], reverse=True)
+    return roots
+
+
+def summarize_import_times(records):
+    """
+    汇总导入计时记录
+    
+    Returns:
+        {"total_ms": 顶层导入的累计耗时, "modules": 模块数, "size": PYZ 与磁盘模块的总体积,
+         "by_source": {来源: (模块数, 自身耗时毫秒)}}
+    """
+    by_source = {}
+    for record in records:
+        count, ms = by_source.get(record["source"], (0, 0.0))
+        by_source[record["source"]] = (count + 1, ms + record["self_us"] / 1000)
+    return {
+        "total_ms": sum(node["total_us"] for node in build_import_tree(records)) / 1000,
+        "modules": len(records),
+        "size": sum(record["size"] for record in records),
+        "by_source": by_source,
+    }
+
+
+def format_import_report(records, limit=15):
+    """生成导入计时的文字报告：总耗时和自身耗时最多的模块"""
+    summary = summarize_import_times(records)
+    lines = [
+        f"冻结程序共导入 {summary['modules']} 个模块，累计 {summary['total_ms']:.1f} ms，"
+        f"模块体积 {format_size(summary['size'])}"
+    ]
+    lines.append("  " + "，".join(
+        f"{source} {count} 个 {ms:.1f} ms" for source, (count, ms) in sorted(summary["by_source"].items())
+    ))
+    lines.append("自身耗时最多的模块:")
+    for record in sorted(records, key=lambda record: record["self_us"], reverse=True)[:limit]:
+        lines.append(
+            f"  {record['module']:<40} {record['self_us'] / 1000:>8.1f} ms"
+            f"（含子模块 {record['total_us'] / 1000:.1f} ms，{format_size(record['size'])}）"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def resolve_runtime_tmpdir(config):
+    """
+    单文件程序运行时解压的父目录
+    
+    Returns:
+        --runtime-tmpdir 的绝对路径（相对路径以可执行文件所在目录为准），未设置时返回空字符串
+    """
+    path = config["runtime_tmpdir"].strip()
+    if not path:
+        return ""
+    return os.path.normpath(os.path.join(os.path.dirname(get_executable_path(config)), path))
+
+
+def measure_extraction(executable, runs=3, runtime_tmpdir="", timeout=60, limit=15):
+    """
+    单文件解压基准测试：测量引导程序每次启动解压到 _MEIxxxxxx 目录的耗时和写入量
+    
+    引导程序解压完成后才启动运行 Python 代码的子进程，以子进程出现的时刻为解压完成；
+    此时统计解压目录中的文件，随后结束整个进程树并清理解压目录。需要 psutil。
+    
+    Args:
+        executable: 单文件可执行文件路径
+        runs: 启动次数
+        runtime_tmpdir: resolve_runtime_tmpdir() 返回的解压父目录，为空时使用新建的临时目录
+        timeout: 单次启动的超时秒数
+        limit: 返回写入最多的文件数和目录数
+        
+    Returns:
+        {"extract_ms": 中位数, "runs": [毫秒, ...], "bytes": 每次启动写入的字节数, "files": 文件数,
+         "top_files": [(相对路径, 字节数), ...], "top_dirs": [(顶层目录, 字节数), ...]}
+    """
+    if psutil is None:
+        raise RuntimeError("需要安装 psutil: pip install psutil")
+    durations = []
+    files = {}
+    for _ in range(runs):
+        temp_dir = tempfile.mkdtemp(prefix="pyinstaller-gui-extract-")
+        parent_dir = runtime_tmpdir or temp_dir
+        os.makedirs(parent_dir, exist_ok=True)
+        existing = set(os.listdir(parent_dir))
+        extract_dirs = []
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [executable],
+            cwd=os.path.dirname(executable),
+            env=dict(os.environ, TMPDIR=temp_dir, TMP=temp_dir, TEMP=temp_dir),
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            root = psutil.Process(process.pid)
+            while True:
+                try:
+                    spawned = root.children()
+                except psutil.Error:
+                    spawned = []
+                if spawned:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    break
+                if process.poll() is not None:
+                    raise RuntimeError(f"程序在解压完成前退出，退出码 {process.returncode}")
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"程序在 {timeout} 秒内未完成解压")
+                time.sleep(0.002)
+            
+            extract_dirs = [
+                os.path.join(parent_dir, name) for name in os.listdir(parent_dir)
+                if name not in existing and name.startswith("_MEI")
+            ]
+            if not extract_dirs:
+                raise RuntimeError(f"{parent_dir} 中没有解压目录（_MEIxxxxxx），请确认产物为单文件模式")
+            files = {}
+            for extract_dir in extract_dirs:
+                for dirpath, _, filenames in os.walk(extract_dir):
+                    for filename in filenames:
+                        path = os.path.join(dirpath, filename)
+                        if not os.path.islink(path):
+                            files[os.path.relpath(path, extract_dir)] = os.path.getsize(path)
+        finally:
+            if process.poll() is None:
+                try:
+                    ResourceSampler(process.pid).kill_tree()
+                except psutil.Error:
+                    pass
+                process.kill()
+            process.wait()
+            # 进程被结束时引导程序来不及清理解压目录
+            for extract_dir in extract_dirs:
+                shutil.rmtree(extract_dir, ignore_errors=True)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        durations.append(elapsed)
+    
+    dirs = collections.Counter()
+    for name, size in files.items():
+        parts = name.replace("\\", "/").split("/")
+        dirs[parts[0] if len(parts) > 1 else "(根目录)"] += size
+    return {
+        "extract_ms": statistics.median(durations),
+        "runs": durations,
+        "bytes": sum(files.values()),
+        "files": len(files),
+        "top_files": sorted(files.items(), key=lambda item: item[1], reverse=True)[:limit],
+        "top_dirs": dirs.most_common(limit),
+    }
+
+
+def format_extraction_report(result, startup_ms=None, limit=10):
+    """
+    生成单文件解压基准测试的文字报告
+    
+    Args:
+        result: measure_extraction() 的返回值
+        startup_ms: 同一构建的启动时间中位数，用于计算解压占启动时间的比例
+    """
+    lines = [
+        f"单文件解压耗时中位数 {result['extract_ms']:.0f} ms（{len(result['runs'])} 次），"
+        f"每次启动写入 {format_size(result['bytes'])}，{result['files']} 个文件"
+    ]
+    if startup_ms:
+        share = result["extract_ms"] / startup_ms
+        lines.append(f"约占启动时间（{startup_ms:.0f} ms）的 {share:.0%}")
+        if share >= 0.5:
+            lines.append("解压占启动时间的大部分：可考虑改用目录模式，或将写入最多的数据移到外部数据包")
+    lines.append("写入最多的目录:")
+    lines += [f"  {name:<40} {format_size(size):>10}" for name, size in result["top_dirs"][:limit]]
+    lines.append("写入最多的文件:")
+    lines += [f"  {name:<60} {format_size(size):>10}" for name, size in result["top_files"][:limit]]
+    return "\n".join(lines) + "\n"
+
+
+class ResourceSampler:
+    """采样进程树（构建进程及其所有子进程）的 CPU、常驻内存和 I/O 字节数，需要 psutil"""
+    
+    def __init__(self, pid):
+        self.root = psutil.Process(pid)
+        self.roots = [self.root]
+        self.processes = {pid: self.root}
+        # 每个进程最后一次读到的累计 I/O，进程退出后仍计入总量
+        self.io_totals = {}
+        self.peak_cpu = 0.0
+        self.peak_rss = 0
+        self.samples = 0
+    
+    def sample(self):
+        """
+        采样一次
+        
+        Returns:
+            {"cpu": 百分比, "rss": 字节, "read": 累计读字节, "write": 累计写字节}
+        """
+        tree = []
+        for root in self.roots:
+            tree.append(root)
+            try:
+                tree += root.children(recursive=True)
+            except psutil.Error:
+                pass
+        
+        # 复用已有的 Process 对象，cpu_percent 需要与上一次调用比较
+        current = {}
+        for process in tree:
+            current[process.pid] = self.processes.get(process.pid, process)
+        self.processes = current
+        
+        cpu = 0.0
+        rss = 0
+        for pid, process in current.items():
+            try:
+                with process.oneshot():
+                    cpu += process.cpu_percent(None)
+                    rss += process.memory_info().rss
+                    if hasattr(process, "io_counters"):
+                        io = process.io_counters()
+                        self.io_totals[pid] = (io.read_bytes, io.write_bytes)
+            except psutil.Error:
+                continue
+        
+        self.samples += 1
+        self.peak_cpu = max(self.peak_cpu, cpu)
+        self.peak_rss = max(self.peak_rss, rss)
+        return {
+            "cpu": cpu,
+            "rss": rss,
+            "read": sum(read for read, write in self.io_totals.values()),
+            "write": sum(write for read, write in self.io_totals.values()),
+        }
+    
+    def follow(self, pid):
+        """同时采样另一个进程树（常驻构建进程中执行构建的子进程不是客户端进程的子进程）"""
+        process = psutil.Process(pid)
+        self.roots.append(process)
+        self.processes[pid] = process
+    
+    def peaks(self):
+        """峰值和 I/O 总量，保存到构建记录"""
+        return {
+            "peak_cpu": self.peak_cpu,
+            "peak_rss": self.peak_rss,
+            "io_read": sum(read for read, write in self.io_totals.values()),
+            "io_write": sum(write for read, write in self.io_totals.values()),
+        }
+    
+    def kill_tree(self):
+        """结束整个进程树"""
+        for process in list(self.processes.values())[::-1]:
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+
+
+def collect_artifact_manifest(path):
+    """
+    收集构建产物的文件清单
+    
+    可执行文件中的 PyInstaller 归档会被展开：归档条目记为 "文件!条目"，
+    PYZ 中的模块记为 "文件!PYZ名!模块"，剩余部分（引导程序）记在文件本身名下。
+    
+    Returns:
+        {相对路径: 字节数}
+    """
+    if os.path.isfile(path):
+        files = [(path, os.path.basename(path))]
+    else:
+        files = []
+        for root, dirs, names in os.walk(path):
+            for file_name in names:
+                file_path = os.path.join(root, file_name)
+                if not os.path.islink(file_path):
+                    files.append((file_path, os.path.relpath(file_path, path).replace(os.sep, "/")))
+    
+    manifest = {}
+    for file_path, relative in files:
+        size = os.path.getsize(file_path)
+        is_executable = relative.endswith(".exe") or (os.name != "nt" and os.access(file_path, os.X_OK))
+        entries = _read_pyinstaller_archive(file_path) if "/" not in relative and is_executable else {}
+        for name, entry_size in entries.items():
+            manifest[f"{relative}!{name}"] = entry_size
+        manifest[relative] = size - sum(entries.values())
+    return manifest
+
+
+def _read_pyinstaller_archive(file_path):
+    """读取可执行文件内嵌的 CArchive（及其中的 PYZ）条目大小，不是归档时返回空字典"""
+    try:
+        from PyInstaller.archive.readers import CArchiveReader
+        archive = CArchiveReader(file_path)
+    except Exception:
+        return {}
+    
+    entries = {}
+    for name, (offset, length, uncompressed, compressed, typecode) in archive.toc.items():
+        if typecode == "z":
+            try:
+                pyz = archive.open_embedded_archive(name)
+                modules = {f"{name}!{module}": entry[2] for module, entry in pyz.toc.items()}
+                entries.update(modules)
+                entries[name] = length - sum(modules.values())
+                continue
+            except Exception:
+                pass
+        entries[name] = length
+    return entries
+
+
+def manifest_package(path):
+    """将清单路径归类到所属的包（顶层模块）或文件"""
+    parts = path.split("!")
+    if len(parts) == 3:
+        # PYZ 中的模块
+        return parts[2].split(".")[0]
+    if len(parts) == 1 and "/" not in path:
+        # 可执行文件本身（引导程序）或顶层文件
+        return path
+    
+    components = parts[-1].split("/")
+    if components[0] == "_internal" and len(components) > 1:
+        components = components[1:]
+    if len(components) == 1 or "lib-dynload" in components:
+        return components[-1].split(".")[0]
+    return re.sub(r"\.(libs|dylibs)$", "", components[0])
+
+
+def diff_manifests(old, new):
+    """
+    比较两次构建的清单
+    
+    Returns:
+        (按包汇总的增量 {包: 字节数}, 按文件的增量 {路径: 字节数})，只包含变化的项
+    """
+    file_deltas = {}
+    for path in set(old) | set(new):
+        delta = new.get(path, 0) - old.get(path, 0)
+        if delta:
+            file_deltas[path] = delta
+    
+    package_deltas = {}
+    for path, delta in file_deltas.items():
+        package = manifest_package(path)
+        package_deltas[package] = package_deltas.get(package, 0) + delta
+    return {k: v for k, v in package_deltas.items() if v}, file_deltas
+
+
+def check_budgets(build, config, baseline=None):
+    """
+    检查构建结果是否超出性能预算
+    
+    Args:
+        build: 构建记录
+        config: 含预算设置的配置快照
+        baseline: 用于比较的基线构建记录（可选）
+        
+    Returns:
+        违规说明列表，为空表示通过
+    """
+    limits = [
+        ("产物体积", "artifact_size", config["budget_size_mb"] * 1024 * 1024, format_size),
+        ("文件数", "file_count", config["budget_files"], str),
+        ("构建耗时", "duration", config["budget_duration"], lambda v: f"{v:.1f} s"),
+        ("启动中位数", "startup_ms", config["budget_startup_ms"], lambda v: f"{v:.0f} ms"),
+    ]
+    tolerance = config["budget_tolerance"]
+    
+    violations = []
+    for label, key, limit, formatter in limits:
+        value = build.get(key)
+        if value is None:
+            continue
+        if limit and value > limit:
+            violations.append(f"{label} {formatter(value)} 超出预算 {formatter(limit)}")
+        
+        base_value = baseline.get(key) if baseline and config["budget_baseline"] else None
+        if base_value and value > base_value * (1 + tolerance / 100):
+            growth = (value / base_value - 1) * 100
+            violations.append(
+                f"{label} {formatter(value)} 较基线 {formatter(base_value)} 增长 {growth:.1f}%（容差 {tolerance:g}%）"
+            )
+    return violations
+
+
+_parsed_file_cache = {}
+
+
+def load_parsed_file(path, parser):
+    """
+    解析文件并缓存结果，文件未变化（修改时间和大小相同）时直接复用
+    
+    Args:
+        path: 文件路径
+        parser: 解析函数，接收文件路径
+    """
+    stat = os.stat(path)
+    key = (parser.__name__, os.path.abspath(path))
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _parsed_file_cache.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+    result = parser(path)
+    _parsed_file_cache[key] = (signature, result)
+    return result
+
+
+def _platform_matches(platform):
+    if platform == "posix":
+        return os.name == "posix"
+    return sys.platform == platform
+
+
+def classify_missing_module(module, importers):
+    """
+    判断缺失模块的类别
+    
+    Args:
+        module: 缺失的模块名
+        importers: [(导入方模块, [导入方式...]), ...]
+        
+    Returns:
+        MISSING_CATEGORIES 中的键
+    """
+    root = module.split(".")[0]
+    for platform, names in PLATFORM_MODULES.items():
+        if root in names:
+            if not _platform_matches(platform):
+                return "platform"
+            break
+    # 解释器内置/冻结模块不需要打包
+    if root in sys.builtin_module_names or importlib.machinery.FrozenImporter.find_spec(root):
+        return "optional"
+    # 只要有一处不在 try/if 中导入，运行时就可能抛出 ImportError
+    for _, kinds in importers:
+        if not {"optional", "conditional"} & set(kinds):
+            return "real"
+    return "optional"
+
+
+def parse_warn_importers(text):
+    """
+    解析 warn 文件中的导入者列表 "a (top-level), C:\\My App\\app.py (conditional, optional)"
+    
+    顶层脚本以绝对路径出现，路径中可能含有空格，因此按 "), " 而不是空白切分。
+    
+    Returns:
+        [(导入者, [导入方式, ...]), ...]
+    """
+    importers = []
+    for item in text.strip().split("), "):
+        name, separator, kinds = item.rpartition(" (")
+        if separator and name.strip():
+            importers.append((name.strip(), [k.strip() for k in kinds.rstrip(")").split(",")]))
+    return importers
+
+
+def parse_warn_file(path):
+    """
+    解析 PyInstaller 的 warn-<名称>.txt
+    
+    Returns:
+        条目列表，每项包含 module、category、importers
+    """
+    entries = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = WARN_LINE_PATTERN.match(line.strip())
+            if not match:
+                continue
+            kind, module, importer_text = match.groups()
+            module = module.strip("'")
+            importers = parse_warn_importers(importer_text)
+            category = "excluded" if kind == "excluded" else classify_missing_module(module, importers)
+            entries.append({"module": module, "category": category, "importers": importers})
+    return entries
+
+
+def parse_xref_file(path):
+    """
+    解析 PyInstaller 的 xref-<名称>.html 模块依赖图
+    
+    Returns:
+        {模块名: {"type": 类型, "path": 源文件, "imports": [...], "imported_by": [...]}}
+    """
+    nodes = {}
+    node = None
+    section = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            match = re.match(r'<a name="([^"]*)"></a>', line)
+            if match:
+                node = {"type": "", "path": "", "imports": [], "imported_by": []}
+                nodes[html.unescape(match.group(1)).strip("'")] = node
+                section = None
+                continue
+            if node is None:
+                continue
+            match = re.search(r'<a target="code" href="([^"]*)"', line)
+            if match:
+                node["path"] = html.unescape(match.group(1))
+            match = re.search(r'<span class="moduletype">(?:<i>)?\(?([^<)]*)\)?(?:</i>)?</span>', line)
+            if match:
+                node["type"] = match.group(1)
+            if line == "imports:":
+                section = "imports"
+            elif line == "imported by:":
+                section = "imported_by"
+            elif section:
+                for target in re.findall(r'<a href="#([^"]*)">', line):
+                    node[section].append(html.unescape(target).strip("'"))
+    return nodes
+
+
+def harvest_build_warnings(config):
+    """
+    读取工作目录中的构建警告和交叉引用，按类别和导入方建立索引
+    
+    Returns:
+        {"entries": [...], "by_importer": {导入方: [(缺失模块, 导入方式)]},
+         "counts": {类别: 数量}, "paths": {模块: 源文件}}，没有警告文件时返回 None
+    """
+    name = get_app_name(config)
+    work_dir = get_work_dir(config)
+    warn_path = os.path.join(work_dir, f"warn-{name}.txt")
+    if not os.path.isfile(warn_path):
+        return None
+    entries = load_parsed_file(warn_path, parse_warn_file)
+    
+    xref_path = os.path.join(work_dir, f"xref-{name}.html")
+    nodes = load_parsed_file(xref_path, parse_xref_file) if os.path.isfile(xref_path) else {}
+    
+    by_importer = {}
+    counts = dict.fromkeys(MISSING_CATEGORIES, 0)
+    for entry in entries:
+        counts[entry["category"]] += 1
+        for importer, kinds in entry["importers"]:
+            by_importer.setdefault(importer, []).append((entry["module"], kinds))
+    paths = {module: nodes[module]["path"] for module in by_importer if module in nodes}
+    return {"entries": entries, "by_importer": by_importer, "counts": counts, "paths": paths}
+
+
+def parse_analysis_toc(path):
+    """
+    解析 PyInstaller 的 Analysis-00.toc
+    
+    Returns:
+        {字段名: 值}，字段见 ANALYSIS_TOC_FIELDS
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        values = ast.literal_eval(f.read())
+    return dict(zip(ANALYSIS_TOC_FIELDS, values))
+
+
+class ModuleGraph:
+    """
+    带体积信息的模块依赖图（来自 xref 依赖图和 Analysis TOC）
+    
+    节点按整数编号存储，便于对同一张图反复做可达性计算
+    """
+    
+    def __init__(self, nodes, analysis):
+        self.names = list(nodes)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.types = [nodes[name]["type"] for name in self.names]
+        self.imports = [[self.ids[t] for t in nodes[name]["imports"] if t in self.ids] for name in self.names]
+        self.sizes = [0] * len(self.names)
+        # 二进制和数据文件：单文件模式下每次启动都需要解压
+        self.extract_sizes = [0] * len(self.names)
+        self.extract_files = [0] * len(self.names)
+        # 无法归属到模块的文件（Python 运行库、基础库压缩包等），每次构建都会包含
+        self.unattributed_size = 0
+        
+        by_path = {
+            os.path.normcase(node["path"]): self.ids[name]
+            for name, node in nodes.items() if node["path"]
+        }
+        for field in ANALYSIS_COLLECTED_FIELDS:
+            for dest, source, typecode in analysis.get(field, []):
+                if dest == "base_library.zip":
+                    continue
+                try:
+                    size = os.path.getsize(source)
+                except (OSError, TypeError):
+                    continue
+                owner = by_path.get(os.path.normcase(source)) if source else None
+                if owner is None and typecode in ("BINARY", "DATA"):
+                    owner = self.package_of(dest)
+                if owner is None:
+                    self.unattributed_size += size
+                    continue
+                self.sizes[owner] += size
+                if typecode in ("BINARY", "EXTENSION", "DATA"):
+                    self.extract_sizes[owner] += size
+                    self.extract_files[owner] += 1
+        
+        # 入口脚本、运行时钩子以及没有导入方的已收集模块（如隐藏导入）都是根节点
+        imported = set()
+        for targets in self.imports:
+            imported.update(targets)
+        self.roots = [i for i, kind in enumerate(self.types) if kind == "Script"]
+        self.roots += [i for i in range(len(self.names)) if self.sizes[i] and i not in imported and i not in self.roots]
+        self.hidden_imports = [name for name in analysis.get("hiddenimports", []) if name in self.ids]
+    
+    def package_of(self, dest):
+        """按目标路径找到所属的最长包名，如 torch/lib/x.so -> torch"""
+        parts = Path(dest).parts[:-1]
+        for length in range(len(parts), 0, -1):
+            owner = self.ids.get(".".join(parts[:length]))
+            if owner is not None:
+                return owner
+        return None
+    
+    def module_and_submodules(self, name):
+        """模块及其全部子模块的编号（排除模块时一并排除）"""
+        prefix = name + "."
+        return {i for i, n in enumerate(self.names) if n == name or n.startswith(prefix)}
+    
+    def reach(self, roots=None, blocked=(), cut_edges=()):
+        """
+        从根节点出发的可达节点
+        
+        Args:
+            roots: 起始节点编号，默认为全部根节点
+            blocked: 视为已排除的节点编号
+            cut_edges: 视为已切断的边 {(导入方, 模块), ...}
+            
+        Returns:
+            bytearray，可达节点对应位置为 1
+        """
+        seen = bytearray(len(self.names))
+        for node in blocked:
+            seen[node] = 2
+        stack = [r for r in (self.roots if roots is None else roots) if not seen[r]]
+        for node in stack:
+            seen[node] = 1
+        while stack:
+            node = stack.pop()
+            for target in self.imports[node]:
+                if not seen[target] and (node, target) not in cut_edges:
+                    seen[target] = 1
+                    stack.append(target)
+        return bytearray(1 if v == 1 else 0 for v in seen)
+    
+    def reach_size(self, reached):
+        return sum(size for size, hit in zip(self.sizes, reached) if hit)
+    
+    def total_size(self, blocked=()):
+        """收集的总字节数（含无法归属的文件）"""
+        return self.reach_size(self.reach(blocked=blocked)) + self.unattributed_size
+    
+    def shortest_path(self, target, blocked=()):
+        """
+        入口脚本到目标模块的最短导入链（广度优先，入口脚本优先）
+        
+        Returns:
+            节点编号列表，不可达时返回空列表
+        """
+        parents = {r: None for r in self.roots if r not in blocked}
+        queue = list(parents)
+        for node in queue:
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            for child in self.imports[node]:
+                if child not in parents and child not in blocked:
+                    parents[child] = node
+                    queue.append(child)
+        return []
+    
+    def path_costs(self, target, blocked=()):
+        """
+        计算导入链上每条边和每个模块的体积贡献
+        
+        Returns:
+            [{"importer", "module", "edge_bytes", "exclude_bytes"}, ...]
+        """
+        blocked = set(blocked)
+        base = self.reach_size(self.reach(blocked=blocked))
+        path = self.shortest_path(target, blocked)
+        costs = []
+        for importer, module in zip(path, path[1:]):
+            without_edge = self.reach_size(self.reach(blocked=blocked, cut_edges={(importer, module)}))
+            excluded = blocked | self.module_and_submodules(self.names[module])
+            without_module = self.reach_size(self.reach(blocked=excluded))
+            costs.append({
+                "importer": self.names[importer],
+                "module": self.names[module],
+                "edge_bytes": base - without_edge,
+                "exclude_bytes": base - without_module,
+            })
+        return costs
+    
+    def marginal_cost(self, targets, keep=()):
+        """
+        计算入口脚本对 targets 的导入（隐藏导入、收集的子模块）单独带来的模块
+        
+        Args:
+            targets: 模块名列表
+            keep: 脚本源码中直接导入的模块，这些导入不是隐藏导入，不切断
+            
+        Returns:
+            {"modules", "bytes", "extract_files", "extract_bytes"}
+        """
+        scripts = [i for i, kind in enumerate(self.types) if kind == "Script"]
+        target_ids = {self.ids[t] for t in targets if t in self.ids and t not in keep}
+        cut_edges = {(s, t) for s in scripts for t in self.imports[s] if t in target_ids}
+        full = self.reach()
+        partial = self.reach(cut_edges=cut_edges)
+        lost = [i for i, hit in enumerate(full) if hit and not partial[i]]
+        return {
+            "modules": len(lost),
+            "bytes": sum(self.sizes[i] for i in lost),
+            "extract_files": sum(self.extract_files[i] for i in lost),
+            "extract_bytes": sum(self.extract_sizes[i] for i in lost),
+        }
+    
+    def collected_packages(self):
+        """已收集的顶层包名"""
+        return {self.names[i].split(".")[0] for i, hit in enumerate(self.reach()) if hit}
+    
+    def package_sizes(self, blocked=()):
+        """按顶层包汇总已收集的体积，从大到小排序"""
+        totals = {}
+        for i, hit in enumerate(self.reach(blocked=blocked)):
+            if hit and self.sizes[i] and self.types[i] != "Script":
+                package = self.names[i].split(".")[0]
+                totals[package] = totals.get(package, 0) + self.sizes[i]
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def _normalize_dist_name(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class PackageIndex:
+    """
+    已安装发行包的索引：顶层模块所属的发行包、发行包的体积和依赖
+    
+    用于估算尚未构建过的隐藏导入的代价
+    """
+    
+    def __init__(self):
+        self.providers = {
+            module: [_normalize_dist_name(name) for name in names]
+            for module, names in importlib.metadata.packages_distributions().items()
+        }
+        self.distributions = {}
+        for dist in importlib.metadata.distributions():
+            name = _normalize_dist_name(dist.metadata["Name"] or "")
+            if name and name not in self.distributions:
+                self.distributions[name] = dist
+        self.top_levels = {}
+        for module, names in self.providers.items():
+            for name in names:
+                self.top_levels.setdefault(name, set()).add(module)
+        self._sizes = {}
+    
+    def distribution_size(self, name):
+        """发行包中会被打包的文件总字节数（不含元数据、缓存和脚本）"""
+        if name not in self._sizes:
+            total = 0
+            dist = self.distributions.get(name)
+            for file in (dist.files or []) if dist else []:
+                parts = file.parts
+                if parts[0] == ".." or parts[0].endswith(".dist-info") or "__pycache__" in parts:
+                    continue
+                size = file.size
+                if size is None:
+                    try:
+                        size = os.path.getsize(file.locate())
+                    except OSError:
+                        size = 0
+                total += size
+            self._sizes[name] = total
+        return self._sizes[name]
+    
+    def requirements(self, name):
+        """发行包的必需依赖（忽略 extras）"""
+        dist = self.distributions.get(name)
+        names = []
+        for requirement in (dist.requires or []) if dist else []:
+            if "extra" in requirement.partition(";")[2]:
+                continue
+            match = re.match(r"[A-Za-z0-9._-]+", requirement)
+            if match:
+                names.append(_normalize_dist_name(match.group(0)))
+        return names
+    
+    def estimate(self, module, collected=()):
+        """
+        估算导入模块带来的体积
+        
+        Args:
+            module: 模块名
+            collected: 已经收集的顶层包名，这些包不重复计算
+            
+        Returns:
+            {"bytes", "distributions", "status"}，status 为 "collected"、"missing" 或 "ok"
+        """
+        root = module.split(".")[0]
+        if root in collected:
+            return {"bytes": 0, "distributions": [], "status": "collected"}
+        pending = list(self.providers.get(root, []))
+        if not pending:
+            size = _stdlib_module_size(root)
+            return {"bytes": size, "distributions": [], "status": "ok" if size else "missing"}
+        seen = []
+        while pending:
+            name = pending.pop()
+            if name in seen or name not in self.distributions:
+                continue
+            if self.top_levels.get(name) and self.top_levels[name] <= set(collected):
+                continue
+            seen.append(name)
+            pending.extend(self.requirements(name))
+        return {"bytes": sum(self.distribution_size(name) for name in seen), "distributions": seen, "status": "ok"}
+
+
+def _stdlib_module_size(name):
+    """不属于任何发行包的模块（标准库等）按源文件体积估算"""
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return 0
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return 0
+    if not spec.submodule_search_locations:
+        return os.path.getsize(spec.origin)
+    total = 0
+    for location in spec.submodule_search_locations:
+        for root, dirs, files in os.walk(location):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+
+_package_index = None
+
+
+def get_package_index():
+    """延迟构建并缓存发行包索引"""
+    global _package_index
+    if _package_index is None:
+        _package_index = PackageIndex()
+    return _package_index
+
+
+def script_imports(path):
+    """脚本源码中直接导入的模块名"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+            modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return modules
+
+
+def split_collect_modules(text):
+    """收集子模块输入框中的多个包名（逗号或空格分隔）"""
+    return [module for module in re.split(r"[,\s]+", text) if module]
+
+
+def compute_import_costs(config):
+    """
+    计算每个隐藏导入和收集子模块条目的边际代价
+    
+    最近一次构建的依赖图中已有的条目按依赖图精确计算，
+    其余条目根据发行包索引估算，不需要为每个条目重新构建
+    
+    Returns:
+        {"hidden": {模块: 代价}, "collect": {包: 代价}}，代价中 "estimated" 表示是否为估算
+    """
+    graph = load_module_graph(config) if config["script"] else None
+    analysed = set(graph.hidden_imports) if graph else set()
+    keep = script_imports(config["script"]) if graph else set()
+    collected = graph.collected_packages() if graph else set()
+    
+    def cost_of(targets, module):
+        if targets:
+            return dict(graph.marginal_cost(targets, keep), estimated=False)
+        estimate = get_package_index().estimate(module, collected)
+        return dict(estimate, modules=None, extract_files=None, extract_bytes=None, estimated=True)
+    
+    costs = {"hidden": {}, "collect": {}}
+    for module in config["hidden_imports"]:
+        costs["hidden"][module] = cost_of([module] if module in analysed else [], module)
+    for package in split_collect_modules(config["collect"]):
+        prefix = package + "."
+        targets = [m for m in analysed if m == package or m.startswith(prefix)]
+        costs["collect"][package] = cost_of(targets, package)
+    return costs
+
+
+def format_import_cost(cost):
+    """将导入代价格式化为列表中显示的简短文本"""
+    if cost["estimated"]:
+        if cost["status"] == "collected":
+            return "≈ +0 B（该包已被收集）"
+        if cost["status"] == "missing":
+            return "未找到该模块"
+        return f"≈ +{format_size(cost['bytes'])}（估算）"
+    if not cost["modules"]:
+        return "+0 B（已被其他代码导入）"
+    text = f"+{format_size(cost['bytes'])} · {cost['modules']} 个模块"
+    if cost["extract_files"]:
+        text += f" · 启动解压 {format_size(cost['extract_bytes'])}"
+    return text
+
+
+def load_module_graph(config):
+    """
+    读取工作目录中的 xref 和 Analysis TOC 构建模块依赖图
+    
+    Returns:
+        ModuleGraph，缺少分析结果时返回 None
+    """
+    name = get_app_name(config)
+    work_dir = get_work_dir(config)
+    xref_path = os.path.join(work_dir, f"xref-{name}.html")
+    toc_path = os.path.join(work_dir, "Analysis-00.toc")
+    if not (os.path.isfile(xref_path) and os.path.isfile(toc_path)):
+        return None
+    return ModuleGraph(load_parsed_file(xref_path, parse_xref_file), load_parsed_file(toc_path, parse_analysis_toc))
+
+
+def resource_files_size(config):
+    """资源文件（data_files/binary_files）源文件的总字节数"""
+    root = get_project_root(config) if config["script"] else ""
+    total = 0
+    for entry in config["data_files"] + config["binary_files"]:
+        for source, _ in iter_resource_entry_files(entry, root):
+            try:
+                total += os.path.getsize(source)
+            except OSError:
+                pass
+    return total
+
+
+def estimate_build_duration(builds, size):
+    """
+    按历史构建的产物体积和耗时线性拟合，估算构建耗时
+    
+    Args:
+        builds: 构建历史记录
+        size: 预计的产物字节数
+        
+    Returns:
+        耗时（秒），没有可用的历史时返回 None
+    """
+    points = [
+        (build["artifact_size"], build["duration"]) for build in builds
+        if build["exit_code"] == 0 and build["artifact_size"] and build["duration"]
+    ]
+    if not points:
+        return None
+    if len(points) >= 3:
+        mean_x = statistics.fmean(x for x, _ in points)
+        mean_y = statistics.fmean(y for _, y in points)
+        variance = sum((x - mean_x) ** 2 for x, _ in points)
+        # 产物体积差异足够大时才拟合斜率
+        if max(x for x, _ in points) - min(x for x, _ in points) > mean_x * 0.1:
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+            if slope > 0:
+                return max(0.0, mean_y + slope * (size - mean_x))
+    return statistics.median(y / x for x, y in points) * size
+
+
+def estimate_build(config, baseline=None, builds=()):
+    """
+    构建前估算产物体积和构建耗时
+    
+    有同一项目的成功构建时以最近一次构建为基准，按配置差异修正：资源文件按当前源文件重新统计，
+    新增的隐藏导入和收集子模块按发行包索引估算，移除的条目和新排除的模块按依赖图扣除；
+    没有构建历史时按脚本导入的发行包体积加上 Python 运行时估算。
+    
+    Args:
+        config: 构建配置
+        baseline: 同一项目最近一次成功的构建记录
+        builds: 用于拟合构建耗时的历史记录
+        
+    Returns:
+        {"size", "duration", "base", "base_size", "items": [(说明, 字节数变化)]}
+    """
+    index = get_package_index()
+    resources = resource_files_size(config)
+    items = []
+    
+    def add_estimates(modules, collected, label):
+        for module in modules:
+            estimate = index.estimate(module, collected)
+            # 标准库和项目自身的模块已包含在基准中
+            if estimate["status"] != "ok" or not estimate["distributions"]:
+                continue
+            collected.add(module.split(".")[0])
+            for name in estimate["distributions"]:
+                collected.update(index.top_levels.get(name, ()))
+            items.append((f"{label} {module}", estimate["bytes"]))
+    
+    if baseline:
+        previous = {**DEFAULT_CONFIG, **baseline["config"]}
+        base, base_size = "上次构建", baseline["artifact_size"] or 0
+        items.append(("资源文件", resources - resource_files_size(previous)))
+        
+        graph = load_module_graph(config)
+        collected = graph.collected_packages() if graph else set()
+        old_collect = split_collect_modules(previous["collect"])
+        new_collect = split_collect_modules(config["collect"])
+        added = [m for m in config["hidden_imports"] if m not in previous["hidden_imports"]]
+        added += [m for m in new_collect if m not in old_collect]
+        add_estimates(added, collected, "新增")
+        
+        if graph:
+            keep = script_imports(config["script"])
+            removed = [[m] for m in previous["hidden_imports"] if m not in config["hidden_imports"]]
+            removed += [
+                [n for n in graph.names if n == package or n.startswith(package + ".")]
+                for package in old_collect if package not in new_collect
+            ]
+            for targets in removed:
+                saved = graph.marginal_cost(targets, keep)["bytes"] if targets else 0
+                if saved:
+                    items.append((f"移除 {targets[0]}", -saved))
+            excluded = [m for m in config["exclude_modules"] if m not in previous["exclude_modules"]]
+            if excluded:
+                blocked = set().union(*(graph.module_and_submodules(m) for m in excluded))
+                saved = graph.total_size() - graph.total_size(blocked)
+                if saved:
+                    items.append(("排除 " + ", ".join(excluded), -saved))
+        
+        if config["onefile"] != previous["onefile"]:
+            subtotal = base_size + sum(delta for _, delta in items)
+            ratio = ESTIMATE_ONEFILE_RATIO if config["onefile"] else 1 / ESTIMATE_ONEFILE_RATIO
+            items.append(("改为单文件（压缩）" if config["onefile"] else "改为目录模式（不压缩）", int(subtotal * (ratio - 1))))
+    else:
+        base, base_size = "Python 运行时", ESTIMATE_RUNTIME_SIZE
+        modules = sorted({m.split(".")[0] for m in script_imports(config["script"])}) if config["script"] else []
+        collected = set()
+        add_estimates(modules, collected, "导入")
+        add_estimates(config["hidden_imports"] + split_collect_modules(config["collect"]), collected, "新增")
+        items.append(("资源文件", resources))
+        if config["onefile"]:
+            subtotal = base_size + sum(delta for _, delta in items)
+            items.append(("单文件压缩", int(subtotal * (ESTIMATE_ONEFILE_RATIO - 1))))
+    
+    items = [(label, delta) for label, delta in items if delta]
+    size = max(0, base_size + sum(delta for _, delta in items))
+    return {
+        "size": size,
+        "duration": estimate_build_duration(builds, size),
+        "base": base,
+        "base_size": base_size,
+        "items": items,
+    }
+
+
+def format_build_estimate(estimate):
+    """构建预估的简短文本和明细（明细按变化量从大到小排列）"""
+    text = f"📐 预计产物 ≈ {format_size(estimate['size'])}"
+    delta = estimate["size"] - estimate["base_size"]
+    if estimate["base"] == "上次构建":
+        text += f"（上次 {format_size(estimate['base_size'])}，{'+' if delta >= 0 else '-'}{format_size(abs(delta))}）"
+    duration = estimate["duration"]
+    if duration is None:
+        text += "，构建耗时未知（没有构建历史）"
+    elif duration >= 60:
+        text += f"，构建 ≈ {duration // 60:.0f} 分 {duration % 60:.0f} 秒"
+    else:
+        text += f"，构建 ≈ {duration:.0f} 秒"
+    lines = [f"{estimate['base']}: {format_size(estimate['base_size'])}"]
+    lines += [
+        f"{label}: {'+' if change >= 0 else '-'}{format_size(abs(change))}"
+        for label, change in sorted(estimate["items"], key=lambda item: abs(item[1]), reverse=True)
+    ]
+    return text, "\n".join(lines)
+
+
+def scan_optimize_hazards(path):
+    """
+    扫描源文件中依赖文档字符串或 assert 的代码
+    
+    文档字符串只统计在 __doc__ 为 None 时会出错的用法（取属性、运算、下标、迭代）
+    
+    Returns:
+        {"docstrings": 依赖 __doc__ 的次数, "assert_handlers": 捕获 AssertionError 的次数, "asserts": assert 语句数}
+    """
+    counts = {"docstrings": 0, "assert_handlers": 0, "asserts": 0}
+    try:
+        with open(path, "rb") as f:
+            source = f.read()
+        tree = ast.parse(source)
+    except (OSError, SyntaxError, ValueError):
+        return counts
+    parents = {}
+    for node in ast.walk(tree):
+        for child in ast.iter_child_nodes(node):
+            parents[child] = node
+    for node in ast.walk(tree):
+        is_doc = (
+            (isinstance(node, ast.Attribute) and node.attr == "__doc__") or
+            (isinstance(node, ast.Name) and node.id == "__doc__")
+        )
+        if is_doc and isinstance(node.ctx, ast.Load):
+            parent = parents.get(node)
+            if (
+                isinstance(parent, (ast.BinOp, ast.Subscript, ast.JoinedStr)) or
+                (isinstance(parent, ast.Attribute) and parent.value is node) or
+                (isinstance(parent, (ast.For, ast.comprehension)) and parent.iter is node)
+            ):
+                counts["docstrings"] += 1
+        elif isinstance(node, ast.ExceptHandler) and node.type is not None:
+            names = node.type.elts if isinstance(node.type, ast.Tuple) else [node.type]
+            if any(isinstance(n, ast.Name) and n.id == "AssertionError" for n in names):
+                counts["assert_handlers"] += 1
+        elif isinstance(node, ast.Assert):
+            counts["asserts"] += 1
+    return counts
+
+
+def find_optimize_hazards(config):
+    """
+    查找在优化级别 1/2 下可能出错的包
+    
+    有分析结果时扫描最近一次构建收集的第三方包和项目代码（标准库本身兼容优化模式），
+    否则只扫描入口脚本。assert 语句只统计项目自身的代码，第三方包的 assert 一般只用于内部检查。
+    
+    Returns:
+        {包名: 计数}，项目代码归入 "（项目代码）"
+    """
+    project_root = get_project_root(config)
+    toc_path = os.path.join(get_work_dir(config), "Analysis-00.toc")
+    sources = [(Path(config["script"]).stem, config["script"])]
+    if os.path.isfile(toc_path):
+        analysis = load_parsed_file(toc_path, parse_analysis_toc)
+        sources = [
+            (name, path)
+            for field in ("scripts", "pure", "_modules_outside_pyz")
+            for name, path, typecode in analysis.get(field, [])
+            if path and path.endswith(".py")
+        ]
+    
+    stdlib_dir = os.path.normcase(os.path.abspath(sysconfig.get_paths()["stdlib"])) + os.sep
+    hazards = {}
+    for name, path in sources:
+        normalized = os.path.normcase(os.path.abspath(path))
+        if normalized.startswith(stdlib_dir) and "site-packages" not in normalized:
+            continue
+        # 只有包含关键字的文件才需要解析语法树
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        in_project = os.path.abspath(path).startswith(project_root + os.sep)
+        if b"__doc__" not in data and b"AssertionError" not in data and not (in_project and b"assert" in data):
+            continue
+        counts = load_parsed_file(path, scan_optimize_hazards)
+        if not in_project:
+            counts = dict(counts, asserts=0)
+        if not any(counts.values()):
+            continue
+        package = "（项目代码）" if in_project else name.split(".")[0]
+        total = hazards.setdefault(package, dict.fromkeys(counts, 0))
+        for key, value in counts.items():
+            total[key] += value
+    return hazards
+
+
+def format_optimize_hazards(hazards, level):
+    """
+    生成指定优化级别下的风险提示
+    
+    Returns:
+        提示文本，没有风险时返回空字符串
+    """
+    lines = []
+    if level >= 2:
+        docstrings = [(p, c["docstrings"]) for p, c in hazards.items() if c["docstrings"]]
+        if docstrings:
+            lines.append("以下包在运行时依赖 __doc__，级别 2 会移除文档字符串: " +
+                         ", ".join(f"{p}({n})" for p, n in sorted(docstrings, key=lambda x: -x[1])))
+    if level >= 1:
+        handlers = [(p, c["assert_handlers"]) for p, c in hazards.items() if c["assert_handlers"]]
+        if handlers:
+            lines.append("以下包通过捕获 AssertionError 控制流程，级别 1 起 assert 会被移除: " +
+                         ", ".join(f"{p}({n})" for p, n in sorted(handlers, key=lambda x: -x[1])))
+        asserts = hazards.get("（项目代码）", {}).get("asserts", 0)
+        if asserts:
+            lines.append(f"项目代码中有 {asserts} 条 assert 语句将被移除")
+    return "\n".join(lines)
+
+
+def run_temp_build(config, base_dir, tag, description):
+    """
+    将配置构建到临时目录（spec、输出和工作目录都在 base_dir 下，不覆盖项目中的文件）
+    
+    Args:
+        tag: 区分各次构建的子目录后缀
+        description: 构建失败时错误信息中的说明
+        
+    Returns:
+        (实际使用的配置, 构建耗时秒数)
+    """
+    variant = dict(
+        config, noconfirm=True,
+        output=os.path.join(base_dir, f"dist-{tag}"),
+        work=os.path.join(base_dir, f"build-{tag}"),
+    )
+    # 多入口的 spec 本身就在临时工作目录中
+    args = build_pyinstaller_args(variant)
+    if config["extra_scripts"]:
+        write_multi_entry_spec(variant)
+    else:
+        args += ["--specpath", os.path.join(base_dir, f"spec-{tag}")]
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-m", "PyInstaller", *args],
+        cwd=get_project_root(config), env=dict(os.environ, **build_environment(variant)),
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, encoding="utf-8", errors="replace",
+    )
+    duration = time.perf_counter() - started
+    if process.returncode != 0:
+        raise RuntimeError(f"{description}构建失败:\n" + "\n".join(process.stdout.splitlines()[-10:]))
+    return variant, duration
+
+
+def verify_reproducible(config):
+    """
+    以可复现模式构建两次并逐个文件比较产物
+    
+    Returns:
+        {"epoch", "file_count", "differences": [(相对路径, 说明)]}
+    """
+    config = dict(config, reproducible=True)
+    prepare_splash_image(config)
+    refresh_resource_globs(config)
+    epoch = get_source_date_epoch(config)
+    base_dir = tempfile.mkdtemp(prefix="pyinstaller-gui-reproducible-")
+    try:
+        artifacts = []
+        for run in (1, 2):
+            variant, _ = run_temp_build(config, base_dir, str(run), f"第 {run} 次")
+            artifact = get_artifact_path(variant)
+            normalize_build_output(artifact, epoch)
+            artifacts.append((artifact, hash_build_output(artifact)))
+        
+        (first, first_hashes), (second, second_hashes) = artifacts
+        differences = []
+        for name in sorted(set(first_hashes) | set(second_hashes)):
+            if name not in second_hashes:
+                differences.append((name, "只在第一次构建中"))
+            elif name not in first_hashes:
+                differences.append((name, "只在第二次构建中"))
+            elif first_hashes[name] != second_hashes[name]:
+                if os.path.isfile(first):
+                    paths = first, second
+                else:
+                    paths = os.path.join(first, name), os.path.join(second, name)
+                if first_hashes[name].startswith("-> "):
+                    differences.append((name, "链接目标不同"))
+                else:
+                    differences.append((name, f"内容不同（首个不同字节偏移 {first_difference(*paths)}）"))
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return {"epoch": epoch, "file_count": len(first_hashes), "differences": differences}
+
+
+def format_reproducible_report(result, limit=20):
+    """可复现性验证报告"""
+    epoch = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(result["epoch"]))
+    if not result["differences"]:
+        return f"两次构建的 {result['file_count']} 个文件完全相同（SOURCE_DATE_EPOCH={result['epoch']}，{epoch} UTC）"
+    lines = [f"两次构建有 {len(result['differences'])} 个文件不同（共 {result['file_count']} 个）:"]
+    lines += [f"  {name}: {reason}" for name, reason in result["differences"][:limit]]
+    if len(result["differences"]) > limit:
+        lines.append(f"  ……另有 {len(result['differences']) - limit} 个")
+    return "\n".join(lines)
+
+
+def measure_optimize_levels(config, levels=(0, 1, 2)):
+    """
+    分别以各优化级别构建到临时目录，比较 PYZ 体积、产物体积和启动时间
+    
+    Returns:
+        每个级别的结果列表 [{"level", "pyz_size", "artifact_size", "file_count", "duration", "startup_ms"}]
+    """
+    prepare_splash_image(config)
+    refresh_resource_globs(config)
+    base_dir = tempfile.mkdtemp(prefix="pyinstaller-gui-optimize-")
+    bench_args = shlex.split(config["bench_args"], posix=os.name != "nt")
+    results = []
+    try:
+        for level in levels:
+            variant, duration = run_temp_build(dict(config, optimize=level), base_dir, str(level), f"级别 {level} ")
+            
+            pyz_path = os.path.join(get_work_dir(variant), "PYZ-00.pyz")
+            artifact_size, file_count = measure_artifact(get_artifact_path(variant))
+            try:
+                startup_ms = statistics.median(measure_startup(
+                    get_executable_path(variant), config["bench_runs"], bench_args,
+                    config["bench_marker"], config["bench_timeout"]
+                ))
+            except (OSError, TimeoutError, RuntimeError):
+                # 超时或未输出退出探针时记为未测得，不影响其他级别的结果
+                startup_ms = None
+            results.append({
+                "level": level,
+                "pyz_size": os.path.getsize(pyz_path) if os.path.isfile(pyz_path) else 0,
+                "artifact_size": artifact_size,
+                "file_count": file_count,
+                "duration": duration,
+                "startup_ms": startup_ms,
+            })
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return results
+
+
+def format_optimize_report(results):
+    """生成优化级别对比报告（以级别 0 为基准）"""
+    base = results[0]
+    lines = ["级别  PYZ 体积          产物体积          启动中位数"]
+    for result in results:
+        def change(key):
+            if not base[key] or result is base or result[key] is None:
+                return ""
+            return f" ({(result[key] / base[key] - 1) * 100:+.1f}%)"
+        startup = f"{result['startup_ms']:.0f} ms" if result["startup_ms"] is not None else "未测得"
+        lines.append(
+            f"{result['level']}     {format_size(result['pyz_size'])}{change('pyz_size')}    "
+            f"{format_size(result['artifact_size'])}{change('artifact_size')}    "
+            f"{startup}{change('startup_ms')}"
+        )
+    return "\n".join(lines)
+
+
+def get_hooks_dir(config):
+    """本地钩子目录：未指定时为项目目录下的 pyinstaller_hooks"""
+    return config["hooks_dir"].strip() or os.path.join(get_project_root(config), DEFAULT_HOOKS_DIR_NAME)
+
+
+def list_local_hooks(hooks_dir):
+    """本地钩子目录中的钩子文件名（hook-*.py）"""
+    if not os.path.isdir(hooks_dir):
+        return []
+    return sorted(name for name in os.listdir(hooks_dir) if name.startswith("hook-") and name.endswith(".py"))
+
+
+def stock_qt_hooks(modules=None):
+    """
+    PyInstaller 自带的 Qt 模块钩子 {钩子文件名: 路径}，只包含已安装的绑定
+    
+    Args:
+        modules: 只返回这些模块的钩子（如最近一次构建收集的 Qt 模块），为 None 时返回全部
+    """
+    import PyInstaller
+    stock_dir = os.path.join(os.path.dirname(PyInstaller.__file__), "hooks")
+    hooks = {}
+    for binding in QT_BINDINGS:
+        if importlib.util.find_spec(binding) is None:
+            continue
+        for name in os.listdir(stock_dir):
+            module = name[len("hook-"):-len(".py")] if name.startswith("hook-") and name.endswith(".py") else ""
+            if not module.startswith(binding + ".Qt") or (modules is not None and module not in modules):
+                continue
+            path = os.path.join(stock_dir, name)
+            with open(path, "r", encoding="utf-8") as f:
+                if "add_qt" in f.read():
+                    hooks[name] = path
+    return hooks
+
+
+def write_hook_template(template, parameter, hooks_dir, modules=None):
+    """
+    按精简钩子模板在本地钩子目录中生成钩子文件（覆盖同名文件）
+    
+    qt-plugins 模板复制 PyInstaller 自带的 Qt 模块钩子，并在末尾追加插件过滤，
+    依赖收集方式与自带钩子保持一致。
+    
+    Args:
+        template: HOOK_TEMPLATES 中的名称
+        parameter: 模板参数
+        hooks_dir: 本地钩子目录
+        modules: 最近一次构建收集的模块名（qt-plugins 只为这些 Qt 模块生成钩子，为 None 时使用常用模块）
+        
+    Returns:
+        生成的文件名列表
+    """
+    values = [value.strip() for value in parameter.split(",") if value.strip()]
+    files = {}
+    if template == "matplotlib-backend":
+        if not values:
+            raise ValueError("请指定至少一个 Matplotlib 后端")
+        backend_modules = [f"matplotlib.backends.backend_{backend.lower()}" for backend in values]
+        files["hook-matplotlib.backends.py"] = MATPLOTLIB_BACKEND_HOOK.format(template=template, modules=backend_modules)
+    elif template == "qt-plugins":
+        if modules is None:
+            modules = {f"{binding}.{name}" for binding in QT_BINDINGS for name in ("QtCore", "QtGui", "QtWidgets")}
+        for name, path in stock_qt_hooks(modules).items():
+            with open(path, "r", encoding="utf-8") as f:
+                files[name] = HOOK_HEADER.format(template=template) + f.read() + QT_PLUGINS_FILTER.format(patterns=values)
+        if not files:
+            raise ValueError("没有找到需要处理的 Qt 模块钩子（未安装 Qt 绑定或最近一次构建没有收集 Qt 模块）")
+    elif template == "blank":
+        if len(values) != 1 or not re.fullmatch(r"[A-Za-z_][\w.]*", values[0]):
+            raise ValueError("请输入一个模块名")
+        files[f"hook-{values[0]}.py"] = BLANK_HOOK.format(template=template, module=values[0])
+    else:
+        raise ValueError(f"未知的钩子模板: {template}")
+    
+    os.makedirs(hooks_dir, exist_ok=True)
+    for name, text in files.items():
+        with open(os.path.join(hooks_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+    return sorted(files)
+
+
+def compare_hook_sizes(config):
+    """
+    分别使用本地钩子和 PyInstaller 自带的钩子构建到临时目录，比较产物体积
+    
+    Returns:
+        {"local_size", "local_files", "stock_size", "stock_files", "packages", "files"}，
+        packages/files 为相对自带钩子的变化 {名称: 字节数}
+    """
+    prepare_splash_image(config)
+    refresh_resource_globs(config)
+    base_dir = tempfile.mkdtemp(prefix="pyinstaller-gui-hooks-")
+    results = {}
+    try:
+        for tag, enabled, description in (("local", True, "使用本地钩子"), ("stock", False, "使用自带钩子")):
+            variant, _ = run_temp_build(dict(config, hooks_enabled=enabled), base_dir, tag, description)
+            artifact = get_artifact_path(variant)
+            results[tag] = measure_artifact(artifact) + (collect_artifact_manifest(artifact),)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    packages, files = diff_manifests(results["stock"][2], results["local"][2])
+    return {
+        "local_size": results["local"][0],
+        "local_files": results["local"][1],
+        "stock_size": results["stock"][0],
+        "stock_files": results["stock"][1],
+        "packages": packages,
+        "files": files,
+    }
+
+
+def format_hook_comparison(result, limit=10):
+    """本地钩子与自带钩子的体积对比报告"""
+    saved = result["stock_size"] - result["local_size"]
+    ratio = saved / result["stock_size"] if result["stock_size"] else 0
+    lines = [
+        f"本地钩子 {format_size(result['local_size'])}（{result['local_files']} 个文件），"
+        f"自带钩子 {format_size(result['stock_size'])}（{result['stock_files']} 个文件），"
+        f"{'减少' if saved >= 0 else '增加'} {format_size(abs(saved))}（{abs(ratio):.1%}）"
+    ]
+    for title, deltas in (("按包", result["packages"]), ("按文件", result["files"])):
+        if deltas:
+            lines.append(f"{title}:")
+            for name, delta in sorted(deltas.items(), key=lambda item: -abs(item[1]))[:limit]:
+                lines.append(f"  {name}: {'+' if delta > 0 else '-'}{format_size(abs(delta))}")
+    return "\n".join(lines)
+
+
+def load_profiles():
+    """内置构建方案和用户保存的方案（profiles.json）"""
+    profiles = {name: dict(overrides) for name, overrides in BUILTIN_PROFILES.items()}
+    try:
+        with open(os.path.join(APP_DATA_DIR, "profiles.json"), "r", encoding="utf-8") as f:
+            custom = json.load(f)
+    except (OSError, ValueError):
+        custom = {}
+    for name, overrides in custom.items():
+        if name not in BUILTIN_PROFILES:
+            profiles[name] = {key: value for key, value in overrides.items() if key in PROFILE_KEYS}
+    return profiles
+
+
+def save_custom_profiles(profiles):
+    """保存用户方案（内置方案不写入）"""
+    custom = {name: overrides for name, overrides in profiles.items() if name not in BUILTIN_PROFILES}
+    os.makedirs(APP_DATA_DIR, exist_ok=True)
+    with open(os.path.join(APP_DATA_DIR, "profiles.json"), "w", encoding="utf-8") as f:
+        json.dump(custom, f, ensure_ascii=False, indent=2)
+
+
+def resolve_profile(config, profiles):
+    """
+    将构建方案叠加到基础配置上
+    
+    每个方案使用独立的输出目录、工作目录和 PyInstaller 缓存目录，
+    切换方案不会使其他方案的构建缓存失效。结果中 profile 置空，重复调用不会再次叠加。
+    
+    Args:
+        config: 基础配置快照
+        profiles: {方案名: 覆盖的选项}
+        
+    Returns:
+        实际用于构建的配置
+    """
+    name = config.get("profile", "")
+    if not name:
+        return config
+    resolved = {**config, **profiles.get(name, {}), "profile": ""}
+    resolved["output"] = os.path.join(config["output"].strip() or "dist", name)
+    resolved["work"] = os.path.join(config["work"].strip() or "build", name)
+    resolved["cache_dir"] = os.path.join(APP_DATA_DIR, "cache", name)
+    return resolved
+
+
+def describe_profile(overrides):
+    """构建方案覆盖项的简短说明"""
+    def format_value(value):
+        if isinstance(value, bool):
+            return "是" if value else "否"
+        if value == -1:
+            return "默认"
+        return str(value)
+    return "，".join(f"{PROFILE_KEYS[key]}: {format_value(value)}" for key, value in overrides.items())
+
+
+def build_environment(config):
+    """构建子进程使用的额外环境变量"""
+    environment = {"PYTHONUTF8": "1", "PYTHONIOENCODING": "utf-8"}
+    if config.get("cache_dir"):
+        environment["PYINSTALLER_CONFIG_DIR"] = config["cache_dir"]
+    if config.get("reproducible"):
+        # PyInstaller 用 SOURCE_DATE_EPOCH 作为可执行文件中的构建时间；固定哈希种子使集合遍历顺序和归档内容一致
+        environment["SOURCE_DATE_EPOCH"] = str(get_source_date_epoch(config))
+        environment["PYTHONHASHSEED"] = "0"
+    return environment
+
+
+def default_ramdisk_dir():
+    """系统自带的内存盘目录：Linux 为 /dev/shm，其他平台需要手动指定（如 ImDisk 创建的盘符）"""
+    if sys.platform.startswith("linux") and os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return ""
+
+
+def get_ramdisk_root(config):
+    """内存盘上本项目使用的目录（按项目路径区分），未设置内存盘时返回空字符串"""
+    base = config["ramdisk_dir"].strip() or default_ramdisk_dir()
+    if not base:
+        return ""
+    digest = hashlib.sha1(os.path.abspath(config["script"]).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(base, f"pyinstaller-gui-{get_app_name(config)}-{digest}")
+
+
+def ramdisk_required_bytes(config, builds):
+    """
+    估算内存盘构建需要的空间
+    
+    工作目录取最近一次内存盘构建记录的体积，否则按产物体积估算；暂存输出目录时再加上产物体积。
+    
+    Args:
+        config: 构建配置
+        builds: 同一项目的构建记录（按时间倒序）
+    """
+    artifact = next((build["artifact_size"] for build in builds if build["exit_code"] == 0 and build["artifact_size"]), 0)
+    if not artifact:
+        return RAMDISK_DEFAULT_REQUIRED
+    work = next(
+        (build["metrics"]["ramdisk_work_bytes"] for build in builds if build["metrics"].get("ramdisk_work_bytes")),
+        artifact * RAMDISK_WORK_RATIO
+    )
+    return work + (artifact if config["ramdisk_dist"] else 0)
+
+
+def sync_tree(source, destination):
+    """
+    将目录镜像到另一个目录：只复制大小或修改时间不同的文件，删除源目录中已不存在的文件
+    
+    Returns:
+        复制的字节数
+    """
+    copied = 0
+    os.makedirs(destination, exist_ok=True)
+    for root, dirs, files in os.walk(source):
+        target_root = os.path.join(destination, os.path.relpath(root, source))
+        names = set(dirs) | set(files)
+        for name in os.listdir(target_root):
+            if name not in names:
+                path = os.path.join(target_root, name)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+        for name in dirs:
+            os.makedirs(os.path.join(target_root, name), exist_ok=True)
+        for name in files:
+            source_path = os.path.join(root, name)
+            target_path = os.path.join(target_root, name)
+            stat = os.lstat(source_path)
+            try:
+                target_stat = os.lstat(target_path)
+                if target_stat.st_size == stat.st_size and target_stat.st_mtime_ns == stat.st_mtime_ns:
+                    continue
+            except FileNotFoundError:
+                pass
+            if os.path.islink(target_path):
+                os.remove(target_path)
+            shutil.copy2(source_path, target_path, follow_symlinks=False)
+            copied += stat.st_size
+    return copied
+
+
+def plan_ramdisk_build(config, required):
+    """
+    准备内存盘上的工作目录（以及输出暂存目录），空间不足或内存盘不可用时回退到磁盘
+    
+    内存盘上还没有工作目录时（例如重启后）先从磁盘上的工作目录复制预热缓存。
+    
+    Args:
+        config: 构建配置
+        required: 预计需要的字节数
+        
+    Returns:
+        ({"root", "work", "dist"}, "")，回退时为 (None, 原因)
+    """
+    root = get_ramdisk_root(config)
+    if not root:
+        return None, "没有可用的内存盘目录，请在高级选项中指定"
+    base = os.path.dirname(root)
+    if not os.path.isdir(base):
+        return None, f"内存盘目录不存在: {base}"
+    work = os.path.join(root, "build")
+    ram_work_dir = os.path.join(work, get_app_name(config))
+    # 已有的预热缓存会被本次构建覆盖，不重复计入
+    existing, _ = measure_artifact(ram_work_dir)
+    free = shutil.disk_usage(base).free
+    if free - RAMDISK_RESERVE < required - existing:
+        return None, (
+            f"内存盘剩余 {format_size(free)}，预计需要 {format_size(required)}"
+            f"（另保留 {format_size(RAMDISK_RESERVE)}）"
+        )
+    if not os.path.isdir(ram_work_dir) and os.path.isdir(get_work_dir(config)):
+        sync_tree(get_work_dir(config), ram_work_dir)
+    os.makedirs(work, exist_ok=True)
+    return {"root": root, "work": work, "dist": os.path.join(root, "dist") if config["ramdisk_dist"] else ""}, ""
+
+
+def commit_staged_dist(staging, config):
+    """将内存盘上暂存的输出移动到输出目录，替换同名的旧产物"""
+    destination = os.path.join(get_project_root(config), config["output"].strip() or "dist")
+    os.makedirs(destination, exist_ok=True)
+    for name in os.listdir(staging):
+        target = os.path.join(destination, name)
+        if os.path.isdir(target) and not os.path.islink(target):
+            shutil.rmtree(target)
+        elif os.path.lexists(target):
+            os.remove(target)
+        shutil.move(os.path.join(staging, name), target)
+
+
+def sync_ramdisk_work(config, plan):
+    """
+    将内存盘上的工作目录同步回磁盘上的工作目录
+    
+    Returns:
+        {"copied": 复制的字节数, "size": 内存盘上工作目录的体积, "seconds": 耗时}
+    """
+    start = time.perf_counter()
+    ram_work_dir = os.path.join(plan["work"], get_app_name(config))
+    copied = sync_tree(ram_work_dir, get_work_dir(config))
+    return {"copied": copied, "size": measure_artifact(ram_work_dir)[0], "seconds": time.perf_counter() - start}
+
+
+def format_ramdisk_comparison(duration, used_ramdisk, config, builds):
+    """
+    与最近一次另一种方式（内存盘/磁盘）且缓存设置相同的成功构建比较耗时
+    
+    Returns:
+        报告文本，没有可比较的构建时返回空字符串
+    """
+    other = next((
+        build for build in builds
+        if build["exit_code"] == 0 and bool(build["metrics"].get("ramdisk")) != used_ramdisk
+        and build["config"].get("clean") == config["clean"]
+    ), None)
+    if other is None:
+        return ""
+    ram, disk = (duration, other["duration"]) if used_ramdisk else (other["duration"], duration)
+    change = (disk - ram) / disk if disk else 0
+    return (
+        f"⚡ 内存盘构建 {ram:.1f} s，磁盘构建 {disk:.1f} s（对比构建 #{other['id']}），"
+        f"内存盘{'快' if change >= 0 else '慢'} {abs(change):.0%}\n"
+    )
+
+
+def get_source_date_epoch(config):
+    """可复现构建使用的时间戳：配置值，其次为项目最近一次 Git 提交时间，最后为 REPRODUCIBLE_EPOCH"""
+    if config["source_date_epoch"] > 0:
+        return config["source_date_epoch"]
+    try:
+        process = subprocess.run(
+            ["git", "log", "-1", "--format=%ct"], cwd=get_project_root(config),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=10,
+        )
+        if process.returncode == 0 and process.stdout.strip().isdigit():
+            return int(process.stdout.strip())
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return REPRODUCIBLE_EPOCH
+
+
+def normalize_build_output(path, epoch):
+    """将产物中所有文件和目录的修改时间设为 epoch（先处理目录内容再处理目录本身）"""
+    if os.path.isfile(path):
+        os.utime(path, (epoch, epoch))
+        return
+    for root, dirs, files in os.walk(path, topdown=False):
+        for name in files + dirs:
+            os.utime(os.path.join(root, name), (epoch, epoch), follow_symlinks=False)
+    os.utime(path, (epoch, epoch))
+
+
+def hash_build_output(path):
+    """产物中每个文件的内容哈希 {相对路径: 哈希}，符号链接记录其目标"""
+    if os.path.isfile(path):
+        return {os.path.basename(path): hash_file(path)}
+    hashes = {}
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            relative = os.path.relpath(file_path, path).replace(os.sep, "/")
+            hashes[relative] = "-> " + os.readlink(file_path) if os.path.islink(file_path) else hash_file(file_path)
+    return hashes
+
+
+def first_difference(path_a, path_b, chunk_size=1024 * 1024):
+    """两个文件第一个不同字节的偏移"""
+    offset = 0
+    with open(path_a, "rb") as file_a, open(path_b, "rb") as file_b:
+        while True:
+            chunk_a, chunk_b = file_a.read(chunk_size), file_b.read(chunk_size)
+            if chunk_a != chunk_b:
+                return offset + next(
+                    (i for i, (a, b) in enumerate(zip(chunk_a, chunk_b)) if a != b), min(len(chunk_a), len(chunk_b))
+                )
+            if not chunk_a:
+                return None
+            offset += len(chunk_a)
+
+
+_glob_cache = {}
+
+
+def is_glob_entry(entry):
+    """资源条目的源路径是否为 glob 模式"""
+    pattern = entry.rsplit(";", 1)[0].partition(GLOB_EXCLUDE_SEPARATOR)[0]
+    return any(char in GLOB_CHARS for char in pattern)
+
+
+def glob_to_regex(pattern):
+    """
+    将 glob 模式转换为匹配 "/" 分隔相对路径的正则表达式
+    
+    "**" 匹配任意层目录，"*" 和 "?" 不跨越目录，"[...]" 为字符集合（"[!...]" 取反）
+    """
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+            continue
+        char = pattern[i]
+        end = pattern.find("]", i + 2) if char == "[" else -1
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif end > 0:
+            body = pattern[i + 1:end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            elif body.startswith("^"):
+                body = "\\" + body
+            regex += f"[{body}]"
+            i = end
+        else:
+            regex += re.escape(char)
+        i += 1
+    return re.compile(regex + r"\Z", re.IGNORECASE if os.name == "nt" else 0)
+
+
+def scan_glob(source, root):
+    """
+    展开 glob 条目的源路径
+    
+    Args:
+        source: "模式" 或 "模式|排除模式"；排除模式不含 "/" 时只匹配文件名
+        root: 相对模式的基准目录（项目目录）
+        
+    Returns:
+        {"base", "files", "size", "dirs", "stats"}：base 为模式中不含通配符的目录，
+        dirs/stats 记录扫描过的目录和匹配文件的修改时间，用于判断缓存是否失效
+    """
+    pattern, _, exclude = source.partition(GLOB_EXCLUDE_SEPARATOR)
+    parts = os.path.join(root, pattern.strip()).replace("\\", "/").split("/")
+    split = next(i for i, part in enumerate(parts) if any(char in GLOB_CHARS for char in part))
+    base = os.path.normpath("/".join(parts[:split]) or "/")
+    include = glob_to_regex("/".join(parts[split:]))
+    exclude = exclude.strip()
+    exclude_regex = glob_to_regex(exclude) if exclude else None
+    
+    result = {"base": base, "files": [], "size": 0, "dirs": {}, "stats": {}}
+    if not os.path.isdir(base):
+        # 基准目录不存在时记录最近的已存在的上级目录，创建基准目录后缓存随之失效
+        ancestor = os.path.dirname(base)
+        while not os.path.isdir(ancestor) and os.path.dirname(ancestor) != ancestor:
+            ancestor = os.path.dirname(ancestor)
+        if os.path.isdir(ancestor):
+            result["dirs"][ancestor] = os.stat(ancestor).st_mtime_ns
+    for directory, dirs, files in os.walk(base):
+        dirs.sort()
+        result["dirs"][directory] = os.stat(directory).st_mtime_ns
+        for file_name in sorted(files):
+            path = os.path.join(directory, file_name)
+            relative = os.path.relpath(path, base).replace(os.sep, "/")
+            if not include.match(relative):
+                continue
+            if exclude_regex and exclude_regex.match(relative if "/" in exclude else file_name):
+                continue
+            stat = os.stat(path)
+            result["files"].append(path)
+            result["size"] += stat.st_size
+            result["stats"][path] = (stat.st_mtime_ns, stat.st_size)
+    return result
+
+
+def _glob_scan_valid(scan):
+    """扫描过的目录和匹配文件的修改时间都未变化"""
+    try:
+        return (
+            all(os.stat(path).st_mtime_ns == mtime for path, mtime in scan["dirs"].items())
+            and all((lambda stat: (stat.st_mtime_ns, stat.st_size))(os.stat(path)) == signature
+                    for path, signature in scan["stats"].items())
+        )
+    except OSError:
+        return False
+
+
+def glob_matches(source, root, cached_only=False):
+    """
+    glob 条目匹配的文件（带缓存，目录和匹配文件的修改时间都未变化时直接复用）
+    
+    Args:
+        source: 条目的源路径部分
+        root: 相对模式的基准目录
+        cached_only: 只读取缓存，不访问文件系统
+        
+    Returns:
+        scan_glob() 的结果；cached_only 且没有缓存时返回 None
+    """
+    key = (source, os.path.abspath(root))
+    cached = _glob_cache.get(key)
+    if cached_only or (cached and _glob_scan_valid(cached)):
+        return cached
+    _glob_cache[key] = scan_glob(source, root)
+    return _glob_cache[key]
+
+
+def expand_resource_entry(entry, root, cached_only=False):
+    """
+    将 glob 条目展开为逐个文件的 "源路径;目标路径" 条目，保持相对于模式基准目录的目录结构
+    
+    普通条目原样返回；cached_only 且尚未扫描时返回去掉排除模式的原始模式，交给 PyInstaller 自行展开
+    """
+    if not is_glob_entry(entry):
+        return [entry]
+    source, target = entry.rsplit(";", 1)
+    matches = glob_matches(source, root, cached_only)
+    if matches is None:
+        return [f"{source.partition(GLOB_EXCLUDE_SEPARATOR)[0].strip()};{target}"]
+    return [
+        f"{path};" + os.path.normpath(os.path.join(
+            target.strip() or ".", os.path.relpath(os.path.dirname(path), matches["base"])
+        )).replace(os.sep, "/")
+        for path in matches["files"]
+    ]
+
+
+def refresh_resource_globs(config):
+    """
+    重新检查配置中全部 glob 条目（缓存仍有效时不重新扫描）
+    
+    Returns:
+        {条目: glob_matches() 的结果}
+    """
+    root = get_project_root(config)
+    return {
+        entry: glob_matches(entry.rsplit(";", 1)[0], root)
+        for entry in config["data_files"] + config["binary_files"] if is_glob_entry(entry)
+    }
+
+
+def empty_glob_entries(config):
+    """已扫描但没有匹配任何文件的 glob 条目（这些条目不会出现在命令中），只读取缓存"""
+    root = get_project_root(config)
+    entries = []
+    for entry in config["data_files"] + config["binary_files"]:
+        if not is_glob_entry(entry):
+            continue
+        scan = glob_matches(entry.rsplit(";", 1)[0], root, cached_only=True)
+        if scan is not None and not scan["files"]:
+            entries.append(entry)
+    return entries
+
+
+def to_pyinstaller_resource(entry):
+    """将 "源路径;目标路径" 条目转换为当前平台 PyInstaller 接受的分隔符格式"""
+    source, target = entry.rsplit(";", 1)
+    return f"{source}{os.pathsep}{target}"
+
+
+def build_pyinstaller_args(config):
+    """
+    根据配置快照生成 PyInstaller 命令行参数（不含 "pyinstaller" 本身）
+    
+    Args:
+        config: get_config() 返回的配置字典
+        
+    Returns:
+        参数列表
+    """
+    args = []
+    
+    # 多个入口脚本：通过 write_multi_entry_spec() 生成的 spec 文件构建，只能使用构建相关的参数
+    if config["extra_scripts"]:
+        if config["output"].strip():
+            args += ["--distpath", config["output"]]
+        if config["work"].strip():
+            args += ["--workpath", config["work"]]
+        if config["clean"]:
+            args.append("--clean")
+        if config["noconfirm"]:
+            args.append("-y")
+        if config["log_level"] != "INFO":
+            args += ["--log-level", config["log_level"]]
+        args.append(get_multi_entry_spec_path(config))
+        return args
+    
+    # 基本模式
+    args.append("-F" if config["onefile"] else "-D")
+    
+    # 单文件模式的运行时解压设置
+    if config["onefile"]:
+        if config["runtime_tmpdir"].strip():
+            args += ["--runtime-tmpdir", config["runtime_tmpdir"].strip()]
+        if config["bootloader_ignore_signals"]:
+            args.append("--bootloader-ignore-signals")
+    
+    # 窗口模式
+    args.append("-w" if config["windowed"] else "-c")
+    
+    # 图标
+    if config["icon"].strip():
+        icon_path = config["icon"]
+        # 图标文件不存在时不添加图标参数（start_build() 会在构建日志中给出警告）
+        if os.path.exists(icon_path):
+            # 检查是否存在 icon1.ico（优先使用作为任务栏图标）
+            icon1_path = os.path.join(get_project_root(config), 'icon1.ico')
+            if os.path.exists(icon1_path):
+                # 使用 icon1.ico 作为任务栏图标
+                icon_path = os.path.abspath(icon1_path)
+            else:
+                # 使用用户选择的图标文件
+                icon_path = os.path.abspath(icon_path)
+            args += ["-i", icon_path]
+    
+    # 程序名称
+    if config["name"].strip():
+        args += ["-n", config["name"]]
+    
+    # 路径选项
+    if config["output"].strip():
+        args += ["--distpath", config["output"]]
+    
+    if config["work"].strip():
+        args += ["--workpath", config["work"]]
+    
+    # 搜索路径
+    for path in config["search_paths"]:
+        args += ["-p", path]
+    
+    # 数据文件（外部数据包中的条目不再打包进可执行文件）
+    # glob 条目按缓存的扫描结果展开，生成命令时不访问文件系统（构建前由 refresh_resource_globs() 更新缓存）
+    root = get_project_root(config)
+    for data_file in config["data_files"]:
+        if data_file in config["sidecar_data_files"]:
+            continue
+        for entry in expand_resource_entry(data_file, root, cached_only=True):
+            args += ["--add-data", to_pyinstaller_resource(entry)]
+    
+    # 二进制文件
+    for binary_file in config["binary_files"]:
+        for entry in expand_resource_entry(binary_file, root, cached_only=True):
+            args += ["--add-binary", to_pyinstaller_resource(entry)]
+    
+    # 隐藏导入
+    for module in config["hidden_imports"]:
+        args += ["--hidden-import", module]
+    
+    # 收集模块
+    for package in split_collect_modules(config["collect"]):
+        args += ["--collect-submodules", package]
+    
+    # 排除模块
+    for module in config["exclude_modules"]:
+        args += ["--exclude-module", module]
+    
+    # 调试选项
+    if config["debug"]:
+        args.append("--debug")
+    
+    if config["clean"]:
+        args.append("--clean")
+    
+    if config["noupx"]:
+        args.append("--noupx")
+    
+    if config["noconfirm"]:
+        args.append("-y")
+    
+    if config["log_level"] != "INFO":
+        args += ["--log-level", config["log_level"]]
+    
+    # 字节码优化级别（-1 表示沿用运行 PyInstaller 的解释器的级别）
+    if config["optimize"] >= 0:
+        args += ["--optimize", str(config["optimize"])]
+    
+    # 其他选项
+    if config["uac"]:
+        args.append("--uac-admin")
+    
+    # 优化选项
+    if config["strip"]:
+        args.append("--strip")
+    
+    # UPX排除模块
+    for module in [m.strip() for m in config["upx_exclude"].split(",") if m.strip()]:
+        args += ["--upx-exclude", module]
+    
+    if config["key"].strip():
+        args += ["--key", config["key"]]
+    
+    if config["splash"].strip():
+        args += ["--splash", get_splash_path(config)]
+    
+    # 本地钩子目录
+    hooks_dir = get_hooks_dir(config)
+    if config["hooks_enabled"] and os.path.isdir(hooks_dir):
+        args += ["--additional-hooks-dir", hooks_dir]
+    
+    # 内存归因运行时钩子（只在设置 PYI_MEMTRACE_FILE 环境变量时生效）
+    if config["memory_trace"]:
+        args += ["--runtime-hook", os.path.join(RUNTIME_DIR, "pyi_rth_memtrace.py")]
+    
+    # 导入计时运行时钩子（只在设置 PYI_IMPORTTIME_FILE 环境变量时生效）
+    if config["import_trace"]:
+        args += ["--runtime-hook", os.path.join(RUNTIME_DIR, "pyi_rth_importtime.py")]
+    
+    # 添加脚本文件
+    args.append(config["script"])
+    
+    return args
+
+
+def write_multi_entry_spec(config):
+    """
+    为多个入口脚本生成 spec 文件
+    
+    先用 pyi-makespec 按与单入口相同的选项生成 spec（始终为目录模式），
+    再注入 MULTI_ENTRY_SPEC_PATCH，使每个入口脚本各生成一个可执行文件并共享依赖目录。
+    
+    Returns:
+        spec 文件路径
+    """
+    entries = get_entry_points(config)
+    stems = [Path(script).stem for script, _ in entries]
+    if len(set(stems)) != len(stems):
+        raise ValueError("入口脚本的文件名不能重复")
+    
+    spec_path = get_multi_entry_spec_path(config)
+    os.makedirs(os.path.dirname(spec_path), exist_ok=True)
+    # 构建相关的参数不属于 spec，去掉末尾的主脚本后换成全部入口脚本
+    options = build_pyinstaller_args(dict(
+        config, extra_scripts=[], onefile=False, output="", work="",
+        clean=False, noconfirm=False, log_level="INFO",
+    ))[:-1]
+    process = subprocess.run(
+        [sys.executable, "-m", "PyInstaller.utils.cliutils.makespec", *options,
+         "--name", get_app_name(config), "--specpath", os.path.dirname(spec_path),
+         *[script for script, _ in entries]],
+        cwd=get_project_root(config), env=dict(os.environ, **build_environment(config)),
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="replace",
+    )
+    if process.returncode != 0:
+        raise RuntimeError("生成 spec 文件失败:\n" + "\n".join(process.stdout.splitlines()[-10:]))
+    
+    with open(spec_path, "r", encoding="utf-8") as f:
+        spec = f.read()
+    patch = MULTI_ENTRY_SPEC_PATCH.format(entries=[(stem, name) for stem, (_, name) in zip(stems, entries)])
+    spec = re.sub(r"^(pyz = PYZ\(.*\)\n)", lambda m: m.group(1) + patch, spec, count=1, flags=re.MULTILINE)
+    with open(spec_path, "w", encoding="utf-8") as f:
+        f.write(spec)
+    return spec_path
+
+
+def prepare_build_inputs(config):
+    """
+    构建前生成命令中引用的文件（优化后的启动画面、多入口 spec），并更新 glob 条目的扫描结果
+    
+    Returns:
+        启动画面优化结果 (原图字节数, 优化后字节数)，未启用时为 None
+    """
+    splash_sizes = prepare_splash_image(config)
+    refresh_resource_globs(config)
+    if config["extra_scripts"]:
+        write_multi_entry_spec(config)
+    return splash_sizes
+
+
+def format_command(args):
+    """将参数列表格式化为可复制到终端执行的命令字符串"""
+    parts = []
+    for arg in args:
+        if arg.startswith("-") or re.fullmatch(r"[\w.\-]+", arg):
+            parts.append(arg)
+        else:
+            parts.append(f'"{arg}"')
+    return " ".join(parts)
+
+
+def iter_resource_entry_files(entry, root=""):
+    """
+    展开 "源路径;目标路径" 形式的资源条目
+    
+    Args:
+        entry: data_files/binary_files 中的条目
+        root: glob 条目中相对模式的基准目录
+        
+    Returns:
+        生成 (源文件路径, 包内相对路径) 元组，包内路径统一使用 "/" 分隔
+    """
+    if is_glob_entry(entry):
+        for expanded in expand_resource_entry(entry, root):
+            yield from iter_resource_entry_files(expanded)
+        return
+    
+    source, target = entry.rsplit(";", 1)
+    target = target.strip().replace("\\", "/").strip("/")
+    target = "" if target == "." else target
+    
+    if os.path.isfile(source):
+        yield source, "/".join(filter(None, [target, os.path.basename(source)]))
+        return
+    
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            relative = os.path.relpath(file_path, source).replace(os.sep, "/")
+            yield file_path, "/".join(filter(None, [target, relative]))
+
+
+def plan_resource_entries(paths, rule, target=".", root=""):
+    """
+    按统一的目标路径规则为一批文件和目录生成资源条目
+    
+    Args:
+        paths: 拖放的文件或目录路径
+        rule: "relative" 保持相对于 root 的目录结构；"flat" 文件放到 target 下，目录放到 target/目录名 下
+        target: 目标路径前缀
+        root: relative 规则的根目录，默认为所有路径所在目录的公共父目录
+        
+    Returns:
+        [("源路径;目标路径", 是否目录)]，不存在的路径被忽略
+    """
+    paths = [path for path in paths if os.path.exists(path)]
+    if not paths:
+        return []
+    if rule == "relative" and not root:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    
+    entries = []
+    for path in paths:
+        is_dir = os.path.isdir(path)
+        if rule == "flat":
+            relative = os.path.basename(os.path.normpath(path)) if is_dir else ""
+        else:
+            relative = os.path.relpath(os.path.abspath(path if is_dir else os.path.dirname(path)), root)
+            if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+                raise ValueError(f"{path} 不在根目录 {root} 中")
+        destination = os.path.normpath(os.path.join(target.strip() or ".", relative)).replace(os.sep, "/")
+        entries.append((f"{path};{destination}", is_dir))
+    return entries
+
+
+def write_sidecar_pack(entries, pack_path, root=""):
+    """
+    将资源条目写入外部数据包（未压缩，按 SIDECAR_PACK_ALIGN 对齐，便于内存映射零拷贝读取）
+    
+    Args:
+        entries: "源路径;目标路径" 形式的条目列表
+        pack_path: 数据包输出路径
+        root: glob 条目中相对模式的基准目录
+        
+    Returns:
+        (文件数, 数据总字节数)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(pack_path)), exist_ok=True)
+    temp_path = pack_path + ".tmp"
+    index = {}
+    total_size = 0
+    
+    with open(temp_path, "wb") as pack:
+        pack.write(SIDECAR_PACK_HEADER.pack(SIDECAR_PACK_MAGIC, 0, 0))
+        for entry in entries:
+            for source, name in iter_resource_entry_files(entry, root):
+                # 对齐数据起始位置
+                padding = -pack.tell() % SIDECAR_PACK_ALIGN
+                pack.write(b"\0" * padding)
+                offset = pack.tell()
+                with open(source, "rb") as src:
+                    shutil.copyfileobj(src, pack, 1024 * 1024)
+                size = pack.tell() - offset
+                index[name] = [offset, size]
+                total_size += size
+        
+        index_data = json.dumps({"version": 1, "entries": index}, ensure_ascii=False).encode("utf-8")
+        index_offset = pack.tell()
+        pack.write(index_data)
+        pack.seek(0)
+        pack.write(SIDECAR_PACK_HEADER.pack(SIDECAR_PACK_MAGIC, index_offset, len(index_data)))
+    
+    os.replace(temp_path, pack_path)
+    return len(index), total_size
+
+
+def render_splash_image(source, width, height, colors):
+    """
+    将启动画面缩放到目标尺寸内、减少调色板并重新压缩为 PNG
+    
+    Args:
+        source: 原始图片路径
+        width, height: 目标显示尺寸（只缩小不放大）
+        colors: 调色板颜色数，0 表示保留真彩色
+        
+    Returns:
+        (PNG 字节, (宽, 高))
+    """
+    with Image.open(source) as image:
+        image = image.convert("RGBA")
+    image.thumbnail((width, height), Image.LANCZOS)
+    if colors:
+        image = image.quantize(colors, method=Image.FASTOCTREE)
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue(), image.size
+
+
+def get_splash_path(config):
+    """
+    传给 --splash 的图片路径
+    
+    启用优化时为缓存目录中按原图和优化参数命名的优化结果
+    """
+    source = config["splash"].strip()
+    if not config["splash_optimize"]:
+        return source
+    key = f"{os.path.abspath(source)}|{config['splash_width']}x{config['splash_height']}|{config['splash_colors']}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(APP_DATA_DIR, "splash", f"{Path(source).stem}-{digest}.png")
+
+
+def prepare_splash_image(config):
+    """
+    生成（或复用）优化后的启动画面
+    
+    Returns:
+        (原图字节数, 优化后字节数)，未启用优化时返回 None
+    """
+    source = config["splash"].strip()
+    if not (source and config["splash_optimize"]):
+        return None
+    target = get_splash_path(config)
+    if not (os.path.isfile(target) and os.path.getmtime(target) >= os.path.getmtime(source)):
+        data, _ = render_splash_image(source, config["splash_width"], config["splash_height"], config["splash_colors"])
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(target + ".tmp", target)
+    return os.path.getsize(source), os.path.getsize(target)
+
+
+def process_tree_ids(pid):
+    """进程及其全部子进程的 PID（未安装 psutil 时只有进程本身）"""
+    pids = {pid}
+    if psutil is not None:
+        try:
+            pids.update(child.pid for child in psutil.Process(pid).children(recursive=True))
+        except psutil.Error:
+            pass
+    return pids
+
+
+def window_probe_available():
+    """当前平台能否检测程序窗口（Windows，或带 xdotool 的 X11）"""
+    if sys.platform == "win32":
+        return True
+    return bool(os.environ.get("DISPLAY") and shutil.which("xdotool"))
+
+
+def has_visible_window(pids):
+    """这些进程是否已经显示了可见的顶层窗口"""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        found = []
+        
+        @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        def callback(hwnd, lparam):
+            if user32.IsWindowVisible(hwnd):
+                owner = wintypes.DWORD()
+                user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+                if owner.value in pids:
+                    found.append(hwnd)
+                    return False
+            return True
+        
+        user32.EnumWindows(callback, 0)
+        return bool(found)
+    
+    xdotool = shutil.which("xdotool")
+    for pid in pids:
+        result = subprocess.run(
+            [xdotool, "search", "--onlyvisible", "--pid", str(pid)],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        if result.stdout.strip():
+            return True
+    return False
+
+
+def measure_splash_time(executable, runs=5, args=(), timeout=60):
+    """
+    测量启动画面出现的时间：启动程序后轮询其进程树，直到出现第一个可见窗口
+    
+    启动画面由引导程序在解压和启动 Python 之前显示，因此第一个窗口就是启动画面。
+    
+    Returns:
+        每次启动到窗口出现的耗时列表（毫秒）
+    """
+    if not window_probe_available():
+        raise RuntimeError("无法检测窗口：Windows 以外的平台需要 X11 和 xdotool")
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [executable, *args], cwd=os.path.dirname(executable),
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            while not has_visible_window(process_tree_ids(process.pid)):
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"程序在 {timeout} 秒内没有显示窗口")
+                if process.poll() is not None:
+                    raise RuntimeError("程序在显示启动画面前已退出")
+                time.sleep(0.01)
+            durations.append((time.perf_counter() - start) * 1000)
+        finally:
+            if psutil is not None and process.poll() is None:
+                try:
+                    ResourceSampler(process.pid).kill_tree()
+                except psutil.Error:
+                    pass
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+    return durations
+
+
+class TaskSignals(QObject):
+    """后台任务的信号（QRunnable 本身不能定义信号）"""
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class BackgroundTask(QRunnable):
+    """在 QThreadPool 中执行耗时函数，结果通过信号回到主线程"""
+    
+    def __init__(self, function, *args, **kwargs):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+    
+    def run(self):
+        try:
+            result = self.function(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+        else:
+            self.signals.finished.emit(result)
+
+
+class BuildHistory:
+    """本地构建历史数据库（SQLite），记录每次构建的配置快照和结果"""
+    
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(APP_DATA_DIR, "history.db")
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS builds (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project TEXT NOT NULL,
+                name TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                duration REAL,
+                exit_code INTEGER,
+                command TEXT,
+                config TEXT,
+                artifact_path TEXT,
+                artifact_size INTEGER,
+                file_count INTEGER,
+                startup_ms REAL,
+                metrics TEXT NOT NULL DEFAULT '{}',
+                profile TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS builds_project ON builds (project, started_at);
+            CREATE TABLE IF NOT EXISTS build_files (
+                build_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS build_files_build ON build_files (build_id);
+            CREATE TABLE IF NOT EXISTS baselines (
+                project TEXT NOT NULL,
+                profile TEXT NOT NULL DEFAULT '',
+                build_id INTEGER NOT NULL,
+                PRIMARY KEY (project, profile)
+            );
+        """)
+        self._migrate()
+        self.conn.commit()
+    
+    def _migrate(self):
+        """升级旧版本的数据库：构建记录和基线按构建方案区分"""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(builds)")}
+        if "profile" not in columns:
+            self.conn.execute("ALTER TABLE builds ADD COLUMN profile TEXT NOT NULL DEFAULT ''")
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(baselines)")}
+        if "profile" not in columns:
+            self.conn.executescript("""
+                ALTER TABLE baselines RENAME TO baselines_old;
+                CREATE TABLE baselines (
+                    project TEXT NOT NULL,
+                    profile TEXT NOT NULL DEFAULT '',
+                    build_id INTEGER NOT NULL,
+                    PRIMARY KEY (project, profile)
+                );
+                INSERT INTO baselines (project, profile, build_id)
+                    SELECT baselines_old.project, builds.profile, baselines_old.build_id
+                    FROM baselines_old JOIN builds ON builds.id = baselines_old.build_id;
+                DROP TABLE baselines_old;
+            """)
+    
+    def add_build(self, record):
+        """
+        添加一条构建记录
+        
+        Args:
+            record: 字段与 builds 表同名的字典，config/metrics 为字典
+            
+        Returns:
+            新记录的 id
+        """
+        record = dict(record)
+        record["config"] = json.dumps(record.get("config", {}), ensure_ascii=False)
+        record["metrics"] = json.dumps(record.get("metrics", {}), ensure_ascii=False)
+        columns = ", ".join(record)
+        placeholders = ", ".join(f":{key}" for key in record)
+        cursor = self.conn.execute(f"INSERT INTO builds ({columns}) VALUES ({placeholders})", record)
+        self.conn.commit()
+        return cursor.lastrowid
+    
+    def update_build(self, build_id, **fields):
+        """更新构建记录的普通字段"""
+        assignments = ", ".join(f"{key} = :{key}" for key in fields)
+        self.conn.execute(f"UPDATE builds SET {assignments} WHERE id = :id", dict(fields, id=build_id))
+        self.conn.commit()
+    
+    def update_metrics(self, build_id, metrics):
+        """合并附加指标到构建记录的 metrics 字段"""
+        build = self.get_build(build_id)
+        if build is None:
+            return
+        build["metrics"].update(metrics)
+        self.conn.execute(
+            "UPDATE builds SET metrics = ? WHERE id = ?",
+            (json.dumps(build["metrics"], ensure_ascii=False), build_id)
+        )
+        self.conn.commit()
+    
+    def get_build(self, build_id):
+        """按 id 获取构建记录"""
+        row = self.conn.execute("SELECT * FROM builds WHERE id = ?", (build_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+    
+    def list_builds(self, project=None, limit=None, profile=None):
+        """获取构建记录（按时间倒序），可按项目和构建方案过滤"""
+        query = "SELECT * FROM builds"
+        conditions = []
+        params = []
+        if project:
+            conditions.append("project = ?")
+            params.append(project)
+        if profile is not None:
+            conditions.append("profile = ?")
+            params.append(profile)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY started_at DESC, id DESC"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return [self._row_to_dict(row) for row in self.conn.execute(query, params)]
+    
+    def add_manifest(self, build_id, manifest):
+        """保存构建产物的文件清单"""
+        self.conn.executemany(
+            "INSERT INTO build_files (build_id, path, size) VALUES (?, ?, ?)",
+            [(build_id, path, size) for path, size in manifest.items()]
+        )
+        self.conn.commit()
+    
+    def get_manifest(self, build_id):
+        """获取构建产物的文件清单 {路径: 字节数}"""
+        rows = self.conn.execute("SELECT path, size FROM build_files WHERE build_id = ?", (build_id,))
+        return {row["path"]: row["size"] for row in rows}
+    
+    def set_baseline(self, project, build_id, profile=""):
+        """将指定构建设为项目在该构建方案下的性能基线"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO baselines (project, profile, build_id) VALUES (?, ?, ?)",
+            (project, profile, build_id)
+        )
+        self.conn.commit()
+    
+    def get_baseline(self, project, before_id=None, profile=""):
+        """
+        获取项目的性能基线：优先使用显式设置的基线，否则使用之前最近一次成功的构建
+        
+        Args:
+            project: 项目路径
+            before_id: 当前构建 id，基线必须早于它
+            profile: 构建方案，只与同一方案的构建比较
+        """
+        row = self.conn.execute(
+            "SELECT build_id FROM baselines WHERE project = ? AND profile = ?", (project, profile)
+        ).fetchone()
+        if row and row["build_id"] != before_id:
+            return self.get_build(row["build_id"])
+        
+        query = "SELECT * FROM builds WHERE project = ? AND profile = ? AND exit_code = 0"
+        params = [project, profile]
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        row = self.conn.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+        return self._row_to_dict(row) if row else None
+    
+    def latest_build(self, project, successful=True, profile=""):
+        """获取项目在该构建方案下最近一次（成功的）构建"""
+        query = "SELECT * FROM builds WHERE project = ? AND profile = ?" + (" AND exit_code = 0" if successful else "")
+        row = self.conn.execute(query + " ORDER BY id DESC LIMIT 1", (project, profile)).fetchone()
+        return self._row_to_dict(row) if row else None
+    
+    def projects(self):
+        """获取所有项目 (项目路径, 最近使用的程序名称)"""
+        rows = self.conn.execute(
+            "SELECT project, name, MAX(started_at) AS last_build FROM builds GROUP BY project ORDER BY last_build DESC"
+        )
+        return [(row["project"], row["name"]) for row in rows]
+    
+    @staticmethod
+    def _row_to_dict(row):
+        record = dict(row)
+        record["config"] = json.loads(record["config"] or "{}")
+        record["metrics"] = json.loads(record["metrics"] or "{}")
+        return record
+
+
+class TrendChart(QWidget):
+    """简单的折线图控件，用于绘制构建趋势"""
+    
+    COLORS = ["#0d6efd", "#dc3545", "#198754", "#fd7e14", "#6f42c1"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.series = []
+        self.y_formatter = str
+        self.x_labels = []
+        self.setMinimumHeight(180)
+    
+    def set_series(self, series, y_formatter=str, x_labels=None):
+        """
+        设置要绘制的数据
+        
+        Args:
+            series: [(名称, [y值, ...]), ...]，同一索引表示同一次构建
+            y_formatter: y 轴数值格式化函数
+            x_labels: x 轴首尾标签
+        """
+        self.series = series
+        self.y_formatter = y_formatter
+        self.x_labels = x_labels or []
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor("white"))
+        
+        values = [v for _, points in self.series for v in points if v is not None]
+        if not values:
+            painter.setPen(QColor("#6c757d"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "暂无数据")
+            return
+        
+        left, top, right, bottom = 80, 12, self.width() - 12, self.height() - 28
+        low, high = min(values), max(values)
+        if high == low:
+            high = low + 1
+        
+        # 坐标轴和刻度
+        painter.setPen(QColor("#ced4da"))
+        painter.drawLine(left, bottom, right, bottom)
+        painter.drawLine(left, top, left, bottom)
+        painter.setPen(QColor("#6c757d"))
+        painter.drawText(4, top + 10, self.y_formatter(high))
+        painter.drawText(4, bottom, self.y_formatter(low))
+        if self.x_labels:
+            painter.drawText(left, self.height() - 8, self.x_labels[0])
+            last = self.x_labels[-1]
+            painter.drawText(right - painter.fontMetrics().horizontalAdvance(last), self.height() - 8, last)
+        
+        for index, (label, points) in enumerate(self.series):
+            color = QColor(self.COLORS[index % len(self.COLORS)])
+            painter.setPen(QPen(color, 2))
+            painter.setBrush(QBrush(color))
+            step = (right - left) / max(len(points) - 1, 1)
+            previous = None
+            for i, value in enumerate(points):
+                if value is None:
+                    previous = None
+                    continue
+                point = QPointF(left + i * step, bottom - (value - low) / (high - low) * (bottom - top))
+                if previous is not None:
+                    painter.drawLine(previous, point)
+                if len(points) <= 60:
+                    painter.drawEllipse(point, 2.5, 2.5)
+                previous = point
+            painter.drawText(left + 8 + index * 110, top + 12, label)
+
+
+class BuildLogModel(QAbstractListModel):
+    """
+    构建日志模型
+    
+    日志行保存在固定容量的环形缓冲区中；追加的文本先进入待处理队列，
+    由定时器按帧批量写入缓冲区、搜索索引和磁盘日志，避免大量输出阻塞界面。
+    """
+    
+    def __init__(self, capacity=LOG_BUFFER_LINES, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self.levels = set(LOG_LEVELS)
+        self.spool = None
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(16)
+        self.flush_timer.timeout.connect(self.flush)
+        self.reset()
+    
+    def reset(self):
+        """清空所有日志"""
+        self.beginResetModel()
+        # 环形缓冲区：行号 seq 存放在 ring[seq % capacity]
+        self.ring = [None] * self.capacity
+        self.first_seq = 0
+        self.next_seq = 0
+        # 当前过滤条件下可见行的行号（升序）
+        self.visible = []
+        # 分块的倒排索引：[(块的起始行号, {小写单词: 行号列表}), ...]
+        self.index_chunks = collections.deque()
+        self.pending = []
+        self.partial = ""
+        self.current_level = "INFO"
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        level, text = self.ring[self.visible[index.row()] % self.capacity]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return QColor(LOG_LEVEL_COLORS[level])
+        return None
+    
+    def append_text(self, text):
+        """追加原始输出（可以包含不完整的行），实际写入在下一帧批量完成"""
+        lines = (self.partial + text).split("\n")
+        self.partial = lines.pop()
+        self.pending.extend(line.rstrip("\r") for line in lines)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+    
+    def finish(self):
+        """
+        输出结束：写入剩余的不完整行
+        
+        磁盘日志保持打开到下一次 start_spool()，之后单独执行的操作（测量、去重、打包等）
+        的输出仍写入同一个日志文件。
+        """
+        if self.partial:
+            self.pending.append(self.partial)
+            self.partial = ""
+        self.flush()
+    
+    def start_spool(self, path):
+        """将完整日志同时写入磁盘文件（关闭上一次的日志文件）"""
+        if self.spool:
+            self.spool.close()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.spool = open(path, "w", encoding="utf-8")
+    
+    def flush(self):
+        """将待处理的行批量写入缓冲区并通知视图"""
+        self.flush_timer.stop()
+        if not self.pending:
+            return
+        lines, self.pending = self.pending, []
+        
+        if self.spool:
+            self.spool.write("\n".join(lines) + "\n")
+            self.spool.flush()
+        
+        new_visible = []
+        for text in lines:
+            match = LOG_LEVEL_PATTERN.match(text)
+            if match:
+                level = match.group(1)
+                level = {"WARN": "WARNING", "CRITICAL": "ERROR", "DEPRECATION": "WARNING"}.get(level, level)
+                self.current_level = level
+            else:
+                # 无级别前缀的行（如异常堆栈）沿用上一行的级别
+                level = self.current_level
+            
+            seq = self.next_seq
+            self.ring[seq % self.capacity] = (level, text)
+            self.next_seq += 1
+            if not self.index_chunks or seq - self.index_chunks[-1][0] >= LOG_INDEX_CHUNK_LINES:
+                self.index_chunks.append((seq, {}))
+            word_index = self.index_chunks[-1][1]
+            for word in set(re.findall(r"\w+", text.lower())):
+                word_index.setdefault(word, []).append(seq)
+            if level in self.levels:
+                new_visible.append(seq)
+        
+        # 超出容量的旧行被覆盖，从可见列表头部移除
+        first_seq = max(0, self.next_seq - self.capacity)
+        if first_seq > self.first_seq:
+            self.first_seq = first_seq
+            removed = bisect.bisect_left(self.visible, first_seq)
+            if removed:
+                self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+                del self.visible[:removed]
+                self.endRemoveRows()
+            new_visible = [seq for seq in new_visible if seq >= first_seq]
+            # 丢弃全部行都已被覆盖的索引块
+            while len(self.index_chunks) > 1 and self.index_chunks[1][0] <= first_seq:
+                self.index_chunks.popleft()
+        
+        if new_visible:
+            start = len(self.visible)
+            self.beginInsertRows(QModelIndex(), start, start + len(new_visible) - 1)
+            self.visible.extend(new_visible)
+            self.endInsertRows()
+    
+    def set_levels(self, levels):
+        """设置显示的日志级别"""
+        self.beginResetModel()
+        self.levels = set(levels)
+        self.visible = [
+            seq for seq in range(self.first_seq, self.next_seq)
+            if self.ring[seq % self.capacity][0] in self.levels
+        ]
+        self.endResetModel()
+    
+    def search(self, query):
+        """
+        使用倒排索引查找包含 query 的行
+        
+        Returns:
+            升序的可见行号列表
+        """
+        query = query.strip().lower()
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+        
+        candidates = set()
+        for _, word_index in self.index_chunks:
+            candidates.update(self._search_chunk(word_index, words))
+        
+        return sorted(
+            seq for seq in candidates
+            if seq >= self.first_seq
+            and self.ring[seq % self.capacity][0] in self.levels
+            and query in self.ring[seq % self.capacity][1].lower()
+        )
+    
+    @staticmethod
+    def _search_chunk(word_index, words):
+        """在一个索引块中查找包含全部单词的行号"""
+        postings = []
+        for i, word in enumerate(words):
+            if word in word_index:
+                postings.append(word_index[word])
+            elif i == len(words) - 1:
+                # 最后一个词可能尚未输入完整，按前缀匹配
+                merged = set()
+                for key, seqs in word_index.items():
+                    if key.startswith(word):
+                        merged.update(seqs)
+                postings.append(merged)
+            else:
+                return set()
+        
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for seqs in postings[1:]:
+            candidates.intersection_update(seqs)
+        return candidates
+    
+    def row_of(self, seq):
+        """行号对应的可见行索引"""
+        return bisect.bisect_left(self.visible, seq)
+
+
+class BuildLogView(QWidget):
+    """虚拟化构建日志视图：级别过滤、增量搜索、自动滚动"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = BuildLogModel(parent=self)
+        self.matches = []
+        self.match_index = -1
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        toolbar = QHBoxLayout()
+        self.level_checks = {}
+        for level in LOG_LEVELS:
+            check = QCheckBox(level)
+            check.setChecked(True)
+            check.toggled.connect(self.update_levels)
+            self.level_checks[level] = check
+            toolbar.addWidget(check)
+        
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索日志，如: module not found")
+        self.search_edit.textChanged.connect(self.update_search)
+        self.search_edit.returnPressed.connect(self.next_match)
+        prev_btn = QPushButton("▲")
+        prev_btn.setMinimumWidth(36)
+        prev_btn.clicked.connect(self.previous_match)
+        next_btn = QPushButton("▼")
+        next_btn.setMinimumWidth(36)
+        next_btn.clicked.connect(self.next_match)
+        self.match_label = QLabel("")
+        
+        toolbar.addWidget(self.search_edit, 1)
+        toolbar.addWidget(prev_btn)
+        toolbar.addWidget(next_btn)
+        toolbar.addWidget(self.match_label)
+        
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setFont(QFont("Consolas", 10))
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.list_view.setStyleSheet("QListView::item { padding: 0px; border: none; margin: 0px; }")
+        
+        self.spool_label = QLabel("")
+        self.spool_label.setStyleSheet("color: #6c757d; font-size: 11px;")
+        self.spool_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        
+        self.model.rowsAboutToBeInserted.connect(self.remember_scroll)
+        self.model.rowsInserted.connect(self.restore_scroll)
+        self.follow_tail = True
+        
+        layout.addLayout(toolbar)
+        layout.addWidget(self.list_view, 1)
+        layout.addWidget(self.spool_label)
+    
+    def clear(self):
+        self.model.reset()
+        self.matches = []
+        self.match_index = -1
+        self.match_label.setText("")
+        self.spool_label.setText("")
+    
+    def append_text(self, text):
+        self.model.append_text(text)
+    
+    def start_spool(self, path):
+        self.model.start_spool(path)
+        self.spool_label.setText(f"完整日志: {path}")
+    
+    def finish(self):
+        self.model.finish()
+    
+    def remember_scroll(self):
+        scroll_bar = self.list_view.verticalScrollBar()
+        self.follow_tail = scroll_bar.value() >= scroll_bar.maximum() - 2
+    
+    def restore_scroll(self):
+        # 在视图处理完插入后再滚动
+        if self.follow_tail:
+            QTimer.singleShot(0, self.list_view.scrollToBottom)
+    
+    def update_levels(self):
+        self.model.set_levels([level for level, check in self.level_checks.items() if check.isChecked()])
+        self.update_search()
+    
+    def update_search(self):
+        """查询变化时重新查找匹配行"""
+        self.model.flush()
+        self.matches = self.model.search(self.search_edit.text())
+        self.match_index = -1
+        self.match_label.setText(f"{len(self.matches)} 处" if self.search_edit.text().strip() else "")
+    
+    def next_match(self):
+        self.jump_to_match(1)
+    
+    def previous_match(self):
+        self.jump_to_match(-1)
+    
+    def jump_to_match(self, direction):
+        """跳转到当前位置之后（或之前）的匹配行；构建仍在进行时包含新输出"""
+        if not self.search_edit.text().strip():
+            return
+        self.model.flush()
+        self.matches = self.model.search(self.search_edit.text())
+        if not self.matches:
+            self.match_label.setText("0 处")
+            return
+        
+        current = self.list_view.currentIndex()
+        if current.isValid():
+            current_seq = self.model.visible[current.row()]
+            if direction > 0:
+                position = bisect.bisect_right(self.matches, current_seq)
+            else:
+                position = bisect.bisect_left(self.matches, current_seq) - 1
+        else:
+            position = 0 if direction > 0 else len(self.matches) - 1
+        self.match_index = position % len(self.matches)
+        
+        seq = self.matches[self.match_index]
+        index = self.model.index(self.model.row_of(seq))
+        self.follow_tail = False
+        self.list_view.setCurrentIndex(index)
+        self.list_view.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+        self.match_label.setText(f"{self.match_index + 1}/{len(self.matches)}")
+
+
+class BatchTargetDialog(QDialog):
+    """批量拖放资源时设置统一的目标路径规则"""
+    
+    def __init__(self, paths, parent):
+        super().__init__(parent)
+        self.setWindowTitle("设置目标路径")
+        self.resize(560, 0)
+        
+        self.rule_combo = QComboBox()
+        for rule, label in BATCH_TARGET_RULES.items():
+            self.rule_combo.addItem(label, rule)
+        self.target_edit = QLineEdit(".")
+        try:
+            root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+        except ValueError:
+            # 位于不同驱动器上的路径没有公共父目录
+            root = ""
+        self.root_edit = QLineEdit(root)
+        root_browse_btn = QPushButton("浏览")
+        root_browse_btn.clicked.connect(self.browse_root)
+        root_layout = QHBoxLayout()
+        root_layout.addWidget(self.root_edit)
+        root_layout.addWidget(root_browse_btn)
+        self.rule_combo.currentIndexChanged.connect(
+            lambda: self.root_edit.setEnabled(self.rule_combo.currentData() == "relative")
+        )
+        
+        form = QFormLayout()
+        form.addRow(QLabel(f"共 {len(paths)} 个文件或目录，使用同一规则设置在可执行文件中的目标路径:"))
+        form.addRow("规则:", self.rule_combo)
+        form.addRow("目标路径:", self.target_edit)
+        form.addRow("根目录:", root_layout)
+        
+        ok_btn = QPushButton("添加")
+        ok_btn.clicked.connect(self.accept)
+        cancel_btn = QPushButton("取消")
+        cancel_btn.clicked.connect(self.reject)
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(ok_btn)
+        button_layout.addWidget(cancel_btn)
+        
+        layout = QVBoxLayout(self)
+        layout.addLayout(form)
+        layout.addLayout(button_layout)
+    
+    def browse_root(self):
+        folder_path = QFileDialog.getExistingDirectory(self, "选择根目录", self.root_edit.text())
+        if folder_path:
+            self.root_edit.setText(folder_path)
+    
+    def rule(self):
+        """返回 (规则, 目标路径, 根目录)"""
+        return self.rule_combo.currentData(), self.target_edit.text().strip() or ".", self.root_edit.text().strip()
+
+
+class BuildHistoryDialog(QDialog):
+    """构建历史浏览对话框：按项目过滤、绘制趋势、恢复历史配置"""
+    
+    # 趋势指标: (显示名称, 取值函数, 格式化函数)
+    TREND_METRICS = [
+        ("产物体积", lambda b: b["artifact_size"], format_size),
+        ("文件数", lambda b: b["file_count"], str),
+        ("构建耗时", lambda b: b["duration"], lambda v: f"{v:.1f} s"),
+        ("启动时间", lambda b: b["startup_ms"], lambda v: f"{v:.0f} ms"),
+        ("构建峰值内存", lambda b: b["metrics"].get("peak_rss"), format_size),
+        ("启动画面显示", lambda b: b["metrics"].get("splash_ms"), lambda v: f"{v:.0f} ms"),
+        ("启动内存峰值", lambda b: b["metrics"].get("startup_peak_rss"), format_size),
+        ("归档体积", lambda b: b["metrics"].get("archive_size"), format_size),
+        ("归档耗时", lambda b: b["metrics"].get("archive_seconds"), lambda v: f"{v:.2f} s"),
+        ("模块导入耗时", lambda b: b["metrics"].get("import_total_ms"), lambda v: f"{v:.0f} ms"),
+        ("单文件解压耗时", lambda b: b["metrics"].get("extract_ms"), lambda v: f"{v:.0f} ms"),
+        ("单文件解压写入", lambda b: b["metrics"].get("extract_bytes"), format_size),
+    ]
+    
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.builds = []
+        self.setWindowTitle("📜 构建历史")
+        self.resize(1000, 650)
+        
+        layout = QVBoxLayout(self)
+        
+        filter_layout = QHBoxLayout()
+        self.project_combo = QComboBox()
+        self.project_combo.addItem("全部项目", None)
+        for project, name in history.projects():
+            self.project_combo.addItem(f"{name}  ({project})", project)
+        self.project_combo.currentIndexChanged.connect(self.refresh)
+        
+        self.metric_combo = QComboBox()
+        self.metric_combo.addItems([metric[0] for metric in self.TREND_METRICS])
+        self.metric_combo.currentIndexChanged.connect(self.update_chart)
+        
+        filter_layout.addWidget(QLabel("项目:"))
+        filter_layout.addWidget(self.project_combo, 1)
+        filter_layout.addWidget(QLabel("趋势:"))
+        filter_layout.addWidget(self.metric_combo)
+        
+        self.table = QTableWidget(0, 7)
+        self.table.setHorizontalHeaderLabels(["时间", "程序", "耗时", "退出码", "产物体积", "文件数", "启动时间"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        
+        self.chart = TrendChart()
+        
+        button_layout = QHBoxLayout()
+        restore_btn = QPushButton("♻️ 恢复此配置")
+        restore_btn.clicked.connect(self.restore_selected)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addStretch()
+        button_layout.addWidget(restore_btn)
+        button_layout.addWidget(close_btn)
+        
+        layout.addLayout(filter_layout)
+        layout.addWidget(self.table, 3)
+        layout.addWidget(self.chart, 2)
+        layout.addLayout(button_layout)
+        
+        self.refresh()
+    
+    def refresh(self):
+        """按当前项目过滤重新加载记录"""
+        self.builds = self.history.list_builds(self.project_combo.currentData())
+        self.table.setRowCount(len(self.builds))
+        for row, build in enumerate(self.builds):
+            values = [
+                build["started_at"],
+                build["name"] + (f"（{build['profile']}）" if build["profile"] else ""),
+                f"{build['duration']:.1f} s" if build["duration"] is not None else "",
+                str(build["exit_code"]),
+                format_size(build["artifact_size"]) if build["artifact_size"] else "",
+                str(build["file_count"] or ""),
+                f"{build['startup_ms']:.0f} ms" if build["startup_ms"] is not None else "",
+            ]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+        self.update_chart()
+    
+    def update_chart(self):
+        """绘制所选指标随时间的趋势（仅成功的构建）"""
+        label, getter, formatter = self.TREND_METRICS[self.metric_combo.currentIndex()]
+        builds = [b for b in reversed(self.builds) if b["exit_code"] == 0]
+        x_labels = [builds[0]["started_at"], builds[-1]["started_at"]] if builds else []
+        self.chart.set_series([(label, [getter(b) for b in builds])], formatter, x_labels)
+    
+    def restore_selected(self):
+        """将选中构建的配置恢复到主窗口"""
+        row = self.table.currentRow()
+        if row < 0:
+            QMessageBox.warning(self, "警告", "请先选中一条构建记录！")
+            return
+        self.parent().apply_config(self.builds[row]["config"])
+        QMessageBox.information(self, "成功", "已恢复该次构建的配置")
+
+
+class SplashPreviewDialog(QDialog):
+    """启动画面优化预览：并排显示原图和优化结果"""
+    
+    PREVIEW_SIZE = 420
+    
+    def __init__(self, config, parent):
+        super().__init__(parent)
+        self.setWindowTitle("🖼️ 启动画面优化预览")
+        self.resize(960, 560)
+        
+        layout = QVBoxLayout(self)
+        images_layout = QHBoxLayout()
+        self.original_label = QLabel()
+        self.optimized_label = QLabel("正在生成...")
+        self.original_info = QLabel()
+        self.optimized_info = QLabel()
+        for title, image_label, info_label in (
+            ("原图", self.original_label, self.original_info),
+            ("优化后", self.optimized_label, self.optimized_info),
+        ):
+            group = QGroupBox(title)
+            group_layout = QVBoxLayout(group)
+            image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            image_label.setMinimumSize(self.PREVIEW_SIZE, self.PREVIEW_SIZE)
+            group_layout.addWidget(image_label, 1)
+            group_layout.addWidget(info_label)
+            images_layout.addWidget(group)
+        
+        self.summary_label = QLabel()
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.accept)
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.summary_label, 1)
+        button_layout.addWidget(close_btn)
+        
+        layout.addLayout(images_layout)
+        layout.addLayout(button_layout)
+        
+        source = config["splash"]
+        self.original_size = os.path.getsize(source)
+        pixmap = QPixmap(source)
+        self.set_preview(self.original_label, pixmap)
+        self.original_info.setText(f"{pixmap.width()}×{pixmap.height()}，{format_size(self.original_size)}")
+        
+        parent.run_in_background(
+            render_splash_image, source, config["splash_width"], config["splash_height"], config["splash_colors"],
+            on_done=self.show_optimized,
+            on_error=lambda message: self.optimized_label.setText(f"优化失败: {message}")
+        )
+    
+    def set_preview(self, label, pixmap):
+        label.setPixmap(pixmap.scaled(
+            self.PREVIEW_SIZE, self.PREVIEW_SIZE,
+            Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        ))
+    
+    def show_optimized(self, result):
+        data, (width, height) = result
+        pixmap = QPixmap()
+        pixmap.loadFromData(data, "PNG")
+        self.set_preview(self.optimized_label, pixmap)
+        self.optimized_info.setText(f"{width}×{height}，{format_size(len(data))}")
+        saved = self.original_size - len(data)
+        self.summary_label.setText(
+            f"节省 {format_size(saved)}（{saved / self.original_size * 100:.1f}%）" if saved > 0
+            else "优化后没有变小，建议保留原图"
+        )
+
+
+class DependencyGraphDialog(QDialog):
+    """依赖关系浏览对话框：查询模块的最短导入链，预估排除模块可减少的体积"""
+    
+    def __init__(self, graph, parent):
+        super().__init__(parent)
+        self.graph = graph
+        self.costs = []
+        # 本次浏览中新排除的模块，用于预估累计节省
+        self.blocked = set()
+        for module in parent.exclude_modules:
+            if module in graph.ids:
+                self.blocked |= graph.module_and_submodules(module)
+        self.base_size = graph.total_size()
+        self.setWindowTitle("🔍 依赖关系浏览")
+        self.resize(1100, 650)
+        
+        layout = QVBoxLayout(self)
+        
+        self.summary_label = QLabel()
+        
+        query_layout = QHBoxLayout()
+        self.module_edit = QLineEdit()
+        self.module_edit.setPlaceholderText("输入模块名，如 torch 或 numpy.core")
+        completer = QCompleter(graph.names, self)
+        completer.setFilterMode(Qt.MatchFlag.MatchContains)
+        self.module_edit.setCompleter(completer)
+        self.module_edit.returnPressed.connect(self.query)
+        query_btn = QPushButton("查询导入链")
+        query_btn.clicked.connect(self.query)
+        query_layout.addWidget(QLabel("模块:"))
+        query_layout.addWidget(self.module_edit, 1)
+        query_layout.addWidget(query_btn)
+        
+        tables_layout = QHBoxLayout()
+        self.package_table = QTableWidget(0, 2)
+        self.package_table.setHorizontalHeaderLabels(["顶层包", "体积"])
+        self.package_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.package_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.package_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.package_table.cellDoubleClicked.connect(
+            lambda row, column: self.query(self.package_table.item(row, 0).text())
+        )
+        self.package_table.setToolTip("双击查询该包的导入链")
+        
+        self.path_table = QTableWidget(0, 4)
+        self.path_table.setHorizontalHeaderLabels(["导入方", "模块", "切断此导入可减少", "排除此模块可减少"])
+        self.path_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.path_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.path_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.path_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        
+        tables_layout.addWidget(self.package_table, 1)
+        tables_layout.addWidget(self.path_table, 2)
+        
+        button_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        exclude_btn = QPushButton("❌ 排除所选模块")
+        exclude_btn.setToolTip("切断导入链：将所选行的模块加入排除模块")
+        exclude_btn.clicked.connect(self.exclude_selected)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.status_label, 1)
+        button_layout.addWidget(exclude_btn)
+        button_layout.addWidget(close_btn)
+        
+        layout.addWidget(self.summary_label)
+        layout.addLayout(query_layout)
+        layout.addLayout(tables_layout)
+        layout.addLayout(button_layout)
+        
+        self.refresh_packages()
+    
+    def refresh_packages(self):
+        """更新体积汇总和顶层包排行"""
+        packages = self.graph.package_sizes(self.blocked)
+        projected = self.graph.total_size(self.blocked)
+        text = f"共 {len(self.graph.names)} 个模块，已收集 {format_size(self.base_size)}"
+        if projected != self.base_size:
+            text += f"，排除后预计 {format_size(projected)}（减少 {format_size(self.base_size - projected)}，需重新构建生效）"
+        self.summary_label.setText(text)
+        
+        packages = packages[:100]
+        self.package_table.setRowCount(len(packages))
+        for row, (package, size) in enumerate(packages):
+            self.package_table.setItem(row, 0, QTableWidgetItem(package))
+            self.package_table.setItem(row, 1, QTableWidgetItem(format_size(size)))
+    
+    def query(self, module=None):
+        """在后台计算入口脚本到模块的最短导入链及每一步的体积"""
+        module = module or self.module_edit.text().strip()
+        self.module_edit.setText(module)
+        target = self.graph.ids.get(module)
+        if target is None:
+            self.status_label.setText(f"依赖图中没有模块 {module}")
+            return
+        self.status_label.setText("正在计算...")
+        self.parent().run_in_background(
+            self.graph.path_costs, target, set(self.blocked),
+            on_done=lambda costs: self.show_costs(module, costs),
+            on_error=lambda message: self.status_label.setText(f"计算失败: {message}")
+        )
+    
+    def show_costs(self, module, costs):
+        self.costs = costs
+        self.path_table.setRowCount(len(costs))
+        for row, cost in enumerate(costs):
+            values = [cost["importer"], cost["module"], format_size(cost["edge_bytes"]), format_size(cost["exclude_bytes"])]
+            for column, value in enumerate(values):
+                self.path_table.setItem(row, column, QTableWidgetItem(value))
+        if costs:
+            self.status_label.setText(f"{module} 的导入链共 {len(costs)} 步")
+        else:
+            self.status_label.setText(f"{module} 未被收集，或已被排除")
+    
+    def exclude_selected(self):
+        """排除所选行的模块，并预估排除后的体积"""
+        row = self.path_table.currentRow()
+        if row < 0:
+            QMessageBox.warning(self, "警告", "请先选中导入链中的一步！")
+            return
+        cost = self.costs[row]
+        reply = QMessageBox.question(
+            self, "排除模块",
+            f"排除 {cost['module']} 预计减少 {format_size(cost['exclude_bytes'])}，"
+            f"该模块被其他代码导入时运行会失败。确定排除吗？"
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        if self.parent().add_exclude_module_by_name(cost["module"]):
+            self.parent().generate_command()
+        self.blocked |= self.graph.module_and_submodules(cost["module"])
+        self.refresh_packages()
+        self.query()
+
+
+class ImportTimeDialog(QDialog):
+    """导入计时浏览对话框：按导入关系展示冻结程序中每个模块的导入耗时和体积"""
+    
+    def __init__(self, records, parent=None, title=""):
+        super().__init__(parent)
+        self.records = records
+        self.summary = summarize_import_times(records)
+        self.setWindowTitle(f"⏱️ 模块导入耗时{' - ' + title if title else ''}")
+        self.resize(1000, 650)
+        
+        layout = QVBoxLayout(self)
+        
+        summary_label = QLabel(
+            f"共导入 {self.summary['modules']} 个模块，累计 {self.summary['total_ms']:.1f} ms，"
+            f"模块体积 {format_size(self.summary['size'])}"
+        )
+        
+        option_layout = QHBoxLayout()
+        self.flat_check = QCheckBox("平铺显示（按自身耗时排序）")
+        self.flat_check.toggled.connect(self.populate)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("筛选模块名")
+        self.filter_edit.textChanged.connect(self.populate)
+        option_layout.addWidget(self.flat_check)
+        option_layout.addWidget(self.filter_edit, 1)
+        
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["模块", "累计 (ms)", "自身 (ms)", "占比", "体积", "来源"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.tree.setSortingEnabled(True)
+        
+        button_layout = QHBoxLayout()
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        
+        layout.addWidget(summary_label)
+        layout.addLayout(option_layout)
+        layout.addWidget(self.tree, 1)
+        layout.addLayout(button_layout)
+        
+        self.populate()
+    
+    def make_item(self, record):
+        item = QTreeWidgetItem([record["module"]])
+        # 数值列按数值排序
+        item.setData(1, Qt.ItemDataRole.DisplayRole, round(record["total_us"] / 1000, 1))
+        item.setData(2, Qt.ItemDataRole.DisplayRole, round(record["self_us"] / 1000, 1))
+        share = record["total_us"] / 1000 / self.summary["total_ms"] if self.summary["total_ms"] else 0
+        item.setText(3, f"{share:.1%}")
+        item.setText(4, format_size(record["size"]) if record["size"] else "")
+        item.setText(5, record["source"])
+        # 用背景色深浅表示累计耗时占比，形成类似火焰图的热点提示
+        item.setBackground(0, QColor(255, 140, 0, int(min(share, 1) * 160)))
+        return item
+    
+    def populate(self):
+        self.tree.clear()
+        text = self.filter_edit.text().strip().lower()
+        if self.flat_check.isChecked() or text:
+            for record in self.records:
+                if text in record["module"].lower():
+                    self.tree.addTopLevelItem(self.make_item(record))
+            self.tree.sortByColumn(2, Qt.SortOrder.DescendingOrder)
+            return
+        
+        def add(node, parent_item):
+            item = self.make_item(node)
+            parent_item.addChild(item)
+            for child in node["children"]:
+                add(child, item)
+        
+        root = self.tree.invisibleRootItem()
+        for node in build_import_tree(self.records):
+            add(node, root)
+        self.tree.sortByColumn(1, Qt.SortOrder.DescendingOrder)
 
 
 class PyInstallerGUI(QMainWindow):
@@ -34,12 +4904,76 @@ class PyInstallerGUI(QMainWindow):
         self.search_paths = []
         self.data_files = []
         self.binary_files = []
+        self.extra_scripts = []
         self.hidden_imports = []
         self.exclude_modules = []
         
         # 初始化UPX排除模块列表
         self.upx_exclude_modules = []
         
+        # 路由到外部数据包的数据文件条目（data_files 的子集）
+        self.sidecar_data_files = []
+        
+        # 文件对话框是否首次打开（首次时定位到脚本所在目录）
+        self.first_data_dialog = True
+        self.first_binary_dialog = True
+        
+        # 构建进程和构建历史
+        self.build_process = None
+        self.build_config = None
+        # 构建进程启动前或结束后仍有后台准备工作（内存盘规划、移动暂存输出）
+        self.build_preparing = False
+        self.build_profile = ""
+        self.build_command = ""
+        self.build_started_at = None
+        self.build_start_time = 0.0
+        self.last_build_id = None
+        self.build_log_path = ""
+        self.history = BuildHistory()
+        
+        # 构建方案
+        self.profiles = load_profiles()
+        
+        # 最近一次读取的构建警告
+        self.warnings_report = None
+        
+        # 隐藏导入和收集子模块的代价分析（输入停顿后在后台计算）
+        self.import_cost_generation = 0
+        self.import_cost_timer = QTimer(self)
+        self.import_cost_timer.setSingleShot(True)
+        self.import_cost_timer.setInterval(500)
+        self.import_cost_timer.timeout.connect(self.update_import_costs)
+        
+        # 构建前估算（任何选项变化后停顿时在后台重新估算）
+        self.estimate_generation = 0
+        self.estimate_timer = QTimer(self)
+        self.estimate_timer.setSingleShot(True)
+        self.estimate_timer.setInterval(800)
+        self.estimate_timer.timeout.connect(self.update_build_estimate)
+        
+        # 构建后处理步骤（基准测试、预算检查等）按顺序执行
+        self.post_build_steps = []
+        self.post_build_id = None
+        # 通过常驻构建进程构建时，客户端写入执行构建的子进程号的文件
+        self.daemon_pid_path = ""
+        # 本次构建使用的内存盘目录，回退到磁盘时记录原因
+        self.ramdisk_plan = None
+        self.ramdisk_fallback = ""
+        self.background_tasks = set()
+        
+        # 构建资源监视
+        self.resource_sampler = None
+        self.resource_samples = []
+        self.resource_timer = QTimer(self)
+        self.resource_timer.timeout.connect(self.sample_build_resources)
+        self.memory_limit_exceeded = False
+        
+        # 无界面模式（命令行）下不弹出对话框，结果通过退出码返回
+        self.headless = False
+        self.force_gate = False
+        self.build_exit_code = 0
+        self.gate_failed = False
+        
         self.setup_ui()
         self.apply_styles()
         self.center_window()
@@ -70,6 +5004,7 @@ class PyInstallerGUI(QMainWindow):
         
         # 左侧配置区
         config_widget = self.create_config_panel()
+        self.watch_config_changes(config_widget)
         
         # 右侧命令区
         command_widget = self.create_command_panel()
@@ -108,6 +5043,23 @@ class PyInstallerGUI(QMainWindow):
         advanced_tab = self.create_advanced_tab()
         tab_widget.addTab(advanced_tab, "⚙️ 高级设置")
         
+        # 性能分析标签页
+        performance_tab = self.create_performance_tab()
+        tab_widget.addTab(performance_tab, "📊 性能分析")
+        
+        # 构建警告标签页
+        warnings_tab = self.create_warnings_tab()
+        tab_widget.addTab(warnings_tab, "⚠️ 构建警告")
+        
+        # 切换到资源文件页时重新检查 glob 条目（文件未变化时直接使用缓存），切换到高级设置页时刷新发布快照，
+        # 切换到模块管理页时刷新本地钩子列表
+        self.module_tab = module_tab
+        self.resource_tab = resource_tab
+        self.advanced_tab = advanced_tab
+        tab_widget.currentChanged.connect(
+            lambda index: self.on_config_tab_changed(tab_widget.widget(index))
+        )
+        
         layout.addWidget(tab_widget)
         scroll_area.setWidget(config_widget)
         
@@ -137,6 +5089,26 @@ class PyInstallerGUI(QMainWindow):
         script_input_layout.addWidget(self.script_edit)
         script_input_layout.addWidget(script_browse_btn)
         script_layout.addLayout(script_input_layout)
+        
+        # 其他入口脚本：共享同一次分析和同一个依赖目录
+        extra_controls = QHBoxLayout()
+        extra_controls.addWidget(QLabel("其他入口脚本:"))
+        add_extra_btn = QPushButton("添加入口")
+        add_extra_btn.clicked.connect(self.add_extra_script)
+        remove_extra_btn = QPushButton("删除选中")
+        remove_extra_btn.clicked.connect(self.remove_extra_script)
+        extra_controls.addWidget(add_extra_btn)
+        extra_controls.addWidget(remove_extra_btn)
+        extra_controls.addStretch()
+        script_layout.addLayout(extra_controls)
+        
+        self.extra_script_list = QListWidget()
+        self.extra_script_list.setMaximumHeight(80)
+        script_layout.addWidget(self.extra_script_list)
+        extra_hint = QLabel("每个入口生成一个可执行文件，公共模块和二进制只分析、存储一次（始终使用目录模式）")
+        extra_hint.setStyleSheet("color: #6c757d; font-size: 11px;")
+        extra_hint.setWordWrap(True)
+        script_layout.addWidget(extra_hint)
 
         # 生成模式
         mode_group = QGroupBox("🏗️ 生成模式")
@@ -270,8 +5242,34 @@ class PyInstallerGUI(QMainWindow):
         basic_options_layout.addWidget(self.noconfirm_check)
         basic_options_layout.addWidget(self.uac_check)
         
+        # 构建方案
+        profile_group = QGroupBox("🧩 构建方案")
+        profile_layout = QVBoxLayout(profile_group)
+        
+        profile_controls = QHBoxLayout()
+        self.profile_combo = QComboBox()
+        self.profile_combo.setToolTip("方案叠加在当前配置之上，并使用独立的输出、工作和缓存目录")
+        self.profile_combo.currentIndexChanged.connect(self.on_profile_changed)
+        save_profile_btn = QPushButton("💾 另存为方案")
+        save_profile_btn.setToolTip("将当前的打包模式、UPX、符号表、优化等选项保存为方案")
+        save_profile_btn.clicked.connect(self.save_profile)
+        delete_profile_btn = QPushButton("🗑️ 删除方案")
+        delete_profile_btn.clicked.connect(self.delete_profile)
+        profile_controls.addWidget(self.profile_combo, 1)
+        profile_controls.addWidget(save_profile_btn)
+        profile_controls.addWidget(delete_profile_btn)
+        
+        self.profile_label = QLabel()
+        self.profile_label.setWordWrap(True)
+        self.profile_label.setStyleSheet("color: #6c757d;")
+        
+        profile_layout.addLayout(profile_controls)
+        profile_layout.addWidget(self.profile_label)
+        self.refresh_profile_combo()
+        
         # 添加到布局
         layout.addWidget(script_group)
+        layout.addWidget(profile_group)
         layout.addWidget(mode_group)
         layout.addWidget(window_group)
         layout.addWidget(icon_group)
@@ -363,6 +5361,9 @@ class PyInstallerGUI(QMainWindow):
         
         self.hidden_list = QListWidget()
         self.hidden_list.setMaximumHeight(120)
+        self.hidden_list.setToolTip("每个条目后显示其单独带来的体积（根据最近一次构建的依赖图计算）")
+        self.hidden_list.model().rowsInserted.connect(self.schedule_import_costs)
+        self.hidden_list.model().rowsRemoved.connect(self.schedule_import_costs)
         
         remove_hidden_btn = QPushButton("删除选中")
         remove_hidden_btn.clicked.connect(self.remove_hidden_import)
@@ -376,13 +5377,20 @@ class PyInstallerGUI(QMainWindow):
         collect_layout = QVBoxLayout(collect_group)
         
         self.collect_edit = QLineEdit()
-        self.collect_edit.setPlaceholderText("收集所有子模块，如: PIL")
+        self.collect_edit.setPlaceholderText("收集所有子模块，多个用逗号分隔，如: PIL, http")
         # 启用拖拽（文本拖拽）
         self.collect_edit.setAcceptDrops(True)
         self.collect_edit.dragEnterEvent = self.text_drag_enter_event
         self.collect_edit.dropEvent = self.text_drop_event
         
+        self.collect_edit.textChanged.connect(self.schedule_import_costs)
+        
+        self.collect_cost_label = QLabel()
+        self.collect_cost_label.setWordWrap(True)
+        self.collect_cost_label.setStyleSheet("color: #6c757d;")
+        
         collect_layout.addWidget(self.collect_edit)
+        collect_layout.addWidget(self.collect_cost_label)
         
         # 排除模块
         exclude_group = QGroupBox("❌ 排除模块")
@@ -408,15 +5416,63 @@ class PyInstallerGUI(QMainWindow):
         remove_exclude_btn = QPushButton("删除选中")
         remove_exclude_btn.clicked.connect(self.remove_exclude_module)
         
+        graph_btn = QPushButton("🔍 依赖关系浏览")
+        graph_btn.setToolTip("根据最近一次构建的分析结果，查看模块被谁导入以及排除后可减少的体积")
+        graph_btn.clicked.connect(self.show_dependency_graph)
+        
+        exclude_buttons = QHBoxLayout()
+        exclude_buttons.addWidget(remove_exclude_btn)
+        exclude_buttons.addWidget(graph_btn)
+        
         exclude_layout.addLayout(exclude_controls)
         exclude_layout.addWidget(self.exclude_list)
-        exclude_layout.addWidget(remove_exclude_btn)
+        exclude_layout.addLayout(exclude_buttons)
+        
+        # 本地钩子
+        hooks_group = QGroupBox("🪝 本地钩子")
+        hooks_layout = QVBoxLayout(hooks_group)
+        
+        self.hooks_check = QCheckBox("构建时使用本地钩子目录（--additional-hooks-dir）")
+        self.hooks_check.setChecked(True)
+        self.hooks_check.setToolTip("本地钩子优先于 PyInstaller 自带的同名钩子，可限制只收集实际用到的后端和插件")
+        
+        hooks_dir_layout = QHBoxLayout()
+        self.hooks_dir_edit = QLineEdit()
+        self.hooks_dir_edit.setPlaceholderText(f"默认: 项目目录/{DEFAULT_HOOKS_DIR_NAME}")
+        self.hooks_dir_edit.editingFinished.connect(self.refresh_hook_list)
+        hooks_browse_btn = QPushButton("浏览")
+        hooks_browse_btn.clicked.connect(self.browse_hooks_dir)
+        hooks_dir_layout.addWidget(self.hooks_dir_edit)
+        hooks_dir_layout.addWidget(hooks_browse_btn)
+        
+        self.hook_list = QListWidget()
+        self.hook_list.setMaximumHeight(100)
+        self.hook_list.itemDoubleClicked.connect(self.open_hook_file)
+        self.hook_list.setToolTip("双击用系统默认程序打开")
+        
+        add_hook_btn = QPushButton("从模板添加...")
+        add_hook_btn.clicked.connect(self.add_hook_from_template)
+        remove_hook_btn = QPushButton("删除选中")
+        remove_hook_btn.clicked.connect(self.remove_hook_file)
+        compare_hooks_btn = QPushButton("📏 与自带钩子对比体积")
+        compare_hooks_btn.setToolTip("分别使用本地钩子和自带钩子构建到临时目录，比较产物体积")
+        compare_hooks_btn.clicked.connect(self.compare_hook_sizes)
+        hook_buttons = QHBoxLayout()
+        hook_buttons.addWidget(add_hook_btn)
+        hook_buttons.addWidget(remove_hook_btn)
+        hook_buttons.addWidget(compare_hooks_btn)
+        
+        hooks_layout.addWidget(self.hooks_check)
+        hooks_layout.addLayout(hooks_dir_layout)
+        hooks_layout.addWidget(self.hook_list)
+        hooks_layout.addLayout(hook_buttons)
         
         # 添加到布局
         layout.addWidget(common_group)
         layout.addWidget(hidden_group)
         layout.addWidget(collect_group)
         layout.addWidget(exclude_group)
+        layout.addWidget(hooks_group)
         layout.addStretch()
         
         return widget
@@ -437,12 +5493,20 @@ class PyInstallerGUI(QMainWindow):
         add_data_btn.clicked.connect(self.add_data_file)
         add_data_dir_btn = QPushButton("添加目录")
         add_data_dir_btn.clicked.connect(self.add_data_directory)
+        add_data_glob_btn = QPushButton("添加匹配模式")
+        add_data_glob_btn.setToolTip("如 assets/**/*.png，构建时展开为匹配的文件，目录内容变化后无需重新添加")
+        add_data_glob_btn.clicked.connect(lambda: self.add_glob_entry("data"))
         remove_data_btn = QPushButton("删除选中")
         remove_data_btn.clicked.connect(self.remove_data_file)
+        sidecar_toggle_btn = QPushButton("🗃️ 外部数据包")
+        sidecar_toggle_btn.setToolTip("将选中条目移入/移出外部数据包（不再随单文件程序每次启动解压）")
+        sidecar_toggle_btn.clicked.connect(self.toggle_sidecar_data_file)
         
         data_controls.addWidget(add_data_btn)
         data_controls.addWidget(add_data_dir_btn)
+        data_controls.addWidget(add_data_glob_btn)
         data_controls.addWidget(remove_data_btn)
+        data_controls.addWidget(sidecar_toggle_btn)
         data_controls.addStretch()
         
         self.data_list = QListWidget()
@@ -479,11 +5543,15 @@ class PyInstallerGUI(QMainWindow):
         add_binary_btn.clicked.connect(self.add_binary_file)
         add_binary_dir_btn = QPushButton("添加目录")
         add_binary_dir_btn.clicked.connect(self.add_binary_directory)
+        add_binary_glob_btn = QPushButton("添加匹配模式")
+        add_binary_glob_btn.setToolTip("如 libs/**/*.dll，构建时展开为匹配的文件，目录内容变化后无需重新添加")
+        add_binary_glob_btn.clicked.connect(lambda: self.add_glob_entry("binary"))
         remove_binary_btn = QPushButton("删除选中")
         remove_binary_btn.clicked.connect(self.remove_binary_file)
         
         binary_controls.addWidget(add_binary_btn)
         binary_controls.addWidget(add_binary_dir_btn)
+        binary_controls.addWidget(add_binary_glob_btn)
         binary_controls.addWidget(remove_binary_btn)
         binary_controls.addStretch()
         
@@ -511,8 +5579,36 @@ class PyInstallerGUI(QMainWindow):
         binary_drop_label.dropEvent = self.binary_drop_event
         binary_layout.addWidget(binary_drop_label)
         
+        # 外部数据包区域
+        sidecar_group = QGroupBox("🗃️ 外部数据包")
+        sidecar_layout = QVBoxLayout(sidecar_group)
+        
+        sidecar_hint = QLabel("标记为外部数据包的数据文件不会通过 --add-data 打包，而是写入可执行文件旁的未压缩索引包，"
+                              "运行时通过 sidecar_pack 模块内存映射读取，避免单文件模式每次启动解压。")
+        sidecar_hint.setWordWrap(True)
+        sidecar_hint.setStyleSheet("color: #6c757d; font-size: 12px;")
+        
+        self.sidecar_name_edit = QLineEdit()
+        self.sidecar_name_edit.setPlaceholderText("数据包文件名（默认: 程序名称.pak）")
+        
+        sidecar_controls = QHBoxLayout()
+        build_pack_btn = QPushButton("生成数据包")
+        build_pack_btn.clicked.connect(self.build_sidecar_pack)
+        export_runtime_btn = QPushButton("导出运行时模块")
+        export_runtime_btn.setToolTip("将 sidecar_pack.py 复制到脚本所在目录，供程序导入")
+        export_runtime_btn.clicked.connect(self.export_sidecar_runtime)
+        
+        sidecar_controls.addWidget(build_pack_btn)
+        sidecar_controls.addWidget(export_runtime_btn)
+        sidecar_controls.addStretch()
+        
+        sidecar_layout.addWidget(sidecar_hint)
+        sidecar_layout.addWidget(self.sidecar_name_edit)
+        sidecar_layout.addLayout(sidecar_controls)
+        
         layout.addWidget(data_group)
         layout.addWidget(binary_group)
+        layout.addWidget(sidecar_group)
         layout.addStretch()
         
         return widget
@@ -536,6 +5632,7 @@ class PyInstallerGUI(QMainWindow):
         
         self.upx_exclude_edit = QLineEdit()
         self.upx_exclude_edit.setPlaceholderText("排除模块，如: numpy,scipy")
+        self.upx_exclude_edit.setToolTip("指定不使用UPX压缩的模块，用逗号分隔")
         upx_exclude_layout = QHBoxLayout()
         upx_exclude_layout.addWidget(QLabel("UPX排除模块:"))
         upx_exclude_layout.addWidget(self.upx_exclude_edit)
@@ -559,24 +5656,35 @@ class PyInstallerGUI(QMainWindow):
         
         debug_layout.addWidget(log_widget)
         
-        # 优化选项
-        optimization_group = QGroupBox("🔧 优化选项")
-        optimization_layout = QVBoxLayout(optimization_group)
+        # 字节码优化级别
+        optimize_widget = QWidget()
+        optimize_layout = QHBoxLayout(optimize_widget)
+        optimize_layout.setContentsMargins(0, 0, 0, 0)
         
-        self.strip_check = QCheckBox("移除符号表 (--strip) [Linux/macOS]")
-        self.strip_check.setToolTip("移除可执行文件中的符号表，减小文件大小")
+        self.optimize_combo = QComboBox()
+        self.optimize_combo.addItem("默认（与当前解释器相同）", -1)
+        self.optimize_combo.addItem("0 - 不优化", 0)
+        self.optimize_combo.addItem("1 - 移除 assert (-O)", 1)
+        self.optimize_combo.addItem("2 - 移除 assert 和文档字符串 (-OO)", 2)
+        self.optimize_combo.setToolTip("--optimize：收集的模块按此级别编译，文档字符串较多的大型代码库可明显减小体积和反序列化时间")
+        self.optimize_combo.currentIndexChanged.connect(self.check_optimize_hazards)
         
-        optimization_layout.addWidget(self.strip_check)
+        measure_optimize_btn = QPushButton("📏 测量各级别效果")
+        measure_optimize_btn.setToolTip("以级别 0、1、2 各构建一次，比较 PYZ 体积、产物体积和启动时间")
+        measure_optimize_btn.clicked.connect(self.measure_optimize_levels)
         
-        # UPX排除模块
-        upx_exclude_layout = QHBoxLayout()
-        upx_exclude_layout.addWidget(QLabel("UPX排除模块:"))
-        self.upx_exclude_edit = QLineEdit()
-        self.upx_exclude_edit.setPlaceholderText("排除模块，如: numpy,scipy")
-        self.upx_exclude_edit.setToolTip("指定不使用UPX压缩的模块，用逗号分隔")
-        upx_exclude_layout.addWidget(self.upx_exclude_edit)
+        optimize_layout.addWidget(QLabel("字节码优化:"))
+        optimize_layout.addWidget(self.optimize_combo)
+        optimize_layout.addWidget(measure_optimize_btn)
+        optimize_layout.addStretch()
         
-        optimization_layout.addLayout(upx_exclude_layout)
+        self.optimize_warning_label = QLabel()
+        self.optimize_warning_label.setWordWrap(True)
+        self.optimize_warning_label.setStyleSheet("color: #b35900;")
+        self.optimize_warning_label.hide()
+        
+        debug_layout.addWidget(optimize_widget)
+        debug_layout.addWidget(self.optimize_warning_label)
         
         # 其他选项
         other_group = QGroupBox("🔐 其他选项")
@@ -608,11 +5716,448 @@ class PyInstallerGUI(QMainWindow):
         splash_layout.addWidget(self.splash_edit)
         splash_layout.addWidget(splash_browse_btn)
         
+        # 启动画面优化
+        splash_optimize_widget = QWidget()
+        splash_optimize_layout = QHBoxLayout(splash_optimize_widget)
+        splash_optimize_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.splash_optimize_check = QCheckBox("缩放并压缩到")
+        self.splash_optimize_check.setToolTip("引导程序需要在启动程序前解包并解码启动画面，过大的图片会推迟显示")
+        self.splash_width_spin = QSpinBox()
+        self.splash_width_spin.setRange(16, 8000)
+        self.splash_width_spin.setValue(600)
+        self.splash_height_spin = QSpinBox()
+        self.splash_height_spin.setRange(16, 8000)
+        self.splash_height_spin.setValue(400)
+        self.splash_colors_spin = QSpinBox()
+        self.splash_colors_spin.setRange(0, 256)
+        self.splash_colors_spin.setValue(256)
+        self.splash_colors_spin.setSpecialValueText("真彩色")
+        self.splash_colors_spin.setSuffix(" 色")
+        
+        splash_preview_btn = QPushButton("👁️ 预览")
+        splash_preview_btn.clicked.connect(self.preview_splash)
+        splash_measure_btn = QPushButton("⏱️ 测量显示时间")
+        splash_measure_btn.setToolTip("启动最近一次构建的程序，测量启动画面出现所需的时间")
+        splash_measure_btn.clicked.connect(self.measure_splash_time)
+        
+        splash_optimize_layout.addWidget(self.splash_optimize_check)
+        splash_optimize_layout.addWidget(self.splash_width_spin)
+        splash_optimize_layout.addWidget(QLabel("×"))
+        splash_optimize_layout.addWidget(self.splash_height_spin)
+        splash_optimize_layout.addWidget(self.splash_colors_spin)
+        splash_optimize_layout.addWidget(splash_preview_btn)
+        splash_optimize_layout.addWidget(splash_measure_btn)
+        splash_optimize_layout.addStretch()
+        
+        # 可复现构建
+        reproducible_widget = QWidget()
+        reproducible_layout = QHBoxLayout(reproducible_widget)
+        reproducible_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.reproducible_check = QCheckBox("固定时间戳和哈希种子，统一产物文件时间")
+        self.reproducible_check.setToolTip(
+            "设置 SOURCE_DATE_EPOCH 和 PYTHONHASHSEED=0，相同输入生成逐字节相同的产物，便于缓存和二进制差异比较"
+        )
+        self.source_date_epoch_spin = QSpinBox()
+        self.source_date_epoch_spin.setRange(0, 2 ** 31 - 1)
+        self.source_date_epoch_spin.setSpecialValueText("Git 提交时间")
+        self.source_date_epoch_spin.setToolTip("SOURCE_DATE_EPOCH（秒），0 表示使用项目最近一次 Git 提交时间")
+        reproducible_verify_btn = QPushButton("🔁 验证（构建两次）")
+        reproducible_verify_btn.setToolTip("以可复现模式在临时目录中构建两次，逐个文件比较产物")
+        reproducible_verify_btn.clicked.connect(self.verify_reproducible_build)
+        
+        reproducible_layout.addWidget(self.reproducible_check)
+        reproducible_layout.addWidget(QLabel("时间戳:"))
+        reproducible_layout.addWidget(self.source_date_epoch_spin)
+        reproducible_layout.addWidget(reproducible_verify_btn)
+        reproducible_layout.addStretch()
+        
         other_layout.addRow("加密密钥:", self.key_edit)
         other_layout.addRow("启动画面:", splash_widget)
+        other_layout.addRow("画面优化:", splash_optimize_widget)
+        other_layout.addRow("可复现构建:", reproducible_widget)
+        
+        # 内存盘构建
+        ramdisk_group = QGroupBox("⚡ 内存盘构建")
+        ramdisk_layout = QFormLayout(ramdisk_group)
+        
+        self.ramdisk_work_check = QCheckBox("将工作目录（--workpath）放在内存盘上")
+        self.ramdisk_work_check.setToolTip(
+            "分析和组装 PKG 时会读写大量小文件，工作目录在网络盘上时构建受 I/O 限制。\n"
+            "内存盘空间不足时自动回退到磁盘；构建后将工作目录同步回磁盘，重启后仍能使用预热缓存"
+        )
+        self.ramdisk_dist_check = QCheckBox("同时在内存盘上暂存输出，构建成功后移到输出目录")
+        ramdisk_dir_widget = QWidget()
+        ramdisk_dir_layout = QHBoxLayout(ramdisk_dir_widget)
+        ramdisk_dir_layout.setContentsMargins(0, 0, 0, 0)
+        self.ramdisk_dir_edit = QLineEdit()
+        self.ramdisk_dir_edit.setPlaceholderText(default_ramdisk_dir() or "内存盘目录，如 ImDisk 创建的 R:\\")
+        ramdisk_dir_btn = QPushButton("浏览")
+        ramdisk_dir_btn.clicked.connect(self.browse_ramdisk_dir)
+        ramdisk_dir_layout.addWidget(self.ramdisk_dir_edit)
+        ramdisk_dir_layout.addWidget(ramdisk_dir_btn)
+        
+        ramdisk_layout.addRow(self.ramdisk_work_check)
+        ramdisk_layout.addRow(self.ramdisk_dist_check)
+        ramdisk_layout.addRow("内存盘目录:", ramdisk_dir_widget)
+        
+        # 常驻构建进程
+        daemon_group = QGroupBox("🔥 常驻构建进程")
+        daemon_layout = QFormLayout(daemon_group)
+        
+        self.build_daemon_check = QCheckBox("通过常驻构建进程执行构建（保持 PyInstaller 已导入并缓存基础依赖图）")
+        self.build_daemon_check.setToolTip(
+            "每次构建 fork 一个子进程执行，构建之间互不影响；安装或升级了包等 Python 环境变化时自动重启。\n"
+            "空闲一小时后自动退出"
+        )
+        self.daemon_status_label = QLabel()
+        daemon_buttons = QHBoxLayout()
+        daemon_refresh_btn = QPushButton("刷新状态")
+        daemon_refresh_btn.clicked.connect(self.refresh_daemon_status)
+        daemon_stop_btn = QPushButton("结束常驻进程")
+        daemon_stop_btn.clicked.connect(self.stop_build_daemon)
+        daemon_buttons.addWidget(daemon_refresh_btn)
+        daemon_buttons.addWidget(daemon_stop_btn)
+        daemon_buttons.addStretch()
+        
+        daemon_layout.addRow(self.build_daemon_check)
+        daemon_layout.addRow("状态:", self.daemon_status_label)
+        daemon_layout.addRow(daemon_buttons)
+        if not build_daemon.daemon_supported():
+            daemon_group.setEnabled(False)
+            self.daemon_status_label.setText("当前平台不支持（需要 os.fork），构建时直接运行 PyInstaller")
+        
+        # 产物去重
+        dedupe_group = QGroupBox("🔗 重复文件去重（目录模式）")
+        dedupe_layout = QFormLayout(dedupe_group)
+        
+        self.dedupe_check = QCheckBox("构建成功后查找内容相同的文件")
+        self.dedupe_check.setToolTip("Qt、OpenSSL、MKL 等库常以不同文件名或在不同子目录中重复出现")
+        self.dedupe_link_combo = QComboBox()
+        for mode, label in DEDUPE_MODES.items():
+            self.dedupe_link_combo.addItem(label, mode)
+        self.dedupe_link_combo.setToolTip("硬链接对加载器完全透明；符号链接在 Windows 上需要开发者模式或管理员权限")
+        self.dedupe_verify_check = QCheckBox("替换后启动一次程序验证，失败时还原")
+        self.dedupe_verify_check.setChecked(True)
+        self.dedupe_verify_check.setToolTip("使用性能分析页中启动基准测试的程序参数、退出探针和超时")
+        dedupe_btn = QPushButton("处理最近一次构建")
+        dedupe_btn.clicked.connect(self.dedupe_last_build)
+        
+        dedupe_layout.addRow(self.dedupe_check)
+        dedupe_layout.addRow("重复文件:", self.dedupe_link_combo)
+        dedupe_layout.addRow(self.dedupe_verify_check)
+        dedupe_layout.addRow(dedupe_btn)
+        
+        # 单文件解压
+        extract_group = QGroupBox("📤 运行时解压（单文件模式）")
+        extract_layout = QFormLayout(extract_group)
+        
+        runtime_tmpdir_widget = QWidget()
+        runtime_tmpdir_layout = QHBoxLayout(runtime_tmpdir_widget)
+        runtime_tmpdir_layout.setContentsMargins(0, 0, 0, 0)
+        self.runtime_tmpdir_edit = QLineEdit()
+        self.runtime_tmpdir_edit.setPlaceholderText("留空则解压到系统临时目录")
+        self.runtime_tmpdir_edit.setToolTip(
+            "--runtime-tmpdir：每次启动在此目录下创建 _MEIxxxxxx 解压目录，例如放到本地磁盘而不是网络盘或内存不足的 /tmp。\n"
+            "POSIX 上引导程序不展开 ~ 和环境变量"
+        )
+        runtime_tmpdir_btn = QPushButton("浏览")
+        runtime_tmpdir_btn.clicked.connect(self.browse_runtime_tmpdir)
+        runtime_tmpdir_layout.addWidget(self.runtime_tmpdir_edit)
+        runtime_tmpdir_layout.addWidget(runtime_tmpdir_btn)
+        
+        self.bootloader_signals_check = QCheckBox("引导程序忽略信号，不转发给子进程 (--bootloader-ignore-signals)")
+        self.bootloader_signals_check.setToolTip("由进程管理器同时向引导程序和子进程发送信号时使用，避免子进程收到两次")
+        self.extract_bench_check = QCheckBox("构建成功后测量每次启动的解压耗时和写入量")
+        self.extract_bench_check.setToolTip("启动次数和超时与性能分析页的启动基准测试相同，需要 psutil")
+        extract_btn = QPushButton("测量最近一次构建")
+        extract_btn.clicked.connect(self.extraction_benchmark_last_build)
+        
+        extract_layout.addRow("解压目录:", runtime_tmpdir_widget)
+        extract_layout.addRow(self.bootloader_signals_check)
+        extract_layout.addRow(self.extract_bench_check)
+        extract_layout.addRow(extract_btn)
+        if psutil is None:
+            self.extract_bench_check.setEnabled(False)
+            extract_btn.setEnabled(False)
+            extract_layout.addRow(QLabel("解压基准测试需要安装 psutil: pip install psutil"))
+        
+        # 打包归档
+        archive_group = QGroupBox("🗜️ 打包归档")
+        archive_layout = QFormLayout(archive_group)
+        
+        self.archive_check = QCheckBox("构建成功后将产物打包为归档（多线程压缩）")
+        self.archive_check.setToolTip("图片、.zip、.pyz 等已压缩的文件原样存储，归档直接流式写入磁盘")
+        self.archive_format_combo = QComboBox()
+        for fmt, label in ARCHIVE_FORMATS.items():
+            self.archive_format_combo.addItem(label, fmt)
+        if zstandard is None:
+            index = self.archive_format_combo.findData("tar.zst")
+            self.archive_format_combo.setItemText(index, f"{ARCHIVE_FORMATS['tar.zst']}  需要安装 zstandard: pip install zstandard")
+            self.archive_format_combo.model().item(index).setEnabled(False)
+        self.archive_level_spin = QSpinBox()
+        self.archive_level_spin.setRange(1, 9)
+        self.archive_level_spin.setValue(6)
+        self.archive_level_spin.setToolTip("1 最快，9 体积最小")
+        archive_btn = QPushButton("打包最近一次构建")
+        archive_btn.clicked.connect(self.archive_last_build)
+        
+        archive_layout.addRow(self.archive_check)
+        archive_layout.addRow("格式:", self.archive_format_combo)
+        archive_layout.addRow("压缩级别:", self.archive_level_spin)
+        archive_layout.addRow(archive_btn)
+        
+        # 增量更新包
+        patch_group = QGroupBox("📦 增量更新包")
+        patch_layout = QFormLayout(patch_group)
+        
+        self.release_combo = QComboBox()
+        self.release_combo.setToolTip("作为旧版本的发布快照或目录")
+        release_browse_btn = QPushButton("选择目录...")
+        release_browse_btn.clicked.connect(self.browse_release_base)
+        release_base_layout = QHBoxLayout()
+        release_base_layout.addWidget(self.release_combo, 1)
+        release_base_layout.addWidget(release_browse_btn)
+        
+        save_release_btn = QPushButton("💾 保存最近一次构建为发布版本")
+        save_release_btn.setToolTip("保存产物快照（尽量使用硬链接），之后的构建可以与之比较生成增量包")
+        save_release_btn.clicked.connect(self.save_release_snapshot)
+        create_patch_btn = QPushButton("📦 生成增量包")
+        create_patch_btn.setToolTip("比较最近一次构建与所选旧版本，只打包变化的文件和二进制差异")
+        create_patch_btn.clicked.connect(self.create_patch_package)
+        patch_buttons_layout = QHBoxLayout()
+        patch_buttons_layout.addWidget(save_release_btn)
+        patch_buttons_layout.addWidget(create_patch_btn)
+        patch_buttons_layout.addStretch()
+        
+        patch_layout.addRow("旧版本:", release_base_layout)
+        patch_layout.addRow(patch_buttons_layout)
+        patch_layout.addRow(QLabel("目标机器上运行 python 更新包 安装目录 即可应用（也可在程序中使用 runtime/apply_patch.py）"))
         
         layout.addWidget(debug_group)
         layout.addWidget(other_group)
+        layout.addWidget(daemon_group)
+        layout.addWidget(ramdisk_group)
+        layout.addWidget(dedupe_group)
+        layout.addWidget(extract_group)
+        layout.addWidget(archive_group)
+        layout.addWidget(patch_group)
+        layout.addStretch()
+        
+        return widget
+    
+    def create_performance_tab(self):
+        """创建性能分析标签页"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setSpacing(15)
+        
+        # 启动基准测试
+        bench_group = QGroupBox("⏱️ 启动基准测试")
+        bench_layout = QFormLayout(bench_group)
+        
+        self.bench_check = QCheckBox("构建成功后自动测量启动时间")
+        
+        self.bench_runs_spin = QSpinBox()
+        self.bench_runs_spin.setRange(1, 50)
+        self.bench_runs_spin.setValue(5)
+        
+        self.bench_args_edit = QLineEdit()
+        self.bench_args_edit.setPlaceholderText("传给程序的参数，如: --version")
+        
+        self.bench_marker_edit = QLineEdit()
+        self.bench_marker_edit.setPlaceholderText("输出中出现此文本即视为启动完成（留空则等待进程退出）")
+        self.bench_marker_edit.setToolTip("窗口程序不会自行退出，请在启动完成时输出标记文本，或传入让程序立即退出的参数")
+        
+        self.bench_timeout_spin = QSpinBox()
+        self.bench_timeout_spin.setRange(1, 3600)
+        self.bench_timeout_spin.setValue(60)
+        self.bench_timeout_spin.setSuffix(" s")
+        
+        bench_btn = QPushButton("测量最近一次构建")
+        bench_btn.clicked.connect(self.benchmark_last_build)
+        
+        bench_layout.addRow(self.bench_check)
+        bench_layout.addRow("启动次数:", self.bench_runs_spin)
+        bench_layout.addRow("程序参数:", self.bench_args_edit)
+        bench_layout.addRow("退出探针:", self.bench_marker_edit)
+        bench_layout.addRow("超时:", self.bench_timeout_spin)
+        bench_layout.addRow(bench_btn)
+        
+        # 内存基准测试
+        memory_group = QGroupBox("🧠 启动内存基准测试")
+        memory_layout = QFormLayout(memory_group)
+        
+        self.memory_bench_check = QCheckBox("构建成功后自动测量启动内存峰值（RSS/PSS）")
+        self.memory_trace_check = QCheckBox("注入运行时钩子，按导入的模块归因内存增长（仅用于测试构建）")
+        self.memory_trace_check.setToolTip("通过 --runtime-hook 注入，只在基准测试设置环境变量时生效")
+        memory_btn = QPushButton("测量最近一次构建")
+        memory_btn.clicked.connect(self.memory_benchmark_last_build)
+        
+        memory_layout.addRow(self.memory_bench_check)
+        memory_layout.addRow(self.memory_trace_check)
+        memory_layout.addRow(QLabel("启动次数、程序参数、退出探针和超时与启动基准测试相同"))
+        memory_layout.addRow(memory_btn)
+        if psutil is None:
+            memory_group.setEnabled(False)
+            memory_layout.addRow(QLabel("需要安装 psutil: pip install psutil"))
+        
+        # 冻结程序导入计时
+        import_group = QGroupBox("⏱️ 模块导入耗时")
+        import_layout = QFormLayout(import_group)
+        
+        self.import_trace_check = QCheckBox("注入运行时钩子，记录冻结程序中每个模块的导入耗时和体积（仅用于测试构建）")
+        self.import_trace_check.setToolTip("通过 --runtime-hook 注入，只在测量时设置环境变量才生效；发布构建请关闭")
+        import_btn = QPushButton("测量最近一次构建的导入耗时")
+        import_btn.clicked.connect(self.import_times_last_build)
+        
+        import_layout.addRow(self.import_trace_check)
+        import_layout.addRow(QLabel("程序参数、退出探针和超时与启动基准测试相同"))
+        import_layout.addRow(import_btn)
+        
+        # 性能预算
+        budget_group = QGroupBox("🚦 性能预算")
+        budget_layout = QFormLayout(budget_group)
+        
+        self.gate_check = QCheckBox("构建后检查预算（超出时判定为失败）")
+        
+        self.budget_size_spin = QDoubleSpinBox()
+        self.budget_size_spin.setRange(0, 1000000)
+        self.budget_size_spin.setSuffix(" MB")
+        self.budget_size_spin.setSpecialValueText("不限制")
+        
+        self.budget_files_spin = QSpinBox()
+        self.budget_files_spin.setRange(0, 10000000)
+        self.budget_files_spin.setSpecialValueText("不限制")
+        
+        self.budget_duration_spin = QDoubleSpinBox()
+        self.budget_duration_spin.setRange(0, 100000)
+        self.budget_duration_spin.setSuffix(" s")
+        self.budget_duration_spin.setSpecialValueText("不限制")
+        
+        self.budget_startup_spin = QDoubleSpinBox()
+        self.budget_startup_spin.setRange(0, 1000000)
+        self.budget_startup_spin.setSuffix(" ms")
+        self.budget_startup_spin.setSpecialValueText("不限制")
+        self.budget_startup_spin.setToolTip("设置后每次构建都会执行启动基准测试")
+        
+        self.budget_baseline_check = QCheckBox("与基线比较（未设置基线时使用上一次成功的构建）")
+        self.budget_baseline_check.setChecked(True)
+        
+        self.budget_tolerance_spin = QDoubleSpinBox()
+        self.budget_tolerance_spin.setRange(0, 1000)
+        self.budget_tolerance_spin.setValue(5)
+        self.budget_tolerance_spin.setSuffix(" %")
+        
+        budget_buttons = QHBoxLayout()
+        baseline_btn = QPushButton("将最近一次构建设为基线")
+        baseline_btn.clicked.connect(self.set_baseline_from_last_build)
+        check_btn = QPushButton("检查最近一次构建")
+        check_btn.clicked.connect(self.check_last_build_budget)
+        budget_buttons.addWidget(baseline_btn)
+        budget_buttons.addWidget(check_btn)
+        budget_buttons.addStretch()
+        
+        budget_layout.addRow(self.gate_check)
+        budget_layout.addRow("产物体积上限:", self.budget_size_spin)
+        budget_layout.addRow("文件数上限:", self.budget_files_spin)
+        budget_layout.addRow("构建耗时上限:", self.budget_duration_spin)
+        budget_layout.addRow("启动中位数上限:", self.budget_startup_spin)
+        budget_layout.addRow(self.budget_baseline_check)
+        budget_layout.addRow("基线容差:", self.budget_tolerance_spin)
+        budget_layout.addRow(budget_buttons)
+        
+        # 资源监视
+        monitor_group = QGroupBox("📈 构建资源监视")
+        monitor_layout = QFormLayout(monitor_group)
+        
+        self.monitor_check = QCheckBox("构建时采样 CPU、内存和 I/O")
+        self.monitor_check.setChecked(True)
+        
+        self.monitor_interval_spin = QSpinBox()
+        self.monitor_interval_spin.setRange(100, 10000)
+        self.monitor_interval_spin.setSingleStep(100)
+        self.monitor_interval_spin.setValue(500)
+        self.monitor_interval_spin.setSuffix(" ms")
+        
+        self.memory_limit_spin = QSpinBox()
+        self.memory_limit_spin.setRange(0, 1024 * 1024)
+        self.memory_limit_spin.setSingleStep(512)
+        self.memory_limit_spin.setSuffix(" MB")
+        self.memory_limit_spin.setSpecialValueText("不限制")
+        self.memory_limit_spin.setToolTip("构建进程树的常驻内存超过此值时中止构建")
+        
+        monitor_layout.addRow(self.monitor_check)
+        monitor_layout.addRow("采样间隔:", self.monitor_interval_spin)
+        monitor_layout.addRow("内存上限:", self.memory_limit_spin)
+        if psutil is None:
+            monitor_group.setEnabled(False)
+            monitor_layout.addRow(QLabel("需要安装 psutil: pip install psutil"))
+        
+        layout.addWidget(bench_group)
+        layout.addWidget(memory_group)
+        layout.addWidget(import_group)
+        layout.addWidget(budget_group)
+        layout.addWidget(monitor_group)
+        layout.addStretch()
+        
+        return widget
+    
+    def create_warnings_tab(self):
+        """创建构建警告标签页"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setSpacing(15)
+        
+        warnings_group = QGroupBox("⚠️ 缺失模块（来自 warn/xref 文件）")
+        warnings_layout = QVBoxLayout(warnings_group)
+        
+        self.warnings_summary_label = QLabel("尚未读取构建警告，构建完成后自动更新")
+        self.warnings_summary_label.setWordWrap(True)
+        
+        filter_layout = QHBoxLayout()
+        self.warnings_group_combo = QComboBox()
+        self.warnings_group_combo.addItems(["按缺失模块", "按导入方模块"])
+        self.warnings_group_combo.currentIndexChanged.connect(self.populate_warnings_tree)
+        self.warnings_category_combo = QComboBox()
+        self.warnings_category_combo.addItem("全部类别", "")
+        for key, label in MISSING_CATEGORIES.items():
+            self.warnings_category_combo.addItem(label, key)
+        self.warnings_category_combo.setCurrentIndex(1)
+        self.warnings_category_combo.currentIndexChanged.connect(self.populate_warnings_tree)
+        refresh_btn = QPushButton("🔄 重新读取")
+        refresh_btn.clicked.connect(self.refresh_build_warnings)
+        filter_layout.addWidget(QLabel("分组:"))
+        filter_layout.addWidget(self.warnings_group_combo)
+        filter_layout.addWidget(QLabel("类别:"))
+        filter_layout.addWidget(self.warnings_category_combo)
+        filter_layout.addStretch()
+        filter_layout.addWidget(refresh_btn)
+        
+        self.warnings_tree = QTreeWidget()
+        self.warnings_tree.setHeaderLabels(["模块", "类别", "导入方式", "状态"])
+        self.warnings_tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.warnings_tree.setMinimumHeight(320)
+        self.warnings_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        
+        action_layout = QHBoxLayout()
+        hidden_btn = QPushButton("📦 添加到隐藏导入")
+        hidden_btn.setToolTip("模块已安装但通过动态方式导入时使用")
+        hidden_btn.clicked.connect(self.add_warnings_to_hidden_imports)
+        exclude_btn = QPushButton("❌ 添加到排除模块")
+        exclude_btn.setToolTip("选中导入方模块可直接切断不需要的依赖")
+        exclude_btn.clicked.connect(self.add_warnings_to_excludes)
+        action_layout.addWidget(hidden_btn)
+        action_layout.addWidget(exclude_btn)
+        action_layout.addStretch()
+        
+        warnings_layout.addWidget(self.warnings_summary_label)
+        warnings_layout.addLayout(filter_layout)
+        warnings_layout.addWidget(self.warnings_tree)
+        warnings_layout.addLayout(action_layout)
+        
+        layout.addWidget(warnings_group)
         layout.addStretch()
         
         return widget
@@ -655,11 +6200,61 @@ class PyInstallerGUI(QMainWindow):
         button_layout.addWidget(generate_btn)
         button_layout.addWidget(copy_btn)
         button_layout.addWidget(clear_btn)
-        button_layout.addStretch()
+        
+        # 构建控制
+        build_layout = QHBoxLayout()
+        self.build_btn = QPushButton("▶️ 开始构建")
+        self.build_btn.clicked.connect(self.start_build)
+        self.stop_btn = QPushButton("⏹️ 停止")
+        self.stop_btn.clicked.connect(self.stop_build)
+        self.stop_btn.setEnabled(False)
+        history_btn = QPushButton("📜 构建历史")
+        history_btn.clicked.connect(self.show_build_history)
+        
+        build_layout.addWidget(self.build_btn)
+        build_layout.addWidget(self.stop_btn)
+        build_layout.addWidget(history_btn)
+        
+        # 项目配置文件（也用于命令行无界面构建）
+        config_layout = QHBoxLayout()
+        save_config_btn = QPushButton("💾 保存配置")
+        save_config_btn.clicked.connect(self.save_config_file)
+        load_config_btn = QPushButton("📂 加载配置")
+        load_config_btn.clicked.connect(self.load_config_file)
+        config_layout.addWidget(save_config_btn)
+        config_layout.addWidget(load_config_btn)
+        
+        # 构建前估算
+        self.estimate_label = QLabel("")
+        self.estimate_label.setWordWrap(True)
+        self.estimate_label.setStyleSheet("color: #6c757d; font-size: 12px;")
+        
+        # 构建输出
+        self.build_log_view = BuildLogView()
         
         layout.addWidget(title_label)
         layout.addWidget(self.command_text)
         layout.addLayout(button_layout)
+        # 资源曲线
+        resource_layout = QHBoxLayout()
+        self.resource_label = QLabel("")
+        self.resource_label.setStyleSheet("color: #6c757d; font-size: 12px;")
+        self.resource_metric_combo = QComboBox()
+        self.resource_metric_combo.addItems(["内存", "CPU", "I/O"])
+        self.resource_metric_combo.currentIndexChanged.connect(self.update_resource_chart)
+        resource_layout.addWidget(self.resource_label, 1)
+        resource_layout.addWidget(self.resource_metric_combo)
+        
+        self.resource_chart = TrendChart()
+        self.resource_chart.setMinimumHeight(120)
+        self.resource_chart.setMaximumHeight(160)
+        
+        layout.addWidget(self.estimate_label)
+        layout.addLayout(build_layout)
+        layout.addLayout(config_layout)
+        layout.addLayout(resource_layout)
+        layout.addWidget(self.resource_chart)
+        layout.addWidget(self.build_log_view, 1)
         
         return widget
     
@@ -1036,6 +6631,26 @@ class PyInstallerGUI(QMainWindow):
         if file_path:
             self.script_edit.setText(file_path)
     
+    def add_extra_script(self):
+        """添加其他入口脚本（文件名不能与已有入口重复）"""
+        start_dir = os.path.dirname(os.path.abspath(self.script_edit.text())) if self.script_edit.text().strip() else ""
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "选择入口脚本", start_dir, "Python文件 (*.py);;所有文件 (*.*)"
+        )
+        for file_path in file_paths:
+            stems = [Path(script).stem for script in [self.script_edit.text().strip(), *self.extra_scripts]]
+            if Path(file_path).stem in stems:
+                QMessageBox.warning(self, "警告", f"已有同名入口脚本: {Path(file_path).name}")
+                continue
+            self.extra_scripts.append(file_path)
+            self.extra_script_list.addItem(f"📄 {file_path}")
+    
+    def remove_extra_script(self):
+        current_row = self.extra_script_list.currentRow()
+        if current_row >= 0:
+            self.extra_script_list.takeItem(current_row)
+            del self.extra_scripts[current_row]
+    
     def browse_icon(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "选择图标文件", "", 
@@ -1139,48 +6754,78 @@ class PyInstallerGUI(QMainWindow):
         event.ignore()
     
     def resource_drag_enter_event(self, event: QDragEnterEvent):
-        """资源文件拖拽进入事件处理"""
+        """资源文件拖拽进入事件处理（可同时拖入多个文件或目录）"""
         if event.mimeData().hasUrls():
-            urls = event.mimeData().urls()
-            if len(urls) == 1:  # 只允许拖拽一个文件或目录
-                path = urls[0].toLocalFile()
-                # 接受文件或目录
-                if os.path.exists(path):
-                    event.acceptProposedAction()
-                    return
+            # 只检查是否为本地路径，是否存在留到放置后在后台检查
+            if any(url.isLocalFile() for url in event.mimeData().urls()):
+                event.acceptProposedAction()
+                return
         event.ignore()
     
     def data_drop_event(self, event: QDropEvent):
         """数据文件拖拽放置事件处理"""
-        if event.mimeData().hasUrls():
-            urls = event.mimeData().urls()
-            if len(urls) == 1:
-                path = urls[0].toLocalFile()
-                if os.path.exists(path):
-                    # 自动判断是文件还是目录
-                    if os.path.isfile(path):
-                        self.add_data_file_by_path(path)
-                    elif os.path.isdir(path):
-                        self.add_data_directory_by_path(path)
-                    event.acceptProposedAction()
-                    return
-        event.ignore()
+        self.resource_drop_event(event, self.add_data_file_by_path, self.add_data_directory_by_path, "data")
     
     def binary_drop_event(self, event: QDropEvent):
         """二进制文件拖拽放置事件处理"""
-        if event.mimeData().hasUrls():
-            urls = event.mimeData().urls()
-            if len(urls) == 1:
-                path = urls[0].toLocalFile()
-                if os.path.exists(path):
-                    # 自动判断是文件还是目录
-                    if os.path.isfile(path):
-                        self.add_binary_file_by_path(path)
-                    elif os.path.isdir(path):
-                        self.add_binary_directory_by_path(path)
-                    event.acceptProposedAction()
-                    return
-        event.ignore()
+        self.resource_drop_event(event, self.add_binary_file_by_path, self.add_binary_directory_by_path, "binary")
+    
+    def resource_drop_event(self, event, add_file, add_directory, kind):
+        """
+        资源拖放：单个路径逐项设置目标路径，多个路径使用同一规则在后台批量添加
+        
+        Args:
+            add_file, add_directory: 单个文件/目录的添加方法
+            kind: "data" 或 "binary"
+        """
+        if not event.mimeData().hasUrls():
+            event.ignore()
+            return
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if not paths:
+            event.ignore()
+            return
+        event.acceptProposedAction()
+        
+        if len(paths) == 1:
+            # 自动判断是文件还是目录
+            if os.path.isfile(paths[0]):
+                add_file(paths[0])
+            elif os.path.isdir(paths[0]):
+                add_directory(paths[0])
+            return
+        
+        dialog = BatchTargetDialog(paths, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        rule, target, root = dialog.rule()
+        self.run_in_background(
+            plan_resource_entries, paths, rule, target, root,
+            on_done=lambda entries: self.add_resource_entries(entries, kind),
+            on_error=lambda message: self.notify_warning(f"添加资源失败: {message}")
+        )
+    
+    def add_resource_entries(self, entries, kind):
+        """将批量生成的资源条目一次性加入列表"""
+        resource_files, resource_list = (
+            (self.data_files, self.data_list) if kind == "data" else (self.binary_files, self.binary_list)
+        )
+        file_icon = "📄" if kind == "data" else "⚙️"
+        existing = set(resource_files)
+        new_entries = []
+        for entry, is_dir in entries:
+            if entry not in existing:
+                existing.add(entry)
+                new_entries.append((entry, is_dir))
+        if not new_entries:
+            return
+        
+        resource_files.extend(entry for entry, _ in new_entries)
+        resource_list.setUpdatesEnabled(False)
+        resource_list.addItems([
+            f"{'📁' if is_dir else file_icon} {' → '.join(entry.rsplit(';', 1))}" for entry, is_dir in new_entries
+        ])
+        resource_list.setUpdatesEnabled(True)
     
     def text_drop_event(self, event: QDropEvent):
         """文本拖拽放置事件处理"""
@@ -1378,12 +7023,17 @@ class PyInstallerGUI(QMainWindow):
             self.common_modules_combo.setCurrentIndex(0)
     
     def add_exclude_module(self):
-        module = self.exclude_edit.text().strip()
-        if module and module not in self.exclude_modules:
-            self.exclude_modules.append(module)
-            self.exclude_list.addItem(f"❌ {module}")
+        if self.add_exclude_module_by_name(self.exclude_edit.text().strip()):
             self.exclude_edit.clear()
     
+    def add_exclude_module_by_name(self, module):
+        """添加排除模块，已存在时返回 False"""
+        if not module or module in self.exclude_modules:
+            return False
+        self.exclude_modules.append(module)
+        self.exclude_list.addItem(f"❌ {module}")
+        return True
+    
     def remove_exclude_module(self):
         current_row = self.exclude_list.currentRow()
         if current_row >= 0:
@@ -1467,12 +7117,17 @@ class PyInstallerGUI(QMainWindow):
     
     # 模块管理方法
     def add_hidden_import(self):
-        module = self.hidden_edit.text().strip()
-        if module and module not in self.hidden_imports:
-            self.hidden_imports.append(module)
-            self.hidden_list.addItem(f"📦 {module}")
+        if self.add_hidden_import_by_name(self.hidden_edit.text().strip()):
             self.hidden_edit.clear()
     
+    def add_hidden_import_by_name(self, module):
+        """添加隐藏导入，已存在时返回 False"""
+        if not module or module in self.hidden_imports:
+            return False
+        self.hidden_imports.append(module)
+        self.hidden_list.addItem(f"📦 {module}")
+        return True
+    
     def remove_hidden_import(self):
         current_row = self.hidden_list.currentRow()
         if current_row >= 0:
@@ -1548,135 +7203,356 @@ class PyInstallerGUI(QMainWindow):
                 display_text = f"📁 {folder_path} → {target_path.strip()}"
                 self.data_list.addItem(display_text)
     
+    def add_glob_entry(self, kind):
+        """
+        添加 glob 模式条目（构建时展开为匹配的文件）
+        
+        Args:
+            kind: "data" 或 "binary"
+        """
+        pattern, ok = QInputDialog.getText(
+            self, "添加匹配模式",
+            "请输入 glob 模式（相对路径基于脚本所在目录）:\n\n"
+            "• '**' 匹配任意层目录，'*' 和 '?' 不跨越目录\n"
+            "• 可用 '|' 追加排除模式，如: assets/**/*.png|**/*_draft.png\n"
+            "• 排除模式不含 '/' 时只匹配文件名",
+            text="assets/**/*"
+        )
+        pattern = pattern.strip()
+        if not ok or not pattern:
+            return
+        if not is_glob_entry(f"{pattern};."):
+            QMessageBox.warning(self, "警告", "模式中没有通配符（* ? [...]），请使用添加文件或添加目录！")
+            return
+        
+        target_path, ok = QInputDialog.getText(
+            self, "设置目标路径",
+            f"模式: {pattern}\n\n匹配的文件保持相对于模式中第一个通配符之前目录的结构，放在以下目标路径下:",
+            text="."
+        )
+        if not ok or not target_path.strip():
+            return
+        
+        entry = f"{pattern};{target_path.strip()}"
+        resource_files, resource_list, icon = (
+            (self.data_files, self.data_list, "📄") if kind == "data" else (self.binary_files, self.binary_list, "⚙️")
+        )
+        if entry not in resource_files:
+            resource_files.append(entry)
+            resource_list.addItem(self.create_resource_item(entry, icon))
+            self.schedule_glob_previews()
+    
+    def create_resource_item(self, entry, file_icon):
+        """资源列表条目；glob 条目记录基本文本，匹配预览在后台计算后追加"""
+        source, target = entry.rsplit(";", 1)
+        if is_glob_entry(entry):
+            item = QListWidgetItem(f"🔎 {source} → {target}")
+            item.setData(Qt.ItemDataRole.UserRole, item.text())
+            item.setToolTip("正在统计匹配的文件...")
+            return item
+        return QListWidgetItem(f"{'📁' if os.path.isdir(source) else file_icon} {source} → {target}")
+    
+    def on_config_tab_changed(self, tab):
+        if tab is self.resource_tab:
+            self.schedule_glob_previews()
+        elif tab is self.advanced_tab:
+            self.refresh_release_combo()
+            if build_daemon.daemon_supported():
+                self.refresh_daemon_status()
+        elif tab is self.module_tab:
+            self.refresh_hook_list()
+    
+    def schedule_glob_previews(self):
+        """在后台统计 glob 条目匹配的文件数和总大小（目录和文件未变化时使用缓存）"""
+        config = self.get_config()
+        if not any(is_glob_entry(entry) for entry in config["data_files"] + config["binary_files"]):
+            return
+        self.run_in_background(
+            refresh_resource_globs, config,
+            on_done=self.show_glob_previews,
+            on_error=lambda message: self.append_build_log(f"统计匹配的文件失败: {message}\n")
+        )
+    
+    def show_glob_previews(self, scans):
+        """在 glob 条目后显示匹配的文件数和总大小"""
+        for resource_files, resource_list in ((self.data_files, self.data_list), (self.binary_files, self.binary_list)):
+            for row, entry in enumerate(resource_files):
+                scan = scans.get(entry)
+                if scan is None:
+                    continue
+                item = resource_list.item(row)
+                text = f"{item.data(Qt.ItemDataRole.UserRole)}    [{len(scan['files'])} 个文件，{format_size(scan['size'])}]"
+                if entry in self.sidecar_data_files and resource_files is self.data_files:
+                    text += SIDECAR_ITEM_SUFFIX
+                item.setText(text)
+                if scan["files"]:
+                    item.setToolTip("\n".join(scan["files"][:20]) + ("\n..." if len(scan["files"]) > 20 else ""))
+                else:
+                    item.setToolTip("没有匹配任何文件，构建时将从命令中省略")
+    
     def remove_data_file(self):
         current_row = self.data_list.currentRow()
         if current_row >= 0:
             self.data_list.takeItem(current_row)
-            del self.data_files[current_row]
+            entry = self.data_files.pop(current_row)
+            if entry in self.sidecar_data_files:
+                self.sidecar_data_files.remove(entry)
     
-    # 命令生成和操作
-    def generate_command(self):
-        """生成PyInstaller命令"""
-        if not self.script_edit.text().strip():
-            QMessageBox.warning(self, "警告", "请选择Python脚本文件！")
+    # 外部数据包
+    def toggle_sidecar_data_file(self):
+        """将选中的数据文件移入或移出外部数据包"""
+        current_row = self.data_list.currentRow()
+        if current_row < 0:
+            QMessageBox.warning(self, "警告", "请先选中一个数据文件条目！")
             return
         
-        command_parts = ["pyinstaller"]
-        
-        # 基本模式
-        if self.onefile_radio.isChecked():
-            command_parts.append("-F")
+        entry = self.data_files[current_row]
+        item = self.data_list.item(current_row)
+        if entry in self.sidecar_data_files:
+            self.sidecar_data_files.remove(entry)
+            item.setText(item.text().replace(SIDECAR_ITEM_SUFFIX, ""))
         else:
-            command_parts.append("-D")
-        
-        # 窗口模式
-        if self.windowed_radio.isChecked():
-            command_parts.append("-w")
-        else:
-            command_parts.append("-c")
-        
-        # 图标
-        if self.icon_edit.text().strip():
-            icon_path = self.icon_edit.text()
-            # 确保图标文件存在
-            if os.path.exists(icon_path):
-                # 获取项目根目录
-                project_root = os.path.dirname(os.path.abspath(self.script_edit.text())) if self.script_edit.text().strip() else os.getcwd()
-                
-                # 检查是否存在 icon1.ico（优先使用作为任务栏图标）
-                icon1_path = os.path.join(project_root, 'icon1.ico')
-                if os.path.exists(icon1_path):
-                    # 使用 icon1.ico 作为任务栏图标
-                    icon_path = os.path.abspath(icon1_path)
-                    command_parts.append(f'-i "{icon_path}"')
-                    print(f"使用 icon1.ico 作为任务栏图标: {icon_path}")
-                else:
-                    # 使用用户选择的图标文件
-                    icon_path = os.path.abspath(icon_path)
-                    command_parts.append(f'-i "{icon_path}"')
-                    print(f"使用用户选择的图标: {icon_path}")
-            else:
-                # 如果文件不存在，给出警告但不添加图标参数
-                print(f"警告：图标文件不存在: {icon_path}")
-        
-        # 程序名称
-        if self.name_edit.text().strip():
-            command_parts.append(f'-n "{self.name_edit.text()}"')
-        
-        # 路径选项
-        if self.output_edit.text().strip():
-            command_parts.append(f'--distpath "{self.output_edit.text()}"')
-        
-        if self.work_edit.text().strip():
-            command_parts.append(f'--workpath "{self.work_edit.text()}"')
-        
-        # 搜索路径
-        for path in self.search_paths:
-            command_parts.append(f'-p "{path}"')
-        
-        # 数据文件
-        for data_file in self.data_files:
-            command_parts.append(f'--add-data "{data_file}"')
-        
-        # 二进制文件
-        for binary_file in self.binary_files:
-            command_parts.append(f'--add-binary "{binary_file}"')
-        
-        # 隐藏导入
-        for module in self.hidden_imports:
-            command_parts.append(f'--hidden-import {module}')
-        
-        # 收集模块
-        if self.collect_edit.text().strip():
-            command_parts.append(f'--collect-submodules {self.collect_edit.text()}')
-        
-        # 排除模块
-        for module in self.exclude_modules:
-            command_parts.append(f'--exclude-module {module}')
-        
-        # 调试选项
-        if self.debug_check.isChecked():
-            command_parts.append("--debug")
-        
-        if self.clean_check.isChecked():
-            command_parts.append("--clean")
-        
-        if self.noupx_check.isChecked():
-            command_parts.append("--noupx")
-        
-        if self.noconfirm_check.isChecked():
-            command_parts.append("-y")
-        
-        if self.log_combo.currentText() != "INFO":
-            command_parts.append(f'--log-level {self.log_combo.currentText()}')
-        
-        # 其他选项
-        if self.uac_check.isChecked():
-            command_parts.append("--uac-admin")
+            self.sidecar_data_files.append(entry)
+            item.setText(item.text() + SIDECAR_ITEM_SUFFIX)
+    
+    def build_sidecar_pack(self):
+        """把标记的数据文件写入外部数据包"""
+        if not self.script_edit.text().strip():
+            QMessageBox.warning(self, "警告", "请选择Python脚本文件！")
+            return
+        if not self.sidecar_data_files:
+            QMessageBox.warning(self, "警告", "没有标记为外部数据包的数据文件！")
+            return
         
-        # 优化选项
-        if self.strip_check.isChecked():
-            command_parts.append("--strip")
+        config = self.get_build_config()
+        pack_path = get_sidecar_pack_path(config)
+        try:
+            count, total_size = write_sidecar_pack(self.sidecar_data_files, pack_path, get_project_root(config))
+        except Exception as e:
+            QMessageBox.warning(self, "警告", f"生成数据包失败：{str(e)}")
+            return
         
-        # UPX排除模块
-        upx_exclude_text = self.upx_exclude_edit.text().strip()
-        if upx_exclude_text:
-            modules = [m.strip() for m in upx_exclude_text.split(",") if m.strip()]
-            for module in modules:
-                command_parts.append(f'--upx-exclude "{module}"')
+        QMessageBox.information(
+            self, "成功",
+            f"已写入 {count} 个文件（{format_size(total_size)}）到数据包：\n{pack_path}"
+        )
+    
+    def export_sidecar_runtime(self):
+        """将运行时读取模块复制到脚本所在目录"""
+        if not self.script_edit.text().strip():
+            QMessageBox.warning(self, "警告", "请选择Python脚本文件！")
+            return
         
-        if self.key_edit.text().strip():
-            command_parts.append(f'--key "{self.key_edit.text()}"')
+        source = os.path.join(RUNTIME_DIR, "sidecar_pack.py")
+        target_dir = os.path.dirname(os.path.abspath(self.script_edit.text()))
+        try:
+            shutil.copy2(source, os.path.join(target_dir, "sidecar_pack.py"))
+            QMessageBox.information(self, "成功", f"运行时模块已复制到: {target_dir}")
+        except Exception as e:
+            QMessageBox.warning(self, "警告", f"无法复制运行时模块: {str(e)}")
+    
+    # 配置快照
+    def get_config(self):
+        """获取当前界面配置的快照（可 JSON 序列化）"""
+        return {
+            "script": self.script_edit.text().strip(),
+            "onefile": self.onefile_radio.isChecked(),
+            "windowed": self.windowed_radio.isChecked(),
+            "icon": self.icon_edit.text().strip(),
+            "name": self.name_edit.text().strip(),
+            "output": self.output_edit.text().strip(),
+            "work": self.work_edit.text().strip(),
+            "search_paths": list(self.search_paths),
+            "clean": self.clean_check.isChecked(),
+            "noconfirm": self.noconfirm_check.isChecked(),
+            "uac": self.uac_check.isChecked(),
+            "hidden_imports": list(self.hidden_imports),
+            "collect": self.collect_edit.text().strip(),
+            "exclude_modules": list(self.exclude_modules),
+            "data_files": list(self.data_files),
+            "binary_files": list(self.binary_files),
+            "extra_scripts": list(self.extra_scripts),
+            "sidecar_data_files": list(self.sidecar_data_files),
+            "sidecar_name": self.sidecar_name_edit.text().strip(),
+            "debug": self.debug_check.isChecked(),
+            "noupx": self.noupx_check.isChecked(),
+            "strip": self.strip_check.isChecked(),
+            "upx_exclude": self.upx_exclude_edit.text().strip(),
+            "log_level": self.log_combo.currentText(),
+            "optimize": self.optimize_combo.currentData(),
+            "key": self.key_edit.text().strip(),
+            "splash": self.splash_edit.text().strip(),
+            "splash_optimize": self.splash_optimize_check.isChecked(),
+            "splash_width": self.splash_width_spin.value(),
+            "splash_height": self.splash_height_spin.value(),
+            "splash_colors": self.splash_colors_spin.value(),
+            "bench_after_build": self.bench_check.isChecked(),
+            "bench_runs": self.bench_runs_spin.value(),
+            "bench_args": self.bench_args_edit.text().strip(),
+            "bench_marker": self.bench_marker_edit.text(),
+            "bench_timeout": self.bench_timeout_spin.value(),
+            "memory_bench_after_build": self.memory_bench_check.isChecked(),
+            "build_daemon": self.build_daemon_check.isChecked(),
+            "ramdisk_work": self.ramdisk_work_check.isChecked(),
+            "ramdisk_dist": self.ramdisk_dist_check.isChecked(),
+            "ramdisk_dir": self.ramdisk_dir_edit.text(),
+            "runtime_tmpdir": self.runtime_tmpdir_edit.text(),
+            "bootloader_ignore_signals": self.bootloader_signals_check.isChecked(),
+            "extract_bench_after_build": self.extract_bench_check.isChecked(),
+            "dedupe_after_build": self.dedupe_check.isChecked(),
+            "dedupe_link": self.dedupe_link_combo.currentData(),
+            "dedupe_verify": self.dedupe_verify_check.isChecked(),
+            "archive_after_build": self.archive_check.isChecked(),
+            "archive_format": self.archive_format_combo.currentData(),
+            "archive_level": self.archive_level_spin.value(),
+            "hooks_enabled": self.hooks_check.isChecked(),
+            "hooks_dir": self.hooks_dir_edit.text().strip(),
+            "reproducible": self.reproducible_check.isChecked(),
+            "source_date_epoch": self.source_date_epoch_spin.value(),
+            "memory_trace": self.memory_trace_check.isChecked(),
+            "import_trace": self.import_trace_check.isChecked(),
+            "gate_enabled": self.gate_check.isChecked(),
+            "budget_size_mb": self.budget_size_spin.value(),
+            "budget_files": self.budget_files_spin.value(),
+            "budget_duration": self.budget_duration_spin.value(),
+            "budget_startup_ms": self.budget_startup_spin.value(),
+            "budget_baseline": self.budget_baseline_check.isChecked(),
+            "budget_tolerance": self.budget_tolerance_spin.value(),
+            "monitor_enabled": self.monitor_check.isChecked(),
+            "monitor_interval_ms": self.monitor_interval_spin.value(),
+            "memory_limit_mb": self.memory_limit_spin.value(),
+            "profile": self.profile_combo.currentData() or "",
+        }
+    
+    def get_build_config(self):
+        """当前配置叠加所选构建方案后实际用于构建的配置"""
+        config = resolve_profile(self.get_config(), self.profiles)
+        # 多入口构建共享依赖目录，始终为目录模式
+        if config["extra_scripts"]:
+            config["onefile"] = False
+        return config
+    
+    def apply_config(self, config):
+        """将配置快照恢复到界面控件（缺失的键使用默认值）"""
+        config = {**DEFAULT_CONFIG, **config}
+        
+        self.script_edit.setText(config["script"])
+        self.onefile_radio.setChecked(config["onefile"])
+        self.onedir_radio.setChecked(not config["onefile"])
+        self.windowed_radio.setChecked(config["windowed"])
+        self.console_radio.setChecked(not config["windowed"])
+        self.icon_edit.setText(config["icon"])
+        self.name_edit.setText(config["name"])
+        self.output_edit.setText(config["output"])
+        self.work_edit.setText(config["work"])
+        self.clean_check.setChecked(config["clean"])
+        self.noconfirm_check.setChecked(config["noconfirm"])
+        self.uac_check.setChecked(config["uac"])
+        self.collect_edit.setText(config["collect"])
+        self.sidecar_name_edit.setText(config["sidecar_name"])
+        self.debug_check.setChecked(config["debug"])
+        self.noupx_check.setChecked(config["noupx"])
+        self.strip_check.setChecked(config["strip"])
+        self.upx_exclude_edit.setText(config["upx_exclude"])
+        self.log_combo.setCurrentText(config["log_level"])
+        self.optimize_combo.setCurrentIndex(max(0, self.optimize_combo.findData(config["optimize"])))
+        self.key_edit.setText(config["key"])
+        self.splash_edit.setText(config["splash"])
+        self.splash_optimize_check.setChecked(config["splash_optimize"])
+        self.profile_combo.setCurrentIndex(max(0, self.profile_combo.findData(config["profile"])))
+        self.splash_width_spin.setValue(config["splash_width"])
+        self.splash_height_spin.setValue(config["splash_height"])
+        self.splash_colors_spin.setValue(config["splash_colors"])
+        self.bench_check.setChecked(config["bench_after_build"])
+        self.bench_runs_spin.setValue(config["bench_runs"])
+        self.bench_args_edit.setText(config["bench_args"])
+        self.bench_marker_edit.setText(config["bench_marker"])
+        self.bench_timeout_spin.setValue(config["bench_timeout"])
+        self.memory_bench_check.setChecked(config["memory_bench_after_build"])
+        self.build_daemon_check.setChecked(config["build_daemon"])
+        self.ramdisk_work_check.setChecked(config["ramdisk_work"])
+        self.ramdisk_dist_check.setChecked(config["ramdisk_dist"])
+        self.ramdisk_dir_edit.setText(config["ramdisk_dir"])
+        self.runtime_tmpdir_edit.setText(config["runtime_tmpdir"])
+        self.bootloader_signals_check.setChecked(config["bootloader_ignore_signals"])
+        self.extract_bench_check.setChecked(config["extract_bench_after_build"])
+        self.dedupe_check.setChecked(config["dedupe_after_build"])
+        self.dedupe_link_combo.setCurrentIndex(max(0, self.dedupe_link_combo.findData(config["dedupe_link"])))
+        self.dedupe_verify_check.setChecked(config["dedupe_verify"])
+        self.archive_check.setChecked(config["archive_after_build"])
+        self.archive_format_combo.setCurrentIndex(max(0, self.archive_format_combo.findData(config["archive_format"])))
+        self.archive_level_spin.setValue(config["archive_level"])
+        self.hooks_check.setChecked(config["hooks_enabled"])
+        self.hooks_dir_edit.setText(config["hooks_dir"])
+        self.refresh_hook_list()
+        self.reproducible_check.setChecked(config["reproducible"])
+        self.source_date_epoch_spin.setValue(config["source_date_epoch"])
+        self.memory_trace_check.setChecked(config["memory_trace"])
+        self.import_trace_check.setChecked(config["import_trace"])
+        self.gate_check.setChecked(config["gate_enabled"])
+        self.budget_size_spin.setValue(config["budget_size_mb"])
+        self.budget_files_spin.setValue(config["budget_files"])
+        self.budget_duration_spin.setValue(config["budget_duration"])
+        self.budget_startup_spin.setValue(config["budget_startup_ms"])
+        self.budget_baseline_check.setChecked(config["budget_baseline"])
+        self.budget_tolerance_spin.setValue(config["budget_tolerance"])
+        self.monitor_check.setChecked(config["monitor_enabled"])
+        self.monitor_interval_spin.setValue(config["monitor_interval_ms"])
+        self.memory_limit_spin.setValue(config["memory_limit_mb"])
+        
+        # 列表数据及其显示
+        self.search_paths = list(config["search_paths"])
+        self.search_list.clear()
+        self.search_list.addItems(self.search_paths)
+        
+        self.hidden_imports = list(config["hidden_imports"])
+        self.hidden_list.clear()
+        self.hidden_list.addItems([f"📦 {module}" for module in self.hidden_imports])
+        
+        self.exclude_modules = list(config["exclude_modules"])
+        self.exclude_list.clear()
+        self.exclude_list.addItems([f"❌ {module}" for module in self.exclude_modules])
+        
+        self.data_files = list(config["data_files"])
+        self.sidecar_data_files = [e for e in config["sidecar_data_files"] if e in self.data_files]
+        self.data_list.clear()
+        for entry in self.data_files:
+            self.data_list.addItem(self.create_resource_item(entry, "📄"))
+            if entry in self.sidecar_data_files:
+                item = self.data_list.item(self.data_list.count() - 1)
+                item.setText(item.text() + SIDECAR_ITEM_SUFFIX)
+        
+        self.extra_scripts = list(config["extra_scripts"])
+        self.extra_script_list.clear()
+        for script in self.extra_scripts:
+            self.extra_script_list.addItem(f"📄 {script}")
+        self.binary_files = list(config["binary_files"])
+        self.binary_list.clear()
+        for entry in self.binary_files:
+            self.binary_list.addItem(self.create_resource_item(entry, "⚙️"))
+        self.schedule_glob_previews()
+    
+    # 命令生成和操作
+    def generate_command(self):
+        """生成PyInstaller命令"""
+        if not self.script_edit.text().strip():
+            QMessageBox.warning(self, "警告", "请选择Python脚本文件！")
+            return
         
-        if self.splash_edit.text().strip():
-            command_parts.append(f'--splash "{self.splash_edit.text()}"')
+        config = self.get_build_config()
+        # 先按缓存的 glob 扫描结果立即显示命令；命令中引用的启动画面、spec 文件和
+        # glob 扫描结果在后台准备好后再刷新一次，生成命令时不等待文件系统
+        self.command_text.setPlainText(format_command(["pyinstaller"] + build_pyinstaller_args(config)))
         
-        # 添加脚本文件
-        command_parts.append(f'"{self.script_edit.text()}"')
+        def done(_):
+            self.command_text.setPlainText(format_command(["pyinstaller"] + build_pyinstaller_args(config)))
+            self.schedule_glob_previews()
         
-        # 生成最终命令
-        command = " ".join(command_parts)
-        self.command_text.setPlainText(command)
+        self.run_in_background(
+            prepare_build_inputs, config,
+            on_done=done,
+            on_error=lambda message: self.notify_warning(f"准备构建文件失败: {message}")
+        )
     
     def copy_command(self):
         """复制命令到剪贴板"""
@@ -1696,45 +7572,8 @@ class PyInstallerGUI(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            # 清空所有控件
-            self.script_edit.clear()
-            self.onedir_radio.setChecked(True)
-            self.console_radio.setChecked(True)
-            self.icon_edit.clear()
-            self.name_edit.clear()
-            self.output_edit.clear()
-            self.work_edit.clear()
-            self.collect_edit.clear()
-            self.key_edit.clear()
-            self.splash_edit.clear()
-            
-            # 清空复选框
-            self.debug_check.setChecked(False)
-            self.clean_check.setChecked(False)
-            self.noupx_check.setChecked(False)
-            self.noconfirm_check.setChecked(True)  # 重新设置为默认状态
-            self.uac_check.setChecked(False)
-            
-            # 重置组合框
-            self.log_combo.setCurrentText("INFO")
-            
-            # 清空列表
-            self.search_paths.clear()
-            self.data_files.clear()
-            self.binary_files.clear()
-            self.hidden_imports.clear()
-            self.exclude_modules.clear()
-            
-            # 清空优化选项
-            self.strip_check.setChecked(False)
-            self.upx_exclude_edit.clear()
-            
-            # 清空列表控件
-            self.search_list.clear()
-            self.data_list.clear()
-            self.binary_list.clear()
-            self.hidden_list.clear()
-            self.exclude_list.clear()
+            # 恢复所有控件和列表到默认配置
+            self.apply_config(DEFAULT_CONFIG)
             
             # 清空命令文本
             self.command_text.clear()
@@ -1742,9 +7581,1490 @@ class PyInstallerGUI(QMainWindow):
             # 重置常用模块下拉框
             if hasattr(self, 'common_modules_combo'):
                 self.common_modules_combo.setCurrentIndex(0)
+    
+    # 构建执行
+    def start_build(self):
+        """使用当前配置在后台进程中执行 PyInstaller 构建"""
+        if self.build_process is not None or self.post_build_steps or self.build_preparing:
+            self.notify_warning("已有构建正在进行！")
+            return
+        if not self.script_edit.text().strip():
+            self.notify_warning("请选择Python脚本文件！")
+            return
+        
+        self.build_config = self.get_build_config()
+        self.build_profile = self.current_profile()
+        self.build_log_view.clear()
+        self.build_log_path = os.path.join(
+            APP_DATA_DIR, "logs", f"{get_app_name(self.build_config)}-{datetime.now():%Y%m%d-%H%M%S}.log"
+        )
+        self.build_log_view.start_spool(self.build_log_path)
+        try:
+            splash_sizes = prepare_build_inputs(self.build_config)
+        except Exception as e:
+            self.append_build_log(f"准备构建文件失败: {e}\n")
+            self.build_exit_code = -1
+            self.finish_build_pipeline()
+            return
+        if splash_sizes:
+            original, optimized = splash_sizes
+            self.append_build_log(
+                f"启动画面: {format_size(original)} → {format_size(optimized)}，节省 {format_size(original - optimized)}\n"
+            )
+        if self.build_config["icon"].strip() and not os.path.exists(self.build_config["icon"]):
+            self.append_build_log(f"⚠️ 图标文件不存在，已忽略: {self.build_config['icon']}\n")
+        # glob 条目的扫描结果已在 prepare_build_inputs() 中更新
+        for entry in empty_glob_entries(self.build_config):
+            self.append_build_log(f"⚠️ glob 条目没有匹配任何文件，已从命令中省略: {entry}\n")
+        args = build_pyinstaller_args(self.build_config)
+        
+        self.build_btn.setEnabled(False)
+        
+        # 内存盘构建只改变传给 PyInstaller 的路径，构建历史和构建后处理仍使用磁盘上的路径
+        self.ramdisk_plan, self.ramdisk_fallback = None, ""
+        if not self.build_config["ramdisk_work"]:
+            self.launch_build(args)
+            return
+        
+        def planned(result):
+            self.build_preparing = False
+            self.ramdisk_plan, self.ramdisk_fallback = result
+            self.launch_build(args)
+        
+        def failed(message):
+            self.build_preparing = False
+            self.ramdisk_fallback = message
+            self.launch_build(args)
+        
+        # 检查空间和从磁盘复制预热缓存可能较慢，在后台进行
+        builds = self.history.list_builds(os.path.abspath(self.build_config["script"]), 20, self.build_profile)
+        self.build_preparing = True
+        self.run_in_background(
+            plan_ramdisk_build, self.build_config, ramdisk_required_bytes(self.build_config, builds),
+            on_done=planned, on_error=failed
+        )
+    
+    def launch_build(self, args):
+        """启动 PyInstaller 构建进程（内存盘构建时改用内存盘上的路径）"""
+        if self.ramdisk_plan:
+            ram_config = {
+                **self.build_config,
+                "work": self.ramdisk_plan["work"],
+                "output": self.ramdisk_plan["dist"] or self.build_config["output"],
+            }
+            args = build_pyinstaller_args(ram_config)
+            if self.build_config["extra_scripts"]:
+                # 多入口的 spec 文件由 prepare_build_inputs() 写在磁盘上的工作目录中
+                args[args.index(get_multi_entry_spec_path(ram_config))] = get_multi_entry_spec_path(self.build_config)
+            self.append_build_log(f"⚡ 工作目录位于内存盘: {self.ramdisk_plan['root']}\n")
+        elif self.build_config["ramdisk_work"]:
+            self.append_build_log(f"⚠️ 使用磁盘上的工作目录: {self.ramdisk_fallback}\n")
+        self.build_command = format_command(["pyinstaller"] + args)
+        self.command_text.setPlainText(self.build_command)
+        if self.build_config["extra_scripts"]:
+            names = ", ".join(name for _, name in get_entry_points(self.build_config))
+            self.append_build_log(f"多入口构建: {names} 共享 {get_dist_dir(self.build_config)}\n")
+        self.append_build_log(f"$ {self.build_command}\n")
+        self.build_exit_code = 0
+        self.gate_failed = False
+        
+        # 子进程统一使用 UTF-8 输出，便于解码；构建方案使用独立的缓存目录
+        environment = QProcessEnvironment.systemEnvironment()
+        for key, value in build_environment(self.build_config).items():
+            environment.insert(key, value)
+        
+        self.build_process = QProcess(self)
+        self.build_process.setProcessEnvironment(environment)
+        self.build_process.setWorkingDirectory(get_project_root(self.build_config))
+        self.build_process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        self.build_process.readyReadStandardOutput.connect(self.on_build_output)
+        self.build_process.finished.connect(self.on_build_finished)
+        self.build_process.errorOccurred.connect(self.on_build_error)
+        self.build_process.started.connect(self.start_resource_monitor)
+        
+        self.build_started_at = datetime.now().isoformat(sep=" ", timespec="seconds")
+        self.build_start_time = time.perf_counter()
+        self.stop_btn.setEnabled(True)
+        self.daemon_pid_path = ""
+        if self.build_config["build_daemon"] and build_daemon.daemon_supported():
+            # 客户端进程转发常驻构建进程的输出并以构建的退出码退出，终止客户端即终止构建
+            fd, self.daemon_pid_path = tempfile.mkstemp(prefix="pyinstaller-gui-daemon-", suffix=".pid")
+            os.close(fd)
+            self.build_process.start(sys.executable, [
+                build_daemon.__file__, "--state", DAEMON_STATE_PATH, "--pid-file", self.daemon_pid_path, "--", *args
+            ])
+        else:
+            self.build_process.start(sys.executable, ["-m", "PyInstaller"] + args)
+    
+    def stop_build(self):
+        """终止正在进行的构建"""
+        if self.build_process is not None:
+            self.append_build_log("\n构建已被用户终止\n")
+            self.build_process.kill()
+    
+    def append_build_log(self, text):
+        """追加构建输出"""
+        if self.headless:
+            print(text, end="", flush=True)
+        self.build_log_view.append_text(text)
+    
+    def on_build_output(self):
+        data = self.build_process.readAllStandardOutput().data()
+        self.append_build_log(data.decode("utf-8", errors="replace"))
+    
+    def on_build_error(self, error):
+        # 进程无法启动时不会触发 finished 信号
+        if error == QProcess.ProcessError.FailedToStart:
+            self.append_build_log(f"\n无法启动构建进程: {self.build_process.errorString()}\n")
+            self.on_build_finished(-1, QProcess.ExitStatus.CrashExit)
+    
+    def on_build_finished(self, exit_code, exit_status):
+        """构建结束：统计产物并写入构建历史"""
+        if self.build_process is None:
+            return
+        duration = time.perf_counter() - self.build_start_time
+        if exit_status != QProcess.ExitStatus.NormalExit and exit_code == 0:
+            exit_code = -1
+        self.build_process.deleteLater()
+        self.build_process = None
+        self.stop_btn.setEnabled(False)
+        self.build_exit_code = exit_code
+        resource_metrics = self.stop_resource_monitor()
+        resource_metrics["log_path"] = self.build_log_path
+        resource_metrics["build_daemon"] = bool(self.daemon_pid_path)
+        if self.daemon_pid_path:
+            os.remove(self.daemon_pid_path)
+            self.daemon_pid_path = ""
+        
+        plan = self.ramdisk_plan
+        resource_metrics["ramdisk"] = plan is not None
+        if self.ramdisk_fallback:
+            resource_metrics["ramdisk_fallback"] = self.ramdisk_fallback
+        
+        if not (exit_code == 0 and plan and plan["dist"]):
+            self.record_build(exit_code, duration, resource_metrics)
+            return
+        
+        # 内存盘上暂存的输出移动到输出目录（跨文件系统移动即完整复制），在后台进行，完成后再统计产物
+        def committed(_):
+            self.build_preparing = False
+            self.record_build(exit_code, duration, resource_metrics)
+        
+        def failed(message):
+            self.build_preparing = False
+            self.append_build_log(f"无法将暂存的输出移动到输出目录: {message}\n")
+            self.build_exit_code = -1
+            self.record_build(-1, duration, resource_metrics)
+        
+        self.build_preparing = True
+        self.append_build_log("正在将内存盘上暂存的输出移动到输出目录...\n")
+        self.run_in_background(commit_staged_dist, plan["dist"], self.build_config, on_done=committed, on_error=failed)
+    
+    def record_build(self, exit_code, duration, resource_metrics):
+        """统计产物、写入构建历史并开始构建后处理"""
+        config = self.build_config
+        plan = self.ramdisk_plan
+        
+        # 外部数据包随每次成功构建一起更新
+        if exit_code == 0 and config["sidecar_data_files"]:
+            try:
+                count, total_size = write_sidecar_pack(
+                    config["sidecar_data_files"], get_sidecar_pack_path(config), get_project_root(config)
+                )
+                self.append_build_log(f"已写入外部数据包: {count} 个文件, {format_size(total_size)}\n")
+            except Exception as e:
+                self.append_build_log(f"生成外部数据包失败: {e}\n")
+        
+        artifact_path = get_artifact_path(config)
+        if exit_code == 0 and config["reproducible"]:
+            epoch = get_source_date_epoch(config)
+            normalize_build_output(artifact_path, epoch)
+            if config["sidecar_data_files"] and os.path.isfile(get_sidecar_pack_path(config)):
+                normalize_build_output(get_sidecar_pack_path(config), epoch)
+        artifact_size, file_count = measure_artifact(artifact_path) if exit_code == 0 else (0, 0)
+        
+        # 构建历史中不保存加密密钥
+        self.last_build_id = self.history.add_build({
+            "project": os.path.abspath(config["script"]),
+            "name": get_app_name(config),
+            "started_at": self.build_started_at,
+            "duration": duration,
+            "exit_code": exit_code,
+            "command": self.build_command,
+            "config": dict(config, key=""),
+            "artifact_path": artifact_path,
+            "artifact_size": artifact_size,
+            "file_count": file_count,
+            "metrics": resource_metrics,
+            "profile": self.build_profile,
+        })
+        
+        if "peak_rss" in resource_metrics:
+            self.append_build_log(
+                f"资源峰值: 内存 {format_size(resource_metrics['peak_rss'])}，CPU {resource_metrics['peak_cpu']:.0f}%，"
+                f"读取 {format_size(resource_metrics['io_read'])}，写入 {format_size(resource_metrics['io_write'])}\n"
+            )
+        
+        if exit_code == 0:
+            self.append_build_log(
+                f"\n✅ 构建成功，耗时 {duration:.1f} s，产物 {format_size(artifact_size)}，共 {file_count} 个文件\n"
+            )
+            if config["ramdisk_work"]:
+                self.append_build_log(format_ramdisk_comparison(
+                    duration, plan is not None, config,
+                    self.history.list_builds(os.path.abspath(config["script"]), 50, self.build_profile)
+                ))
+            try:
+                self.history.add_manifest(self.last_build_id, collect_artifact_manifest(artifact_path))
+            except Exception as e:
+                self.append_build_log(f"无法收集产物清单: {e}\n")
+            self.run_post_build_steps(self.last_build_id)
+        else:
+            self.append_build_log(f"\n❌ 构建失败（退出码 {exit_code}），耗时 {duration:.1f} s\n")
+            # 分析阶段已完成时仍可从警告中找到失败原因
+            self.run_post_build_steps(self.last_build_id, [self.ramdisk_step, self.warnings_step])
+    
+    # 构建资源监视
+    def start_resource_monitor(self):
+        """构建进程启动后开始定时采样进程树资源"""
+        self.resource_samples = []
+        self.memory_limit_exceeded = False
+        self.resource_chart.set_series([])
+        if psutil is None or not self.build_config["monitor_enabled"]:
+            self.resource_label.setText("")
+            return
+        try:
+            self.resource_sampler = ResourceSampler(self.build_process.processId())
+        except psutil.Error:
+            return
+        self.resource_timer.start(self.build_config["monitor_interval_ms"])
+    
+    def stop_resource_monitor(self):
+        """
+        停止采样
+        
+        Returns:
+            资源峰值指标，未监视时返回空字典
+        """
+        self.resource_timer.stop()
+        if self.resource_sampler is None:
+            return {}
+        metrics = self.resource_sampler.peaks()
+        metrics["memory_limit_exceeded"] = self.memory_limit_exceeded
+        self.resource_sampler = None
+        return metrics
+    
+    def sample_build_resources(self):
+        """定时采样并更新曲线，超过内存上限时中止构建"""
+        if self.resource_sampler is None:
+            return
+        # 常驻构建进程开始构建后，采样执行构建的子进程
+        if self.daemon_pid_path and len(self.resource_sampler.roots) == 1:
+            try:
+                with open(self.daemon_pid_path, "r", encoding="ascii") as f:
+                    self.resource_sampler.follow(int(f.read()))
+            except (OSError, ValueError, psutil.Error):
+                pass
+        sample = self.resource_sampler.sample()
+        self.resource_samples.append(sample)
+        # 曲线只保留最近 600 个采样点
+        del self.resource_samples[:-600]
+        
+        self.resource_label.setText(
+            f"CPU {sample['cpu']:.0f}%  内存 {format_size(sample['rss'])}"
+            f"（峰值 {format_size(self.resource_sampler.peak_rss)}）  "
+            f"读 {format_size(sample['read'])}  写 {format_size(sample['write'])}"
+        )
+        self.update_resource_chart()
+        
+        limit = self.build_config["memory_limit_mb"] * 1024 * 1024
+        if limit and sample["rss"] > limit and not self.memory_limit_exceeded:
+            self.memory_limit_exceeded = True
+            self.append_build_log(
+                f"\n⛔ 构建内存 {format_size(sample['rss'])} 超过上限 {format_size(limit)}，已中止构建\n"
+            )
+            self.resource_sampler.kill_tree()
+    
+    def update_resource_chart(self):
+        """按所选指标绘制资源曲线"""
+        if not self.resource_samples:
+            return
+        metric = self.resource_metric_combo.currentText()
+        if metric == "内存":
+            series = [("内存", [s["rss"] for s in self.resource_samples])]
+            formatter = format_size
+        elif metric == "CPU":
+            series = [("CPU", [s["cpu"] for s in self.resource_samples])]
+            formatter = lambda v: f"{v:.0f}%"
+        else:
+            series = [
+                ("读取", [s["read"] for s in self.resource_samples]),
+                ("写入", [s["write"] for s in self.resource_samples]),
+            ]
+            formatter = format_size
+        self.resource_chart.set_series(series, formatter)
+    
+    # 构建警告
+    def refresh_build_warnings(self):
+        """按当前配置重新读取工作目录中的构建警告"""
+        config = self.get_build_config()
+        if not config["script"]:
+            self.notify_warning("请先选择Python脚本文件")
+            return
+        self.run_in_background(
+            harvest_build_warnings, config,
+            on_done=self.show_build_warnings,
+            on_error=lambda message: self.notify_warning(f"读取构建警告失败: {message}")
+        )
+    
+    def show_build_warnings(self, report):
+        self.warnings_report = report
+        if report is None:
+            self.warnings_summary_label.setText("工作目录中没有构建警告文件，请先构建一次")
+        else:
+            self.warnings_summary_label.setText(
+                "，".join(f"{MISSING_CATEGORIES[k]} {n} 个" for k, n in report["counts"].items())
+                + "。真实缺失的模块在运行时可能抛出 ImportError，应优先处理。"
+            )
+        self.populate_warnings_tree()
+    
+    def populate_warnings_tree(self):
+        """按分组方式和类别筛选显示缺失模块"""
+        self.warnings_tree.clear()
+        report = self.warnings_report
+        if not report:
+            return
+        category_filter = self.warnings_category_combo.currentData()
+        entries = [e for e in report["entries"] if not category_filter or e["category"] == category_filter]
+        paths = report["paths"]
+        
+        def make_item(module, category, kinds):
+            if module in self.hidden_imports:
+                status = "已加入隐藏导入"
+            elif module in self.exclude_modules:
+                status = "已排除"
+            else:
+                status = ""
+            item = QTreeWidgetItem([module, category, kinds, status])
+            item.setData(0, Qt.ItemDataRole.UserRole, module)
+            if module in paths:
+                item.setToolTip(0, paths[module])
+            return item
+        
+        if self.warnings_group_combo.currentIndex() == 0:
+            for entry in entries:
+                category = MISSING_CATEGORIES[entry["category"]]
+                parent = make_item(entry["module"], category, f"{len(entry['importers'])} 处导入")
+                for importer, kinds in entry["importers"]:
+                    parent.addChild(make_item(importer, "导入方", ", ".join(kinds)))
+                self.warnings_tree.addTopLevelItem(parent)
+        else:
+            by_importer = {}
+            for entry in entries:
+                for importer, kinds in entry["importers"]:
+                    by_importer.setdefault(importer, []).append((entry, kinds))
+            for importer in sorted(by_importer):
+                missing = by_importer[importer]
+                parent = make_item(importer, "导入方", f"{len(missing)} 个缺失模块")
+                for entry, kinds in missing:
+                    parent.addChild(make_item(entry["module"], MISSING_CATEGORIES[entry["category"]], ", ".join(kinds)))
+                self.warnings_tree.addTopLevelItem(parent)
+    
+    def selected_warning_modules(self):
+        modules = []
+        for item in self.warnings_tree.selectedItems():
+            module = item.data(0, Qt.ItemDataRole.UserRole)
+            if module not in modules:
+                modules.append(module)
+        return modules
+    
+    def add_warnings_to_hidden_imports(self):
+        """将选中的模块加入隐藏导入"""
+        modules = self.selected_warning_modules()
+        if not modules:
+            self.notify_warning("请先在列表中选择模块")
+            return
+        added = [m for m in modules if self.add_hidden_import_by_name(m)]
+        self.populate_warnings_tree()
+        if added:
+            self.generate_command()
+    
+    def add_warnings_to_excludes(self):
+        """将选中的模块加入排除模块"""
+        modules = self.selected_warning_modules()
+        if not modules:
+            self.notify_warning("请先在列表中选择模块")
+            return
+        added = [m for m in modules if self.add_exclude_module_by_name(m)]
+        self.populate_warnings_tree()
+        if added:
+            self.generate_command()
+    
+    # 导入代价
+    def schedule_import_costs(self, *args):
+        self.import_cost_timer.start()
+    
+    def update_import_costs(self):
+        """在后台计算每个隐藏导入和收集子模块条目的代价"""
+        config = self.get_build_config()
+        if not (config["hidden_imports"] or config["collect"]):
+            self.collect_cost_label.setText("")
+            return
+        self.import_cost_generation += 1
+        generation = self.import_cost_generation
+        
+        def done(costs):
+            # 只显示最新一次计算的结果
+            if generation == self.import_cost_generation:
+                self.show_import_costs(costs)
+        
+        self.run_in_background(
+            compute_import_costs, config,
+            on_done=done,
+            on_error=lambda message: self.collect_cost_label.setText(f"导入代价分析失败: {message}")
+        )
+    
+    def show_import_costs(self, costs):
+        """在隐藏导入列表和收集子模块输入框下方显示代价"""
+        for row, module in enumerate(self.hidden_imports):
+            item = self.hidden_list.item(row)
+            base_text = item.data(Qt.ItemDataRole.UserRole) or item.text()
+            item.setData(Qt.ItemDataRole.UserRole, base_text)
+            cost = costs["hidden"].get(module)
+            item.setText(f"{base_text}    {format_import_cost(cost)}" if cost else base_text)
+            if cost and cost["estimated"] and cost["distributions"]:
+                item.setToolTip("尚未构建，按已安装的发行包估算: " + ", ".join(cost["distributions"]))
+        self.collect_cost_label.setText("\n".join(
+            f"{package}: {format_import_cost(cost)}" for package, cost in costs["collect"].items()
+        ))
+    
+    # 构建前估算
+    def watch_config_changes(self, root):
+        """配置面板中的任何选项变化时重新估算"""
+        for edit in root.findChildren(QLineEdit):
+            edit.textChanged.connect(self.schedule_build_estimate)
+        for button_type in (QCheckBox, QRadioButton):
+            for button in root.findChildren(button_type):
+                button.toggled.connect(self.schedule_build_estimate)
+        for combo in root.findChildren(QComboBox):
+            combo.currentIndexChanged.connect(self.schedule_build_estimate)
+        for spin_type in (QSpinBox, QDoubleSpinBox):
+            for spin in root.findChildren(spin_type):
+                spin.valueChanged.connect(self.schedule_build_estimate)
+        for view in root.findChildren(QListWidget):
+            view.model().rowsInserted.connect(self.schedule_build_estimate)
+            view.model().rowsRemoved.connect(self.schedule_build_estimate)
+    
+    def schedule_build_estimate(self, *args):
+        self.estimate_timer.start()
+    
+    def update_build_estimate(self):
+        """在后台估算当前设置的产物体积和构建耗时"""
+        if self.headless or not self.script_edit.text().strip():
+            self.estimate_label.setText("")
+            return
+        config = self.get_build_config()
+        project = os.path.abspath(config["script"])
+        profile = self.current_profile()
+        baseline = self.history.latest_build(project, profile=profile)
+        # 耗时优先按本项目同一方案的历史拟合，没有时参考其他构建
+        builds = (
+            self.history.list_builds(project, limit=20, profile=profile)
+            or self.history.list_builds(project, limit=20)
+            or self.history.list_builds(limit=20)
+        )
+        self.estimate_generation += 1
+        generation = self.estimate_generation
+        
+        def done(estimate):
+            if generation != self.estimate_generation:
+                return
+            text, details = format_build_estimate(estimate)
+            color = "#6c757d"
+            if config["gate_enabled"] and config["budget_size_mb"] and estimate["size"] > config["budget_size_mb"] * 1024 * 1024:
+                text += "，超出体积预算"
+                color = "#dc3545"
+            elif baseline and estimate["size"] > estimate["base_size"] * 1.5:
+                color = "#fd7e14"
+            self.estimate_label.setText(text)
+            self.estimate_label.setToolTip(details)
+            self.estimate_label.setStyleSheet(f"color: {color}; font-size: 12px;")
+        
+        def failed(message):
+            if generation == self.estimate_generation:
+                self.estimate_label.setText(f"构建估算失败: {message}")
+        
+        self.run_in_background(estimate_build, config, baseline, builds, on_done=done, on_error=failed)
+    
+    # 构建方案
+    def refresh_profile_combo(self, selected=""):
+        """重新填充构建方案下拉框"""
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItem("基础配置（不使用方案）", "")
+        for name in self.profiles:
+            label = f"{name}（内置）" if name in BUILTIN_PROFILES else name
+            self.profile_combo.addItem(label, name)
+        self.profile_combo.setCurrentIndex(max(0, self.profile_combo.findData(selected)))
+        self.profile_combo.blockSignals(False)
+        self.update_profile_label()
+    
+    def update_profile_label(self):
+        name = self.profile_combo.currentData()
+        if not name:
+            self.profile_label.setText("直接使用各标签页中的设置")
+            return
+        dirs = resolve_profile(
+            {"profile": name, "output": self.output_edit.text(), "work": self.work_edit.text()}, self.profiles
+        )
+        self.profile_label.setText(
+            "覆盖: " + describe_profile(self.profiles.get(name, {})) +
+            f"\n输出目录: {dirs['output']}，工作目录: {dirs['work']}，缓存: {dirs['cache_dir']}"
+        )
+    
+    def on_profile_changed(self):
+        self.update_profile_label()
+        self.schedule_import_costs()
+        self.check_optimize_hazards()
+    
+    def save_profile(self):
+        """将当前选项保存为构建方案"""
+        name, ok = QInputDialog.getText(self, "另存为方案", "方案名称:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        if name in BUILTIN_PROFILES:
+            QMessageBox.warning(self, "警告", "不能覆盖内置方案！")
+            return
+        config = self.get_config()
+        self.profiles[name] = {key: config[key] for key in PROFILE_KEYS}
+        save_custom_profiles(self.profiles)
+        self.refresh_profile_combo(name)
+    
+    def delete_profile(self):
+        """删除所选的用户方案"""
+        name = self.profile_combo.currentData()
+        if not name:
+            return
+        if name in BUILTIN_PROFILES:
+            QMessageBox.warning(self, "警告", "不能删除内置方案！")
+            return
+        del self.profiles[name]
+        save_custom_profiles(self.profiles)
+        self.refresh_profile_combo()
+    
+    # 字节码优化
+    def check_optimize_hazards(self):
+        """选择优化级别后在后台扫描依赖文档字符串或 assert 的包"""
+        config = self.get_build_config()
+        level = config["optimize"]
+        if level <= 0 or not config["script"]:
+            self.optimize_warning_label.hide()
+            return
+        
+        def done(hazards):
+            # 扫描期间用户可能又修改了级别
+            if self.get_build_config()["optimize"] != level:
+                return
+            text = format_optimize_hazards(hazards, level)
+            self.optimize_warning_label.setText(f"⚠️ {text}" if text else "")
+            self.optimize_warning_label.setVisible(bool(text))
+        
+        self.run_in_background(find_optimize_hazards, config, on_done=done)
+    
+    def measure_optimize_levels(self):
+        """在后台以各优化级别构建并比较结果"""
+        config = self.get_build_config()
+        if not config["script"]:
+            self.notify_warning("请先选择Python脚本文件")
+            return
+        if self.build_process is not None:
+            self.notify_warning("正在构建中，请稍后再测量")
+            return
+        self.append_build_log("📏 正在以优化级别 0、1、2 分别构建，完成后显示对比结果...\n")
+        
+        def measure(config):
+            # 扫描项目源码同样较慢，与测量一起在后台进行
+            return measure_optimize_levels(config), find_optimize_hazards(config)
+        
+        def done(result):
+            results, hazards = result
+            report = format_optimize_report(results)
+            hazards = format_optimize_hazards(hazards, 2)
+            if hazards:
+                report += "\n\n" + hazards
+            self.append_build_log(report + "\n")
+            QMessageBox.information(self, "字节码优化级别对比", report)
+        
+        self.run_in_background(
+            measure, config,
+            on_done=done,
+            on_error=lambda message: self.notify_warning(f"测量失败: {message}")
+        )
+    
+    # 本地钩子
+    def current_hooks_dir(self):
+        """当前设置的本地钩子目录，未选择脚本且未指定目录时返回空字符串"""
+        if not (self.script_edit.text().strip() or self.hooks_dir_edit.text().strip()):
+            return ""
+        return get_hooks_dir(self.get_config())
+    
+    def refresh_daemon_status(self):
+        """在后台查询常驻构建进程的状态"""
+        def done(status):
+            if status is None:
+                self.daemon_status_label.setText("未运行（下次构建时自动启动）")
+                return
+            uptime = (time.time() - status["started"]) / 60
+            self.daemon_status_label.setText(
+                f"pid {status['pid']}，已运行 {uptime:.0f} 分钟，完成 {status['builds']} 次构建"
+                + ("，正在构建" if status["building"] else "")
+            )
+        
+        self.run_in_background(
+            build_daemon.daemon_status, DAEMON_STATE_PATH,
+            on_done=done, on_error=lambda message: self.daemon_status_label.setText(f"查询失败: {message}")
+        )
+    
+    def stop_build_daemon(self):
+        """结束常驻构建进程（等待正在进行的构建完成）"""
+        self.daemon_status_label.setText("正在结束...")
+        self.run_in_background(
+            build_daemon.stop_daemon, DAEMON_STATE_PATH,
+            on_done=lambda stopped: self.refresh_daemon_status(),
+            on_error=lambda message: self.daemon_status_label.setText(f"结束失败: {message}")
+        )
+    
+    def browse_ramdisk_dir(self):
+        folder_path = QFileDialog.getExistingDirectory(self, "选择内存盘目录", default_ramdisk_dir())
+        if folder_path:
+            self.ramdisk_dir_edit.setText(folder_path)
+    
+    def browse_runtime_tmpdir(self):
+        folder_path = QFileDialog.getExistingDirectory(self, "选择单文件程序的解压目录")
+        if folder_path:
+            self.runtime_tmpdir_edit.setText(folder_path)
+    
+    def browse_hooks_dir(self):
+        folder_path = QFileDialog.getExistingDirectory(self, "选择本地钩子目录", self.current_hooks_dir())
+        if folder_path:
+            self.hooks_dir_edit.setText(folder_path)
+            self.refresh_hook_list()
+    
+    def refresh_hook_list(self):
+        """列出本地钩子目录中的钩子文件"""
+        hooks_dir = self.current_hooks_dir()
+        self.hook_list.clear()
+        if hooks_dir:
+            self.hook_list.addItems(list_local_hooks(hooks_dir))
+    
+    def add_hook_from_template(self):
+        """按精简钩子模板生成钩子文件"""
+        hooks_dir = self.current_hooks_dir()
+        if not hooks_dir:
+            self.notify_warning("请先选择Python脚本文件或指定钩子目录！")
+            return
+        labels = [description for description, _, _ in HOOK_TEMPLATES.values()]
+        label, ok = QInputDialog.getItem(self, "从模板添加钩子", "模板:", labels, 0, False)
+        if not ok:
+            return
+        template = list(HOOK_TEMPLATES)[labels.index(label)]
+        _, prompt, default = HOOK_TEMPLATES[template]
+        parameter, ok = QInputDialog.getText(self, "从模板添加钩子", f"{prompt}:", text=default)
+        if not ok:
+            return
+        
+        # qt-plugins 只为最近一次构建实际收集的 Qt 模块生成钩子
+        modules = None
+        if template == "qt-plugins":
+            graph = load_module_graph(self.get_build_config())
+            if graph:
+                modules = set(graph.names)
+        try:
+            names = write_hook_template(template, parameter, hooks_dir, modules)
+        except (OSError, ValueError) as e:
+            self.notify_warning(f"生成钩子失败: {e}")
+            return
+        self.refresh_hook_list()
+        self.append_build_log(f"🪝 已生成本地钩子（{hooks_dir}）: {', '.join(names)}\n")
+    
+    def remove_hook_file(self):
+        """删除选中的钩子文件"""
+        item = self.hook_list.currentItem()
+        if item is None:
+            return
+        path = os.path.join(self.current_hooks_dir(), item.text())
+        reply = QMessageBox.question(
+            self, "确认", f"确定要删除 {path} 吗？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            try:
+                os.remove(path)
+            except OSError as e:
+                self.notify_warning(f"删除失败: {e}")
+            self.refresh_hook_list()
+    
+    def open_hook_file(self, item):
+        QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.join(self.current_hooks_dir(), item.text())))
+    
+    def compare_hook_sizes(self):
+        """在后台分别使用本地钩子和自带钩子构建，比较产物体积"""
+        config = self.get_build_config()
+        if not config["script"]:
+            self.notify_warning("请先选择Python脚本文件")
+            return
+        if not list_local_hooks(get_hooks_dir(config)):
+            self.notify_warning("本地钩子目录中还没有钩子！")
+            return
+        self.append_build_log("📏 正在分别使用本地钩子和自带钩子构建，完成后显示体积对比...\n")
+        
+        def done(result):
+            report = format_hook_comparison(result)
+            self.append_build_log(report + "\n")
+            QMessageBox.information(self, "本地钩子体积对比", report)
+        
+        self.run_in_background(
+            compare_hook_sizes, config,
+            on_done=done,
+            on_error=lambda message: self.notify_warning(f"对比失败: {message}")
+        )
+    
+    # 可复现构建
+    def verify_reproducible_build(self):
+        """在后台以可复现模式构建两次并比较产物"""
+        config = self.get_build_config()
+        if not config["script"]:
+            self.notify_warning("请先选择Python脚本文件")
+            return
+        if self.build_process is not None:
+            self.notify_warning("正在构建中，请稍后再验证")
+            return
+        self.append_build_log("🔁 正在以可复现模式构建两次，完成后显示比较结果...\n")
+        
+        def done(result):
+            report = format_reproducible_report(result)
+            self.append_build_log(report + "\n")
+            QMessageBox.information(self, "可复现构建验证", report)
+        
+        self.run_in_background(
+            verify_reproducible, config,
+            on_done=done,
+            on_error=lambda message: self.notify_warning(f"验证失败: {message}")
+        )
+    
+    # 增量更新包
+    def refresh_release_combo(self):
+        """列出当前程序已保存的发布快照"""
+        selected = self.release_combo.currentData()
+        self.release_combo.clear()
+        if self.script_edit.text().strip():
+            for name, path in list_release_snapshots(self.get_config()):
+                self.release_combo.addItem(name, path)
+        if selected and self.release_combo.findData(selected) < 0:
+            self.release_combo.addItem(selected, selected)
+        self.release_combo.setCurrentIndex(max(0, self.release_combo.findData(selected)))
+    
+    def browse_release_base(self):
+        """选择任意目录作为旧版本（如解压后的旧发布包）"""
+        folder_path = QFileDialog.getExistingDirectory(self, "选择旧版本目录")
+        if folder_path:
+            self.release_combo.addItem(folder_path, folder_path)
+            self.release_combo.setCurrentIndex(self.release_combo.count() - 1)
+    
+    def save_release_snapshot(self):
+        """将当前项目最近一次成功的构建保存为发布快照"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        config = {**DEFAULT_CONFIG, **build["config"]}
+        snapshot_path = os.path.join(get_release_dir(config), f"{datetime.now():%Y%m%d-%H%M%S}-build{build['id']}")
+        
+        def done(path):
+            self.append_build_log(f"💾 已保存发布版本: {path}\n")
+            self.refresh_release_combo()
+            self.release_combo.setCurrentIndex(max(0, self.release_combo.findData(path)))
+        
+        self.run_in_background(
+            save_release_snapshot, build["artifact_path"], snapshot_path,
+            on_done=done,
+            on_error=lambda message: self.notify_warning(f"保存发布版本失败: {message}")
+        )
+    
+    def create_patch_package(self):
+        """比较最近一次成功的构建与所选旧版本，生成增量更新包"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        base_path = self.release_combo.currentData()
+        if not base_path:
+            self.notify_warning("请先保存发布版本或选择旧版本目录！")
+            return
+        
+        new_path = build["artifact_path"]
+        default_path = os.path.join(
+            os.path.dirname(new_path), f"{build['name']}-{os.path.basename(base_path)}-update.patch"
+        )
+        patch_path, _ = QFileDialog.getSaveFileName(self, "保存增量包", default_path, "增量更新包 (*.patch)")
+        if not patch_path:
+            return
+        self.append_build_log(f"📦 正在比较 {base_path} → {new_path}...\n")
+        
+        def done(result):
+            self.history.update_metrics(build["id"], {"patch_size": result["patch_size"]})
+            report = format_patch_report(result)
+            self.append_build_log(f"{report}\n已写入: {patch_path}\n")
+            QMessageBox.information(self, "增量更新包", report)
+        
+        self.run_in_background(
+            write_patch_package, base_path, new_path, patch_path,
+            on_done=done,
+            on_error=lambda message: self.notify_warning(f"生成增量包失败: {message}")
+        )
+    
+    # 构建后处理
+    def run_post_build_steps(self, build_id, steps=None):
+        """依次执行构建后处理步骤，每个步骤完成后调用 next_post_build_step()"""
+        self.post_build_id = build_id
+        if steps is None:
+            steps = [
+                self.ramdisk_step, self.warnings_step, self.dedupe_step, self.archive_step, self.import_cost_step, self.benchmark_step,
+                self.extraction_benchmark_step, self.memory_benchmark_step, self.budget_gate_step,
+            ]
+        self.post_build_steps = list(steps)
+        self.next_post_build_step()
+    
+    def next_post_build_step(self):
+        if self.post_build_steps:
+            step = self.post_build_steps.pop(0)
+            step(self.post_build_id)
+        else:
+            self.finish_build_pipeline()
+    
+    def finish_build_pipeline(self):
+        """构建及后处理全部结束"""
+        self.build_btn.setEnabled(True)
+        self.build_log_view.finish()
+        self.schedule_build_estimate()
+        if self.headless:
+            if self.build_exit_code != 0:
+                QApplication.instance().exit(1)
+            elif self.gate_failed:
+                QApplication.instance().exit(2)
+            else:
+                QApplication.instance().exit(0)
+    
+    def run_in_background(self, function, *args, on_done=None, on_error=None):
+        """在线程池中执行函数，完成后在主线程回调"""
+        task = BackgroundTask(function, *args)
+        self.background_tasks.add(task)
+        
+        def finished(result):
+            self.background_tasks.discard(task)
+            if on_done:
+                on_done(result)
+        
+        def failed(message):
+            self.background_tasks.discard(task)
+            if on_error:
+                on_error(message)
+        
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(failed)
+        QThreadPool.globalInstance().start(task)
+    
+    def notify_warning(self, message):
+        """显示警告（无界面模式下输出到终端）"""
+        if self.headless:
+            print(f"警告: {message}", file=sys.stderr)
+        else:
+            QMessageBox.warning(self, "警告", message)
+    
+    def warnings_step(self, build_id):
+        """构建后读取 warn/xref 文件并汇总缺失模块"""
+        def done(report):
+            self.show_build_warnings(report)
+            if report:
+                counts = report["counts"]
+                self.history.update_metrics(build_id, {"missing_modules": counts})
+                self.append_build_log(
+                    "⚠️ 构建警告: " + "，".join(f"{MISSING_CATEGORIES[k]} {n}" for k, n in counts.items())
+                    + "（详见“构建警告”标签页）\n"
+                )
+            self.next_post_build_step()
+        
+        def failed(message):
+            self.append_build_log(f"读取构建警告失败: {message}\n")
+            self.next_post_build_step()
+        
+        self.run_in_background(harvest_build_warnings, self.build_config, on_done=done, on_error=failed)
+    
+    def ramdisk_step(self, build_id):
+        """内存盘构建后将工作目录同步回磁盘，重启后仍能使用预热缓存（在读取 warn 文件等步骤之前）"""
+        plan = self.ramdisk_plan
+        if plan is None:
+            self.next_post_build_step()
+            return
+        
+        def done(result):
+            self.history.update_metrics(build_id, {
+                "ramdisk_work_bytes": result["size"],
+                "ramdisk_sync_seconds": result["seconds"],
+            })
+            self.append_build_log(
+                f"已将内存盘上的工作目录同步回磁盘: 复制 {format_size(result['copied'])}，耗时 {result['seconds']:.1f} s\n"
+            )
+            self.next_post_build_step()
+        
+        def failed(message):
+            self.append_build_log(f"同步内存盘上的工作目录失败: {message}\n")
+            self.next_post_build_step()
+        
+        self.run_in_background(sync_ramdisk_work, self.build_config, plan, on_done=done, on_error=failed)
+    
+    def dedupe_step(self, build_id):
+        """构建后查找并处理目录模式产物中的重复文件（在基准测试之前，测量的是去重后的产物）"""
+        config = self.build_config
+        if not config["dedupe_after_build"] or config["onefile"]:
+            self.next_post_build_step()
+            return
+        self.start_dedupe(build_id, config, self.next_post_build_step)
+    
+    def start_dedupe(self, build_id, config, then=None):
+        """在后台对产物去重，结果写入构建历史"""
+        mode = config["dedupe_link"]
+        self.append_build_log(f"🔗 正在查找重复文件（{DEDUPE_MODES[mode]}）: {get_dist_dir(config)}\n")
+        
+        def done(result):
+            self.history.update_metrics(build_id, {
+                "duplicate_groups": len(result["groups"]),
+                "duplicate_bytes": result["wasted"],
+                "dedupe_saved": result["saved"],
+            })
+            if result["replaced"]:
+                artifact_size, file_count = measure_artifact(get_artifact_path(config))
+                self.history.update_build(build_id, artifact_size=artifact_size)
+            self.append_build_log(format_dedupe_report(result) + "\n")
+            if then:
+                then()
+        
+        def failed(message):
+            self.append_build_log(f"查找重复文件失败: {message}\n")
+            if then:
+                then()
+        
+        self.run_in_background(dedupe_output, config, mode, config["dedupe_verify"], on_done=done, on_error=failed)
+    
+    def dedupe_last_build(self):
+        """对当前项目最近一次成功的构建去重"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        # 使用当前界面上的去重、验证选项
+        config = {**DEFAULT_CONFIG, **build["config"], **{
+            key: value for key, value in self.get_config().items() if key.startswith(("bench_", "dedupe_"))
+        }}
+        if config["onefile"]:
+            self.notify_warning("单文件模式的产物不需要去重！")
+            return
+        self.start_dedupe(build["id"], config)
+    
+    def archive_step(self, build_id):
+        """构建后打包产物（在去重之后，基准测试之前，避免与基准测试争用 CPU）"""
+        if not self.build_config["archive_after_build"]:
+            self.next_post_build_step()
+            return
+        self.start_archive(build_id, self.build_config, self.next_post_build_step)
+    
+    def start_archive(self, build_id, config, then=None):
+        """在后台打包产物，耗时和压缩率写入构建历史"""
+        archive_path = get_archive_path(config)
+        self.append_build_log(f"🗜️ 正在打包 {ARCHIVE_FORMATS[config['archive_format']]}: {archive_path}\n")
+        
+        def done(result):
+            self.history.update_metrics(build_id, {
+                "archive_path": result["archive_path"],
+                "archive_size": result["archive_size"],
+                "archive_seconds": round(result["seconds"], 3),
+                "archive_ratio": round(result["ratio"], 4),
+            })
+            self.append_build_log(format_archive_report(result) + "\n")
+            if then:
+                then()
+        
+        def failed(message):
+            self.append_build_log(f"打包失败: {message}\n")
+            if then:
+                then()
+        
+        self.run_in_background(
+            write_archive, get_artifact_path(config), archive_path, config["archive_format"],
+            config["archive_level"], config["reproducible"],
+            on_done=done, on_error=failed
+        )
+    
+    def archive_last_build(self):
+        """打包当前项目最近一次成功的构建"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        # 使用当前界面上的格式和压缩级别
+        config = {**DEFAULT_CONFIG, **build["config"], **{
+            key: value for key, value in self.get_config().items() if key.startswith("archive_")
+        }}
+        self.start_archive(build["id"], config)
+    
+    def import_cost_step(self, build_id):
+        """构建后依赖图已更新，重新计算导入代价（不阻塞后续步骤）"""
+        if not self.headless:
+            self.update_import_costs()
+        self.next_post_build_step()
+    
+    def benchmark_step(self, build_id):
+        """构建后启动基准测试（启用自动测量或设置了启动预算时执行）"""
+        config = self.build_config
+        if not (config["bench_after_build"] or (config["gate_enabled"] and config["budget_startup_ms"])):
+            self.next_post_build_step()
+            return
+        self.start_startup_benchmark(build_id, config, self.next_post_build_step)
+    
+    def start_startup_benchmark(self, build_id, config, then=None):
+        """在后台测量启动时间，结果写入构建历史"""
+        executable = get_executable_path(config)
+        bench_args = shlex.split(config["bench_args"], posix=os.name != "nt")
+        self.append_build_log(f"⏱️ 启动基准测试: {executable}（{config['bench_runs']} 次）\n")
+        
+        def done(durations):
+            median = statistics.median(durations)
+            self.history.update_build(build_id, startup_ms=median)
+            self.history.update_metrics(build_id, {"startup_runs": durations})
+            self.append_build_log(
+                f"启动时间中位数 {median:.0f} ms（最快 {min(durations):.0f} ms，最慢 {max(durations):.0f} ms）\n"
+            )
+            if then:
+                then()
+        
+        def failed(message):
+            self.append_build_log(f"启动基准测试失败: {message}\n")
+            if then:
+                then()
+        
+        self.run_in_background(
+            measure_startup, executable, config["bench_runs"], bench_args,
+            config["bench_marker"], config["bench_timeout"],
+            on_done=done, on_error=failed
+        )
+    
+    def extraction_benchmark_step(self, build_id):
+        """构建后单文件解压基准测试"""
+        config = self.build_config
+        if not config["extract_bench_after_build"] or not config["onefile"] or psutil is None:
+            self.next_post_build_step()
+            return
+        self.start_extraction_benchmark(build_id, config, self.next_post_build_step)
+    
+    def start_extraction_benchmark(self, build_id, config, then=None):
+        """在后台测量单文件程序每次启动的解压耗时和写入量，结果写入构建历史"""
+        executable = get_executable_path(config)
+        self.append_build_log(f"📤 单文件解压基准测试: {executable}（{config['bench_runs']} 次）\n")
+        
+        def done(result):
+            self.history.update_metrics(build_id, {
+                "extract_ms": result["extract_ms"],
+                "extract_bytes": result["bytes"],
+                "extract_files": result["files"],
+                "extract_runs": result["runs"],
+                "extract_top_files": result["top_files"],
+            })
+            build = self.history.get_build(build_id)
+            self.append_build_log(format_extraction_report(result, build["startup_ms"] if build else None))
+            if then:
+                then()
+        
+        def failed(message):
+            self.append_build_log(f"单文件解压基准测试失败: {message}\n")
+            if then:
+                then()
+        
+        self.run_in_background(
+            measure_extraction, executable, config["bench_runs"], resolve_runtime_tmpdir(config),
+            config["bench_timeout"],
+            on_done=done, on_error=failed
+        )
+    
+    def memory_benchmark_step(self, build_id):
+        """构建后启动内存基准测试"""
+        if not self.build_config["memory_bench_after_build"] or psutil is None:
+            self.next_post_build_step()
+            return
+        self.start_memory_benchmark(build_id, self.build_config, self.next_post_build_step)
+    
+    def start_memory_benchmark(self, build_id, config, then=None):
+        """在后台测量启动内存峰值，结果写入构建历史"""
+        executable = get_executable_path(config)
+        bench_args = shlex.split(config["bench_args"], posix=os.name != "nt")
+        self.append_build_log(f"🧠 启动内存基准测试: {executable}（{config['bench_runs']} 次）\n")
+        
+        def done(result):
+            self.history.update_metrics(build_id, {
+                "startup_peak_rss": result["peak_rss"],
+                "startup_peak_pss": result["peak_pss"],
+                "startup_memory_runs": result["runs"],
+                "memory_modules": result["modules"],
+            })
+            text = f"启动内存峰值 RSS {format_size(result['peak_rss'])}"
+            if result["peak_pss"] is not None:
+                text += f"，PSS {format_size(result['peak_pss'])}"
+            lines = [text]
+            if result["modules"]:
+                lines.append("内存增长最多的模块:")
+                lines += [
+                    f"  {record['module']:<40} {format_size(record['self']):>10}（含子模块 {format_size(record['total'])}）"
+                    for record in result["modules"][:15]
+                ]
+            elif config["memory_trace"]:
+                lines.append("未收集到模块归因数据（程序可能在导入前就已退出）")
+            self.append_build_log("\n".join(lines) + "\n")
+            if then:
+                then()
+        
+        def failed(message):
+            self.append_build_log(f"启动内存基准测试失败: {message}\n")
+            if then:
+                then()
+        
+        self.run_in_background(
+            measure_memory, executable, config["bench_runs"], bench_args,
+            config["bench_marker"], config["bench_timeout"],
+            on_done=done, on_error=failed
+        )
+    
+    def budget_gate_step(self, build_id):
+        """构建后性能预算检查"""
+        if self.build_config["gate_enabled"] or self.force_gate:
+            passed, report = self.evaluate_budget(build_id, self.build_config)
+            self.append_build_log(report)
+            if not passed:
+                self.gate_failed = True
+                if not self.headless:
+                    QMessageBox.warning(self, "性能预算", report)
+        self.next_post_build_step()
+    
+    def evaluate_budget(self, build_id, config):
+        """
+        检查构建是否超出预算，并找出造成增长的包和文件
+        
+        Returns:
+            (是否通过, 报告文本)
+        """
+        build = self.history.get_build(build_id)
+        baseline = self.history.get_baseline(build["project"], before_id=build_id, profile=build["profile"])
+        violations = check_budgets(build, config, baseline)
+        self.history.update_metrics(build_id, {"gate_passed": not violations, "gate_violations": violations})
+        
+        if not violations:
+            return True, "🚦 性能预算检查通过\n"
+        
+        lines = ["🚦 性能预算检查未通过:"]
+        lines += [f"  • {violation}" for violation in violations]
+        if baseline:
+            lines.append(f"基线: #{baseline['id']}（{baseline['started_at']}）")
+            package_deltas, file_deltas = diff_manifests(
+                self.history.get_manifest(baseline["id"]), self.history.get_manifest(build_id)
+            )
+            growth = sorted(package_deltas.items(), key=lambda item: item[1], reverse=True)[:10]
+            if growth and growth[0][1] > 0:
+                lines.append("增长最多的包:")
+                lines += [f"  +{format_size(delta)}  {package}" for package, delta in growth if delta > 0]
+            growth = sorted(file_deltas.items(), key=lambda item: item[1], reverse=True)[:10]
+            if growth and growth[0][1] > 0:
+                lines.append("增长最多的文件:")
+                lines += [f"  +{format_size(delta)}  {path}" for path, delta in growth if delta > 0]
+        return False, "\n".join(lines) + "\n"
+    
+    def current_project(self):
+        """当前脚本对应的项目标识（脚本绝对路径）"""
+        if not self.script_edit.text().strip():
+            self.notify_warning("请选择Python脚本文件！")
+            return None
+        return os.path.abspath(self.script_edit.text().strip())
+    
+    def current_profile(self):
+        """当前所选的构建方案名称，基础配置为空字符串"""
+        return self.profile_combo.currentData() or ""
+    
+    def preview_splash(self):
+        """预览启动画面优化效果"""
+        config = self.get_build_config()
+        if not os.path.isfile(config["splash"]):
+            self.notify_warning("请先选择启动画面图片！")
+            return
+        SplashPreviewDialog(config, self).exec()
+    
+    def measure_splash_time(self):
+        """测量最近一次构建的程序显示启动画面所需的时间"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        if not build["config"].get("splash"):
+            self.notify_warning("最近一次构建没有设置启动画面！")
+            return
+        if not window_probe_available():
+            self.notify_warning("无法检测窗口：Windows 以外的平台需要 X11 和 xdotool")
+            return
+        config = {**DEFAULT_CONFIG, **build["config"]}
+        bench = self.get_config()
+        bench_args = shlex.split(bench["bench_args"], posix=os.name != "nt")
+        self.append_build_log(f"⏱️ 测量启动画面显示时间（{bench['bench_runs']} 次）...\n")
+        
+        def done(durations):
+            median = statistics.median(durations)
+            self.history.update_metrics(build["id"], {"splash_ms": median})
+            report = f"启动画面显示时间中位数 {median:.0f} ms（最快 {min(durations):.0f} ms，最慢 {max(durations):.0f} ms）"
+            self.append_build_log(report + "\n")
+            QMessageBox.information(self, "启动画面", report)
+        
+        self.run_in_background(
+            measure_splash_time, get_executable_path(config), bench["bench_runs"], bench_args, bench["bench_timeout"],
+            on_done=done,
+            on_error=lambda message: self.notify_warning(f"测量失败: {message}")
+        )
+    
+    def benchmark_last_build(self):
+        """对当前项目最近一次成功的构建执行启动基准测试"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        config = {**DEFAULT_CONFIG, **build["config"], **{
+            key: value for key, value in self.get_config().items() if key.startswith("bench_")
+        }}
+        self.start_startup_benchmark(build["id"], config)
+    
+    def memory_benchmark_last_build(self):
+        """对当前项目最近一次成功的构建执行启动内存基准测试"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        config = {**DEFAULT_CONFIG, **build["config"], **{
+            key: value for key, value in self.get_config().items() if key.startswith("bench_")
+        }}
+        self.start_memory_benchmark(build["id"], config)
+    
+    def extraction_benchmark_last_build(self):
+        """对当前项目最近一次成功的单文件构建执行解压基准测试"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        config = {**DEFAULT_CONFIG, **build["config"], **{
+            key: value for key, value in self.get_config().items() if key.startswith("bench_")
+        }}
+        if not config["onefile"]:
+            self.notify_warning("最近一次构建是目录模式，启动时不需要解压！")
+            return
+        self.start_extraction_benchmark(build["id"], config)
+    
+    def import_times_last_build(self):
+        """启动最近一次成功的构建，收集导入计时钩子的输出并展示导入树"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        config = {**DEFAULT_CONFIG, **build["config"], **{
+            key: value for key, value in self.get_config().items() if key.startswith("bench_")
+        }}
+        if not config["import_trace"]:
+            self.notify_warning("最近一次构建没有注入导入计时钩子，请勾选“注入运行时钩子，记录冻结程序中每个模块的导入耗时”后重新构建！")
+            return
+        executable = get_executable_path(config)
+        bench_args = shlex.split(config["bench_args"], posix=os.name != "nt")
+        self.append_build_log(f"⏱️ 测量模块导入耗时: {executable}\n")
+        
+        def done(result):
+            records = result["records"]
+            summary = summarize_import_times(records)
+            self.history.update_metrics(build["id"], {
+                "import_total_ms": summary["total_ms"],
+                "import_modules": summary["modules"],
+            })
+            if result["error"]:
+                self.append_build_log(f"程序未正常结束，以下为已收集的数据: {result['error']}\n")
+            self.append_build_log(format_import_report(records))
+            if not self.headless:
+                ImportTimeDialog(records, self, f"构建 #{build['id']}").exec()
+        
+        self.run_in_background(
+            measure_import_times, executable, bench_args,
+            config["bench_marker"], config["bench_timeout"],
+            on_done=done,
+            on_error=lambda message: self.append_build_log(f"测量模块导入耗时失败: {message}\n")
+        )
+    
+    def set_baseline_from_last_build(self):
+        """将当前项目最近一次成功的构建设为性能基线"""
+        project = self.current_project()
+        if project is None:
+            return
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return
+        self.history.set_baseline(project, build["id"], build["profile"])
+        QMessageBox.information(self, "成功", f"已将构建 #{build['id']}（{build['started_at']}）设为基线")
+    
+    def check_last_build_budget(self):
+        """
+        用当前预算设置检查最近一次成功的构建
+        
+        Returns:
+            是否通过，没有可检查的构建时返回 None
+        """
+        project = self.current_project()
+        if project is None:
+            return None
+        build = self.history.latest_build(project, profile=self.current_profile())
+        if build is None:
+            self.notify_warning("当前项目还没有成功的构建！")
+            return None
+        passed, report = self.evaluate_budget(build["id"], self.get_config())
+        if self.headless:
+            print(report, end="")
+        elif passed:
+            QMessageBox.information(self, "性能预算", report)
+        else:
+            QMessageBox.warning(self, "性能预算", report)
+        return passed
+    
+    # 项目配置文件
+    def save_config_file(self):
+        """将当前配置保存为 JSON 项目文件"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存项目配置", "", "项目配置 (*.json);;所有文件 (*.*)"
+        )
+        if file_path:
+            try:
+                with open(file_path, "w", encoding="utf-8") as f:
+                    json.dump(self.get_config(), f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                QMessageBox.warning(self, "警告", f"保存配置失败：{str(e)}")
+    
+    def load_config_file(self):
+        """从 JSON 项目文件加载配置"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "加载项目配置", "", "项目配置 (*.json);;所有文件 (*.*)"
+        )
+        if file_path:
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    self.apply_config(json.load(f))
+            except Exception as e:
+                QMessageBox.warning(self, "警告", f"加载配置失败：{str(e)}")
+    
+    def show_build_history(self):
+        """打开构建历史浏览器"""
+        dialog = BuildHistoryDialog(self.history, self)
+        dialog.exec()
+    
+    def show_dependency_graph(self):
+        """加载最近一次构建的依赖图并打开浏览对话框"""
+        config = self.get_build_config()
+        if not config["script"]:
+            self.notify_warning("请先选择Python脚本文件")
+            return
+        
+        def done(graph):
+            if graph is None:
+                self.notify_warning("工作目录中没有分析结果，请先构建一次")
+                return
+            DependencyGraphDialog(graph, self).exec()
+        
+        self.run_in_background(
+            load_module_graph, config,
+            on_done=done,
+            on_error=lambda message: self.notify_warning(f"加载依赖图失败: {message}")
+        )
+
+def parse_command_line():
+    """解析命令行参数（Qt 自身的参数保持不变）"""
+    import argparse
+    parser = argparse.ArgumentParser(description="PyInstaller 命令构建器")
+    parser.add_argument("--config", help="项目配置文件（JSON），指定后以无界面模式运行")
+    parser.add_argument("--build", action="store_true", help="使用项目配置执行构建")
+    parser.add_argument("--gate", action="store_true",
+                        help="检查性能预算（与 --build 一起使用时检查本次构建，否则检查最近一次成功的构建）")
+    args, _ = parser.parse_known_args()
+    return args
+
+
+def run_headless(args):
+    """
+    无界面模式，供 CI 使用
+    
+    退出码: 0 成功，1 构建失败或参数错误，2 超出性能预算
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv[:1])
+    
+    window = PyInstallerGUI()
+    window.headless = True
+    with open(args.config, encoding="utf-8") as f:
+        window.apply_config(json.load(f))
+    
+    if not window.script_edit.text().strip():
+        print("项目配置中没有指定脚本文件", file=sys.stderr)
+        return 1
+    
+    if args.build:
+        window.force_gate = args.gate
+        window.start_build()
+        return app.exec()
+    if args.gate:
+        passed = window.check_last_build_budget()
+        return 1 if passed is None else (0 if passed else 2)
+    print("请指定 --build 和/或 --gate", file=sys.stderr)
+    return 1
 
 
 def main():
+    args = parse_command_line()
+    if args.config:
+        sys.exit(run_headless(args))
+    
     app = QApplication(sys.argv)
     app.setApplicationName("PyInstaller GUI")
     app.setApplicationVersion("3.0 - Simple")
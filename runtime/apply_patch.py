@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量更新包应用模块
+由 PyInstaller GUI 构建器生成的 .patch 文件是一个 ZIP 包：manifest.json 记录
+新旧版本每个文件的内容哈希，full/ 下为完整的新文件，delta/ 下为相对旧文件的二进制差异。
+
+应用时先在安装目录中的临时目录生成全部变化的文件并校验哈希，全部成功后才替换原文件，
+中途失败不会留下新旧混合的安装目录。请在程序未运行时应用。
+
+用法:
+    python apply_patch.py app-update.patch dist/app
+    python app-update.patch dist/app          # 更新包内附带本模块，可直接运行
+
+    import apply_patch
+    apply_patch.apply_patch("app-update.patch", install_dir)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import zipfile
+
+PATCH_FORMAT = 1
+DELTA_COPY = b"C"
+DELTA_DATA = b"D"
+DELTA_COPY_STRUCT = struct.Struct("<QQ")
+DELTA_DATA_STRUCT = struct.Struct("<Q")
+STAGING_DIR = ".patch-staging"
+
+
+class PatchError(Exception):
+    """更新包与安装目录不匹配或内容损坏"""
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def apply_delta(base_path, delta, out):
+    """
+    按差异指令由旧文件生成新文件
+
+    Args:
+        base_path: 旧文件路径
+        delta: 差异数据（复制指令 + 数据指令）
+        out: 新文件的可写文件对象
+    """
+    with open(base_path, "rb") as base_file:
+        size = os.fstat(base_file.fileno()).st_size
+        base = mmap.mmap(base_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            view = memoryview(delta)
+            position = 0
+            while position < len(view):
+                op = bytes(view[position:position + 1])
+                position += 1
+                if op == DELTA_COPY:
+                    offset, length = DELTA_COPY_STRUCT.unpack_from(view, position)
+                    position += DELTA_COPY_STRUCT.size
+                    if offset + length > size:
+                        raise PatchError(f"差异数据超出旧文件范围: {base_path}")
+                    out.write(base[offset:offset + length])
+                elif op == DELTA_DATA:
+                    (length,) = DELTA_DATA_STRUCT.unpack_from(view, position)
+                    position += DELTA_DATA_STRUCT.size
+                    out.write(view[position:position + length])
+                    position += length
+                else:
+                    raise PatchError(f"无效的差异指令: {op!r}")
+            view.release()
+        finally:
+            if size:
+                base.close()
+
+
+def apply_patch(patch_path, target, verify_all=False, log=print):
+    """
+    将更新包应用到安装目录
+
+    Args:
+        patch_path: 更新包路径
+        target: 安装目录（单文件程序可以是可执行文件本身或其所在目录）
+        verify_all: 应用前校验旧版本的全部文件，而不仅是作为差异来源的文件
+        log: 输出进度信息的函数
+
+    Returns:
+        {"written": 写入的文件数, "removed": 删除的文件数}
+    """
+    root = target if os.path.isdir(target) else os.path.dirname(os.path.abspath(target))
+    with zipfile.ZipFile(patch_path) as archive:
+        manifest = json.loads(archive.read("manifest.json").decode("utf-8"))
+        if manifest.get("format") != PATCH_FORMAT:
+            raise PatchError(f"不支持的更新包格式: {manifest.get('format')}")
+
+        def locate(name):
+            # 单文件程序可能已改名：直接指定可执行文件时不按包内文件名查找
+            if os.path.isfile(target) and len(manifest["target"]) == 1:
+                return os.path.abspath(target)
+            return os.path.join(root, name)
+
+        # 校验作为来源的旧文件（或全部旧文件）
+        sources = {info["source"] for info in manifest["files"].values() if "source" in info}
+        for name in sorted(set(manifest["base"]) if verify_all else sources):
+            path = locate(name)
+            if not os.path.isfile(path) or file_sha256(path) != manifest["base"][name]:
+                raise PatchError(f"安装目录中的文件与更新包的旧版本不一致: {name}")
+
+        staging = os.path.join(root, STAGING_DIR)
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            for name, info in sorted(manifest["files"].items()):
+                staged = os.path.join(staging, name)
+                os.makedirs(os.path.dirname(staged), exist_ok=True)
+                if info["action"] == "copy":
+                    shutil.copyfile(locate(info["source"]), staged)
+                elif info["action"] == "delta":
+                    with open(staged, "wb") as out:
+                        apply_delta(locate(info["source"]), archive.read(info["entry"]), out)
+                else:
+                    with archive.open(info["entry"]) as src, open(staged, "wb") as out:
+                        shutil.copyfileobj(src, out, 1024 * 1024)
+                expected = manifest["target"][name]
+                if file_sha256(staged) != expected["sha256"]:
+                    raise PatchError(f"生成的文件校验失败: {name}")
+                os.chmod(staged, expected["mode"])
+
+            # 全部文件生成并校验成功后再替换
+            for name in sorted(manifest["files"]):
+                destination = locate(name)
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                os.replace(os.path.join(staging, name), destination)
+                log(f"更新: {name}")
+            for name in manifest["removed"]:
+                path = locate(name)
+                if os.path.lexists(path):
+                    os.remove(path)
+                    log(f"删除: {name}")
+                # 清理变空的目录
+                directory = os.path.dirname(path)
+                while directory != root and os.path.isdir(directory) and not os.listdir(directory):
+                    os.rmdir(directory)
+                    directory = os.path.dirname(directory)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    return {"written": len(manifest["files"]), "removed": len(manifest["removed"])}
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    verify_all = "--verify-all" in args
+    if verify_all:
+        args.remove("--verify-all")
+    # 直接运行更新包时，更新包自身就是 sys.argv[0]
+    if len(args) == 1 and zipfile.is_zipfile(sys.argv[0]):
+        args.insert(0, sys.argv[0])
+    if len(args) != 2:
+        print("用法: python apply_patch.py [--verify-all] <更新包> <安装目录>", file=sys.stderr)
+        return 2
+    try:
+        result = apply_patch(args[0], args[1], verify_all)
+    except (PatchError, OSError, zipfile.BadZipFile) as e:
+        print(f"应用更新包失败: {e}", file=sys.stderr)
+        return 1
+    print(f"完成: 更新 {result['written']} 个文件，删除 {result['removed']} 个文件")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
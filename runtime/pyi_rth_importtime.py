@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+导入计时运行时钩子
+由 PyInstaller GUI 构建器在启用“注入导入计时钩子”时通过 --runtime-hook 注入。
+
+只有设置了环境变量 PYI_IMPORTTIME_FILE 时才生效：在冻结程序内记录每个模块
+首次导入的耗时和体积，每行一条 JSON 写入该文件:
+    {"module": 模块名, "parent": 触发导入的模块（顶层为空）,
+     "self_us": 自身耗时微秒, "total_us": 含嵌套导入的耗时微秒,
+     "size": 字节数, "source": "pyz" / "file" / "builtin" / "missing"}
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import _frozen_importlib
+
+
+def _module_size(name):
+    """返回模块的体积和来源：PYZ 内的压缩体积，或磁盘上扩展模块/源文件的体积"""
+    module = sys.modules.get(name)
+    if module is None:
+        return 0, "missing"
+    spec = getattr(module, "__spec__", None)
+    loader = getattr(spec, "loader", None)
+    archive = getattr(loader, "_pyz_archive", None)
+    if archive is not None:
+        entry = archive.toc.get(getattr(loader, "_pyz_entry_name", name))
+        if entry is not None:
+            return entry[2], "pyz"
+    origin = getattr(spec, "origin", None)
+    if origin and os.path.isfile(origin):
+        return os.path.getsize(origin), "file"
+    return 0, "builtin"
+
+
+def _install(path):
+    output = open(path, "w", encoding="utf-8", buffering=1)
+    original_find_and_load = _frozen_importlib._find_and_load
+    clock = time.perf_counter_ns
+    # 每个线程的导入栈：[模块名, 子模块累计耗时]
+    state = threading.local()
+
+    def timed_find_and_load(name, import_):
+        stack = getattr(state, "stack", None)
+        if stack is None:
+            stack = state.stack = []
+        parent = stack[-1][0] if stack else ""
+        frame = [name, 0]
+        stack.append(frame)
+        start = clock()
+        try:
+            return original_find_and_load(name, import_)
+        finally:
+            total = clock() - start
+            stack.pop()
+            size, source = _module_size(name)
+            output.write(json.dumps({
+                "module": name, "parent": parent,
+                "self_us": (total - frame[1]) // 1000, "total_us": total // 1000,
+                "size": size, "source": source,
+            }) + "\n")
+            # 记录本身的开销计入父模块的子模块耗时，不算作父模块自身的耗时
+            if stack:
+                stack[-1][1] += clock() - start
+
+    _frozen_importlib._find_and_load = timed_find_and_load
+
+
+if os.environ.get("PYI_IMPORTTIME_FILE"):
+    _install(os.environ["PYI_IMPORTTIME_FILE"])
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内存归因运行时钩子
+由 PyInstaller GUI 构建器在启用“按模块归因内存增长”时通过 --runtime-hook 注入。
+
+只有设置了环境变量 PYI_MEMTRACE_FILE 时才生效：记录每个模块首次导入前后
+进程常驻内存（RSS）的变化，每行一条 JSON 写入该文件:
+    {"module": 模块名, "self": 自身增长字节, "total": 含嵌套导入的增长字节}
+"""
+
+import builtins
+import json
+import os
+import sys
+
+
+def _make_rss_reader():
+    """返回读取当前进程常驻内存字节数的函数"""
+    if sys.platform.startswith("linux"):
+        page_size = os.sysconf("SC_PAGE_SIZE")
+
+        def read_rss():
+            with open("/proc/self/statm", "rb") as f:
+                return int(f.read().split()[1]) * page_size
+        return read_rss
+
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+
+        def read_rss():
+            get_memory_info(process, ctypes.byref(counters), counters.cb)
+            return counters.WorkingSetSize
+        return read_rss
+
+    # 其他平台只能取得峰值（macOS 上单位为字节）
+    import resource
+
+    def read_rss():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return read_rss
+
+
+def _install(path):
+    read_rss = _make_rss_reader()
+    output = open(path, "w", encoding="utf-8", buffering=1)
+    original_import = builtins.__import__
+    # 每层嵌套导入累计的子模块增长，用于计算模块自身的增长
+    child_growth = []
+
+    def traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+        module = name
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            module = f"{base}.{name}" if name else base
+        if module in sys.modules:
+            return original_import(name, globals, locals, fromlist, level)
+        before = read_rss()
+        child_growth.append(0)
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            children = child_growth.pop()
+            total = read_rss() - before
+            if child_growth:
+                child_growth[-1] += total
+            output.write(json.dumps({"module": module, "self": total - children, "total": total}) + "\n")
+
+    builtins.__import__ = traced_import
+
+
+if os.environ.get("PYI_MEMTRACE_FILE"):
+    _install(os.environ["PYI_MEMTRACE_FILE"])
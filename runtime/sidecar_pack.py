@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+外部数据包运行时读取模块
+由 PyInstaller GUI 构建器生成的 .pak 文件位于可执行文件旁，
+通过内存映射读取，返回零拷贝的 memoryview，不需要解压到临时目录。
+
+用法:
+    import sidecar_pack
+
+    pack = sidecar_pack.open_pack()              # 默认打开 <程序名>.pak
+    weights = pack.get("models/weights.bin")     # memoryview，零拷贝
+    config = pack.read("config/settings.ini")    # bytes 副本
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b"PYGPAK01"
+HEADER = struct.Struct("<8sQQ")
+
+_open_packs = {}
+
+
+class SidecarPackError(Exception):
+    """数据包格式错误"""
+
+
+class SidecarPack:
+    """内存映射的外部数据包"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        magic, index_offset, index_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise SidecarPackError(f"不是有效的数据包文件: {path}")
+
+        index = json.loads(self._mmap[index_offset:index_offset + index_length].decode("utf-8"))
+        self._entries = {name: tuple(location) for name, location in index["entries"].items()}
+        self._view = memoryview(self._mmap)
+
+    def names(self):
+        """返回包内所有条目名称"""
+        return list(self._entries)
+
+    def __contains__(self, name):
+        return _normalize(name) in self._entries
+
+    def size(self, name):
+        """返回条目字节数"""
+        return self._lookup(name)[1]
+
+    def get(self, name):
+        """
+        返回条目内容的只读 memoryview（零拷贝）
+
+        注意：在关闭数据包前需要释放所有返回的 memoryview
+        """
+        offset, size = self._lookup(name)
+        return self._view[offset:offset + size]
+
+    def read(self, name):
+        """返回条目内容的 bytes 副本"""
+        return bytes(self.get(name))
+
+    def close(self):
+        """关闭数据包并释放内存映射"""
+        view = getattr(self, "_view", None)
+        if view is not None:
+            view.release()
+            self._view = None
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+        _open_packs.pop(self.path, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _lookup(self, name):
+        try:
+            return self._entries[_normalize(name)]
+        except KeyError:
+            raise KeyError(f"数据包中没有条目: {name}") from None
+
+
+def _normalize(name):
+    return name.replace("\\", "/").strip("/")
+
+
+def default_pack_dir():
+    """返回数据包默认所在目录：冻结程序为可执行文件旁，开发环境为主脚本旁"""
+    if getattr(sys, "frozen", False):
+        return os.path.dirname(os.path.abspath(sys.executable))
+    return os.path.dirname(os.path.abspath(sys.argv[0]))
+
+
+def open_pack(name=None):
+    """
+    打开（并缓存）可执行文件旁的数据包
+
+    Args:
+        name: 数据包文件名或路径，默认为 "<程序名>.pak"
+    """
+    if name is None:
+        executable = sys.executable if getattr(sys, "frozen", False) else sys.argv[0]
+        name = os.path.splitext(os.path.basename(executable))[0] + ".pak"
+    path = name if os.path.isabs(name) else os.path.join(default_pack_dir(), name)
+    path = os.path.abspath(path)
+
+    pack = _open_packs.get(path)
+    if pack is None:
+        pack = _open_packs[path] = SidecarPack(path)
+    return pack